@@ -25,6 +25,7 @@ INSTALLED_APPS = [
     "django.contrib.gis",
     "app_auth",
     "app_notes",
+    "app_metrics",
 ]
 
 MIDDLEWARE = [
@@ -132,3 +133,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Custom user model
 AUTH_USER_MODEL = "app_auth.User"
 
+# The mind recompute thread (app_notes.mindRecompute) opens ZODB, so only the server entrypoint turns it on
+MIND_RECOMPUTE = os.environ.get("MIND_RECOMPUTE") == "1"
+# Seconds between exact recomputes of every mind's octree and aggregates in the web process; 0 turns them off
+MIND_RECOMPUTE_INTERVAL = float(os.environ.get("MIND_RECOMPUTE_INTERVAL", "600"))
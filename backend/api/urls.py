@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.urls import path
 import app_auth.views as auth_views
 import app_notes.views as mind_views
+import app_metrics.views as metrics_views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -12,12 +13,19 @@ urlpatterns = [
     path('is_logged_in/', auth_views.is_logged_in),
     # Mental/Mind endpoints
     path('get_mind/', mind_views.get_mind),
+    path('get_mind_lod/', mind_views.get_mind_lod),
+    path('get_mind_label_atlas/', mind_views.get_mind_label_atlas),
+    path('get_mind_glb/', mind_views.get_mind_glb),
+    path('settle_mind/', mind_views.settle_mind),
     path('upsert_mind/', mind_views.upsert_mind),
     path('append_mental/', mind_views.add_mental_sphere),
     path('remove_mental/', mind_views.delete_mental_sphere),
     path('create_mental/', mind_views.create_sphere),
     path('get_all_mentals/', mind_views.list_spheres),
     path('get_mental/', mind_views.get_sphere),
-    path('update_mental/', mind_views.update_sphere)
+    path('update_mental/', mind_views.update_sphere),
+    # Client performance endpoints
+    path('perf_beacon/', metrics_views.perf_beacon),
+    path('perf_percentiles/', metrics_views.perf_percentiles)
 ]
 
@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import PerfRollup
+
+
+@admin.register(PerfRollup)
+class PerfRollupAdmin(admin.ModelAdmin):
+    list_display = ('metric', 'page', 'asset', 'period_start', 'count')
+    list_filter = ('metric', 'period_start')
+    search_fields = ('page', 'asset')
+    readonly_fields = ('metric', 'page', 'asset', 'period_start', 'count', 'sketch', 'updated_at')
+    date_hierarchy = 'period_start'
@@ -0,0 +1,236 @@
+"""In-memory aggregation of client performance beacons, flushed to PostgreSQL.
+
+A beacon is a small JSON batch (optionally gzipped) sent by the Reflex client::
+
+    {"page": "/demo", "metrics": [
+        {"metric": "frame_ms", "values": [[16.7, 540], [33.3, 2]]},
+        {"metric": "asset_ms", "asset": "/_hashed/LabPlan.1a2b3c.glb", "values": [[412.0, 1]]}
+    ]}
+
+``values`` are ``[value, count]`` pairs, so a client sends a whole frame-time
+histogram in one beacon. Ingest only adds the pairs to a ``DDSketch`` per
+(period, metric, page, asset) under a lock; a background thread merges the
+pending sketches into ``PerfRollup`` rows every ``FLUSH_SECONDS``, so no
+request waits on the database. Each process keeps its own sketches, and the
+rows merge what all of them flushed.
+"""
+import atexit
+import json
+import logging
+import math
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+
+from django.db import close_old_connections, transaction
+
+from .ddSketch import DDSketch
+from .models import PerfRollup
+
+logger = logging.getLogger(__name__)
+
+METRICS = ('load_ms', 'first_render_ms', 'frame_ms', 'asset_ms')
+QUANTILES = (0.5, 0.95, 0.99)
+ROLLUP_SECONDS = 300
+FLUSH_SECONDS = 30
+MAX_BODY_BYTES = 64 * 1024
+MAX_DECODED_BYTES = 1024 * 1024
+MAX_ENTRIES = 200
+MAX_VALUES = 2000
+# Slower than this is a client clock or tab-sleep artefact, not a timing
+MAX_VALUE_MS = 10 * 60 * 1000
+# Distinct (period, metric, page, asset) sketches held between flushes; beacons for new keys past it are dropped
+MAX_PENDING_KEYS = 5000
+MAX_PAGE_LENGTH = PerfRollup._meta.get_field('page').max_length
+MAX_ASSET_LENGTH = PerfRollup._meta.get_field('asset').max_length
+
+
+def decode_beacon(body, content_encoding=''):
+    """Parse a raw beacon body into a list of beacons; raises ValueError on anything malformed.
+
+    Browsers cannot set Content-Encoding on a no-cors request, so gzip is also
+    recognised by its magic bytes.
+    """
+    if len(body) > MAX_BODY_BYTES:
+        raise ValueError('Beacon too large')
+    if content_encoding == 'gzip' or body[:2] == b'\x1f\x8b':
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            body = decoder.decompress(body, MAX_DECODED_BYTES)
+        except zlib.error as e:
+            raise ValueError(f'Invalid gzip body: {e}')
+        if decoder.unconsumed_tail:
+            raise ValueError('Beacon too large')
+    try:
+        data = json.loads(body)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError(f'Invalid JSON: {e}')
+    beacons = data if isinstance(data, list) else [data]
+    if not all(isinstance(beacon, dict) for beacon in beacons):
+        raise ValueError('A beacon must be an object')
+    return beacons
+
+
+def period_start(when):
+    seconds = int(when.timestamp()) // ROLLUP_SECONDS * ROLLUP_SECONDS
+    return datetime.fromtimestamp(seconds, tz=timezone.utc)
+
+
+def clean_label(value, max_length):
+    if not isinstance(value, str):
+        return ''
+    # Query strings would make every URL its own page
+    return value.split('?', 1)[0].split('#', 1)[0][:max_length]
+
+
+def beacon_samples(beacon):
+    """(metric, page, asset, [(value, count), ...]) for each valid entry of a beacon"""
+    page = clean_label(beacon.get('page'), MAX_PAGE_LENGTH) or '/'
+    entries = beacon.get('metrics')
+    if not isinstance(entries, list):
+        raise ValueError('metrics must be an array')
+    if len(entries) > MAX_ENTRIES:
+        raise ValueError(f'At most {MAX_ENTRIES} metrics per beacon')
+    for entry in entries:
+        if not isinstance(entry, dict) or entry.get('metric') not in METRICS:
+            continue
+        values = entry.get('values')
+        if not isinstance(values, list) or len(values) > MAX_VALUES:
+            continue
+        samples = []
+        for pair in values:
+            # Anything but a [value, count] pair (an object, a string) is skipped, not indexed
+            if not isinstance(pair, (list, tuple)) or len(pair) != 2:
+                continue
+            try:
+                value, count = float(pair[0]), int(pair[1])
+            except (TypeError, ValueError, OverflowError):
+                continue
+            if math.isfinite(value) and 0 <= value <= MAX_VALUE_MS and count > 0:
+                samples.append((value, count))
+        if samples:
+            yield entry['metric'], page, clean_label(entry.get('asset'), MAX_ASSET_LENGTH), samples
+
+
+class BeaconAggregator:
+    def __init__(self, flush_seconds=FLUSH_SECONDS):
+        self.flush_seconds = flush_seconds
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.dropped = 0
+        self.flusher = None
+
+    def ingest(self, beacons, now=None):
+        """Add beacons to the pending sketches; returns how many samples were accepted"""
+        key_period = period_start(now or datetime.now(timezone.utc))
+        parsed = [sample for beacon in beacons for sample in beacon_samples(beacon)]
+        accepted = 0
+        with self.lock:
+            for metric, page, asset, samples in parsed:
+                key = (key_period, metric, page, asset)
+                sketch = self.pending.get(key)
+                if sketch is None:
+                    if len(self.pending) >= MAX_PENDING_KEYS:
+                        self.dropped += 1
+                        continue
+                    sketch = self.pending[key] = DDSketch()
+                for value, count in samples:
+                    sketch.add(value, count)
+                    accepted += count
+        self._start_flusher()
+        return accepted
+
+    def _start_flusher(self):
+        if self.flusher is not None:
+            return
+        with self.lock:
+            if self.flusher is not None:
+                return
+            self.flusher = threading.Thread(target=self._flush_loop, name='perf-beacon-flush', daemon=True)
+            self.flusher.start()
+        atexit.register(self.flush)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            try:
+                self.flush()
+            except Exception:
+                # Sketches that failed to write are merged back and retried next time
+                logger.exception('Flushing perf beacons failed')
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        """Merge the pending sketches into their PerfRollup rows; returns the number of rows written"""
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        written = 0
+        try:
+            for (start, metric, page, asset), sketch in list(pending.items()):
+                with transaction.atomic():
+                    rollup, _ = PerfRollup.objects.select_for_update().get_or_create(
+                        metric=metric, page=page, asset=asset, period_start=start
+                    )
+                    stored = DDSketch.from_dict(rollup.sketch)
+                    stored.merge(sketch)
+                    rollup.sketch = stored.to_dict()
+                    rollup.count = stored.count
+                    rollup.save(update_fields=['sketch', 'count', 'updated_at'])
+                del pending[(start, metric, page, asset)]
+                written += 1
+        finally:
+            if pending:
+                self._restore(pending)
+        return written
+
+    def _restore(self, pending):
+        with self.lock:
+            for key, sketch in pending.items():
+                current = self.pending.get(key)
+                if current is None:
+                    self.pending[key] = sketch
+                else:
+                    current.merge(sketch)
+
+
+def summarize(sketch, quantiles=QUANTILES):
+    summary = {'count': sketch.count, 'mean': sketch.mean(),
+               'min': sketch.min if sketch.count else None, 'max': sketch.max if sketch.count else None}
+    for q in quantiles:
+        summary[f'p{q * 100:g}'] = sketch.quantile(q)
+    return summary
+
+
+def query_percentiles(metric, page=None, asset=None, minutes=60, quantiles=QUANTILES, now=None):
+    """Percentiles of a metric over the last ``minutes``, per (page, asset) and over all of them.
+
+    Rollups cover whole periods, so the window is widened to the start of the
+    period it begins in. Data still pending in a process is not included.
+    """
+    now = now or datetime.now(timezone.utc)
+    rollups = PerfRollup.objects.filter(metric=metric, period_start__gte=period_start(now - timedelta(minutes=minutes)))
+    if page is not None:
+        rollups = rollups.filter(page=page)
+    if asset is not None:
+        rollups = rollups.filter(asset=asset)
+
+    groups = {}
+    total = DDSketch()
+    for page_name, asset_name, data in rollups.values_list('page', 'asset', 'sketch').iterator():
+        sketch = DDSketch.from_dict(data)
+        groups.setdefault((page_name, asset_name), DDSketch()).merge(sketch)
+        total.merge(sketch)
+    return {
+        'metric': metric,
+        'minutes': minutes,
+        'overall': summarize(total, quantiles),
+        'groups': [
+            {'page': page_name, 'asset': asset_name, **summarize(sketch, quantiles)}
+            for (page_name, asset_name), sketch in sorted(groups.items())
+        ],
+    }
+
+
+aggregator = BeaconAggregator()
@@ -0,0 +1,119 @@
+"""Mergeable quantile sketch for client timings (DDSketch, Masson et al., VLDB 2019).
+
+Values are counted in logarithmic buckets ``gamma**(i-1) < x <= gamma**i``
+with ``gamma = (1 + a) / (1 - a)``, so any quantile read back is within the
+relative accuracy ``a`` of an observed value. Adding is one log and a dict
+increment, merging two sketches adds their bucket counts, and the buckets
+round-trip through JSON, which makes one sketch per (metric, page, asset,
+period) cheap to keep in memory and to merge again in PostgreSQL.
+"""
+import math
+
+RELATIVE_ACCURACY = 0.01
+# Timings are in ms; anything at or under this counts as zero
+MIN_VALUE = 1e-3
+# Past this many buckets the lowest ones are folded together; with 1% accuracy
+# 2048 buckets cover over 17 orders of magnitude before that ever happens
+MAX_BUCKETS = 2048
+
+
+class DDSketch:
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY, max_buckets=MAX_BUCKETS):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.max_buckets = max_buckets
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def key(self, value):
+        return math.ceil(math.log(value) / self.log_gamma)
+
+    def value(self, key):
+        """Representative value of a bucket, within the relative accuracy of everything in it"""
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value, count=1):
+        if count <= 0:
+            return
+        if value > MIN_VALUE:
+            key = self.key(value)
+            self.buckets[key] = self.buckets.get(key, 0) + count
+            if len(self.buckets) > self.max_buckets:
+                self._collapse()
+        else:
+            self.zero_count += count
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def _collapse(self):
+        keys = sorted(self.buckets)
+        folded = keys[:len(keys) - self.max_buckets + 1]
+        self.buckets[folded[-1]] = sum(self.buckets.pop(key) for key in folded[:-1]) + self.buckets[folded[-1]]
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError('Cannot merge sketches with different relative accuracy')
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q):
+        """Value at quantile ``q`` in [0, 1], or None for an empty sketch"""
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                # Keep the estimate inside what was actually observed
+                return min(max(self.value(key), self.min), self.max)
+        return self.max
+
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+    def to_dict(self):
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            # JSON object keys are strings
+            'buckets': {str(key): count for key, count in self.buckets.items()},
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data.get('relative_accuracy', RELATIVE_ACCURACY))
+        if not data:
+            return sketch
+        sketch.buckets = {int(key): count for key, count in data.get('buckets', {}).items()}
+        sketch.zero_count = data.get('zero_count', 0)
+        sketch.count = data.get('count', 0)
+        sketch.sum = data.get('sum', 0.0)
+        if sketch.count:
+            sketch.min = data['min']
+            sketch.max = data['max']
+        return sketch
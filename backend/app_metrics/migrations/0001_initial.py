@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PerfRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=32)),
+                ('page', models.CharField(max_length=200)),
+                ('asset', models.CharField(blank=True, default='', max_length=300)),
+                ('period_start', models.DateTimeField()),
+                ('count', models.BigIntegerField(default=0)),
+                ('sketch', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-period_start'],
+                'indexes': [models.Index(fields=['metric', 'period_start'], name='perf_rollup_metric_period')],
+                'constraints': [models.UniqueConstraint(fields=('metric', 'page', 'asset', 'period_start'), name='unique_perf_rollup')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import models
+
+
+class PerfRollup(models.Model):
+    """Client timings of one metric on one page (and asset) over one rollup period.
+
+    ``sketch`` is a serialized ``DDSketch``; every process that received beacons
+    for the period merges its own sketch into the same row when it flushes.
+    """
+    metric = models.CharField(max_length=32)
+    page = models.CharField(max_length=200)
+    asset = models.CharField(max_length=300, blank=True, default='')
+    period_start = models.DateTimeField()
+    count = models.BigIntegerField(default=0)
+    sketch = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-period_start']
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'page', 'asset', 'period_start'], name='unique_perf_rollup'),
+        ]
+        indexes = [
+            models.Index(fields=['metric', 'period_start'], name='perf_rollup_metric_period'),
+        ]
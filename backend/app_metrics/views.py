@@ -0,0 +1,43 @@
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_http_methods
+from django.views.decorators.csrf import csrf_exempt
+from .beaconAggregator import METRICS, aggregator, decode_beacon, query_percentiles
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def perf_beacon(request):
+    """Accept a batch of client timings; only adds them to in-memory sketches"""
+    try:
+        beacons = decode_beacon(request.body, request.headers.get('Content-Encoding', ''))
+        aggregator.ingest(beacons)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return HttpResponse(status=204)
+
+
+@csrf_exempt
+@require_http_methods(["GET"])
+def perf_percentiles(request):
+    """p50/p95/p99 of a client metric over the last minutes, per page and asset"""
+    metric = request.GET.get('metric', 'frame_ms')
+    if metric not in METRICS:
+        return JsonResponse({'error': f"metric must be one of {', '.join(METRICS)}"}, status=400)
+
+    try:
+        minutes = int(request.GET.get('minutes', 60))
+    except ValueError:
+        return JsonResponse({'error': 'minutes must be an integer'}, status=400)
+    if minutes <= 0:
+        return JsonResponse({'error': 'minutes must be positive'}, status=400)
+
+    try:
+        result = query_percentiles(
+            metric,
+            page=request.GET.get('page'),
+            asset=request.GET.get('asset'),
+            minutes=minutes
+        )
+        return JsonResponse(result, status=200)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AppNotesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app_notes'
+
+    def ready(self):
+        # Starts only where the server entrypoint enabled it, see mindRecompute
+        from .mindRecompute import recompute
+        recompute.start()
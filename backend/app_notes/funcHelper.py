@@ -1,11 +1,28 @@
+import hashlib
+import math
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from django.db import connection
 from app_notes.models import SRID_3D, MentalSphere, Mind
 from app_notes.mentalSphereObject import MentalSphereObject, MindObject
+from app_notes.mindOctree import MindOctree
+from app_notes.mindPhysics import DEFAULT_CONTAINER_RADIUS, settle_layout
+from app_notes.labelAtlas import label_atlas_payload
+from app_notes.mindGlb import build_mind_glb
 from zodb.zodb_management import get_connection
 import transaction
 import json
 from persistent.mapping import PersistentMapping
+from BTrees.OOBTree import OOBTree, OOTreeSet
+
+# Stored aggregates this close to the exact ones are not rewritten by the recompute
+AGGREGATE_TOLERANCE = 1e-9
+
+# Built mind GLBs by (mind_id, version); a new version simply stops being asked for
+MIND_GLB_CACHE_SIZE = 32
+_mind_glb_cache = OrderedDict()
+_mind_glb_lock = threading.Lock()
 
 
 def create_spatial_data(position=None, rotation=None, scale=None, object_type='mentalsphere'):
@@ -94,6 +111,21 @@ def get_spatial_data(spatial_id, object_type='mentalsphere'):
         }
 
 
+def get_positions_and_scales(spatial_ids, object_type='mentalsphere'):
+    """{spatial_id: (position, scale)} for many rows in one query"""
+    if not spatial_ids:
+        return {}
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT id, ST_X(position), ST_Y(position), ST_Z(position), scale
+            FROM app_notes_{object_type}spatialdata
+            WHERE id = ANY(%s)
+        """, [list(spatial_ids)])
+        return {
+            spatial_id: ([float(x), float(y), float(z)], float(scale))
+            for spatial_id, x, y, z, scale in cursor.fetchall()
+        }
+
 
 def get_mental_sphere_id(root):
     """Get the next available ID for MentalSphere in ZODB"""
@@ -164,14 +196,29 @@ def update_mental_sphere_zodb(root, sphere_id, sphere_data):
             sphere.set_rec_status(sphere_data['rec_status'])
         
         # Update spatial data if provided
-        if 'position' in sphere_data or 'rotation' in sphere_data:
+        if 'position' in sphere_data or 'rotation' in sphere_data or 'scale' in sphere_data:
             update_spatial_data(
-                sphere.get_position_id(),
+                sphere.get_spatial_data_id(),
                 position=sphere_data.get('position'),
                 rotation=sphere_data.get('rotation'),
                 scale=sphere_data.get('scale')
             )
         
+        # Keep the LOD octree of every mind holding this sphere in sync
+        if 'position' in sphere_data or 'scale' in sphere_data or 'color' in sphere_data:
+            for mind in get_minds_with_mental_sphere(root, sphere_id):
+                # Every containing mind gets a new version, with or without an octree yet
+                mind.bump_content_version()
+                octree = mind.get_octree()
+                if octree is not None:
+                    octree.move(
+                        int(sphere_id),
+                        position=sphere_data.get('position'),
+                        radius=sphere_data.get('scale'),
+                        color=sphere_data.get('color')
+                    )
+                    update_mind_aggregates(mind)
+        
         sphere.set_updated_at(datetime.now())
         transaction.commit()
     except Exception:
@@ -230,6 +277,8 @@ def create_mind_zodb(root, mind_data):
             mental_sphere_ids=mind_data.get('mental_sphere_ids', []),
             created_at=current_date
         )
+        build_mind_octree(root, root.minds[mind_id])
+        index_mind_spheres(root, mind_id, root.minds[mind_id].get_mental_sphere_ids())
         
         transaction.commit()
         return mind_id
@@ -280,7 +329,6 @@ def get_mind_zodb(root, mind_id):
         return None
     
     mind = root.minds[mind_id]
-
     mind_spatial = get_spatial_data(mind.get_spatial_data_id(), object_type='mind')
     
     return {
@@ -294,6 +342,8 @@ def get_mind_zodb(root, mind_id):
         'scale': mind_spatial['scale'],
         'created_by': mind.get_created_by(),
         'mental_sphere_ids': mind.get_mental_sphere_ids(),
+        'aggregates': mind.get_aggregates(),
+        'version': get_mind_version(mind),
         'created_at': mind.get_created_at().isoformat() if mind.get_created_at() else None,
         'updated_at': mind.get_updated_at().isoformat() if mind.get_updated_at() else None
     }
@@ -303,12 +353,20 @@ def add_mental_spheres_to_mind(root, mind_id, sphere_ids):
     try:
         if not hasattr(root, 'minds') or mind_id not in root.minds:
             raise ValueError(f"Mind with ID {mind_id} not found")
-        
+
         mind = root.minds[mind_id]
-        
+        octree = get_mind_octree(root, mind)
+
         for sphere_id in sphere_ids:
             mind.add_mental_sphere(sphere_id)
-        
+            if not octree.has(int(sphere_id)):
+                entry = get_sphere_octree_entry(root, int(sphere_id))
+                if entry:
+                    octree.insert(int(sphere_id), *entry)
+        update_mind_aggregates(mind)
+        index_mind_spheres(root, mind_id, sphere_ids)
+
+        mind.bump_content_version()
         mind.set_updated_at(datetime.now())
         transaction.commit()
     except Exception:
@@ -320,14 +378,303 @@ def delete_mental_spheres_from_mind(root, mind_id, sphere_ids):
     try:
         if not hasattr(root, 'minds') or mind_id not in root.minds:
             raise ValueError(f"Mind with ID {mind_id} not found")
-        
+
         mind = root.minds[mind_id]
-        
+        octree = mind.get_octree()
+
         for sphere_id in sphere_ids:
             mind.remove_mental_sphere(sphere_id)
-        
+            if octree is not None:
+                octree.remove(int(sphere_id))
+        if octree is not None:
+            update_mind_aggregates(mind)
+        unindex_mind_spheres(root, mind_id, sphere_ids)
+
+        mind.bump_content_version()
+        mind.set_updated_at(datetime.now())
+        transaction.commit()
+    except Exception:
+        transaction.abort()
+        raise
+
+
+def get_minds_with_mental_sphere(root, sphere_id):
+    if not hasattr(root, 'minds'):
+        return []
+    mind_ids = get_sphere_minds_index(root).get(int(sphere_id), ())
+    return [root.minds[mind_id] for mind_id in mind_ids if mind_id in root.minds]
+
+
+def get_sphere_minds_index(root):
+    """Reverse index sphere_id -> ids of the minds holding it.
+
+    Built from the minds by the first write that needs it (inside that write's
+    transaction), not left to the recompute thread.
+    """
+    if not hasattr(root, 'sphereMinds'):
+        build_sphere_minds_index(root)
+    return root.sphereMinds
+
+
+def build_sphere_minds_index(root):
+    index = OOBTree()
+    for mind_id, mind in (root.minds.items() if hasattr(root, 'minds') else []):
+        for sphere_id in mind.get_mental_sphere_ids():
+            index.setdefault(int(sphere_id), OOTreeSet()).insert(mind_id)
+    root.sphereMinds = index
+    return index
+
+
+def index_mind_spheres(root, mind_id, sphere_ids):
+    index = get_sphere_minds_index(root)
+    for sphere_id in sphere_ids:
+        index.setdefault(int(sphere_id), OOTreeSet()).insert(mind_id)
+
+
+def unindex_mind_spheres(root, mind_id, sphere_ids):
+    index = get_sphere_minds_index(root)
+    for sphere_id in sphere_ids:
+        mind_ids = index.get(int(sphere_id))
+        if mind_ids is None:
+            continue
+        if mind_id in mind_ids:
+            mind_ids.remove(mind_id)
+        if not mind_ids:
+            del index[int(sphere_id)]
+
+
+def ensure_sphere_minds_index(root):
+    """Build and commit the sphere -> minds index of a database stored before it existed"""
+    if hasattr(root, 'sphereMinds'):
+        return root.sphereMinds
+    try:
+        index = build_sphere_minds_index(root)
+        transaction.commit()
+        return index
+    except Exception:
+        transaction.abort()
+        raise
+
+
+def get_sphere_octree_entry(root, sphere_id):
+    """Return (position, radius, color) of a sphere for octree insertion"""
+    if not hasattr(root, 'mentalSpheres') or sphere_id not in root.mentalSpheres:
+        return None
+
+    sphere = root.mentalSpheres[sphere_id]
+    spatial_data = get_spatial_data(sphere.get_spatial_data_id())
+    if not spatial_data:
+        return None
+    return spatial_data['position'], spatial_data['scale'], sphere.get_color()
+
+
+def new_mind_octree(root, mind):
+    """Octree of a mind's members, with their positions and scales read in one query"""
+    spheres = []
+    for sphere_id in mind.get_mental_sphere_ids():
+        sphere_id = int(sphere_id)
+        if hasattr(root, 'mentalSpheres') and sphere_id in root.mentalSpheres:
+            spheres.append((sphere_id, root.mentalSpheres[sphere_id]))
+    spatial = get_positions_and_scales([sphere.get_spatial_data_id() for _, sphere in spheres])
+
+    octree = MindOctree()
+    for sphere_id, sphere in spheres:
+        if sphere.get_spatial_data_id() in spatial:
+            octree.insert(sphere_id, *spatial[sphere.get_spatial_data_id()], sphere.get_color())
+    return octree
+
+
+def build_mind_octree(root, mind):
+    octree = new_mind_octree(root, mind)
+    mind.set_octree(octree)
+    update_mind_aggregates(mind)
+    return octree
+
+
+def update_mind_aggregates(mind):
+    """Copy count, position sum and bounds from the octree root onto the mind (O(1))"""
+    node = mind.get_octree().root
+    mind.set_aggregates(node.count, node.position_sum, node.bounds, datetime.now())
+
+
+def get_mind_octree(root, mind):
+    octree = mind.get_octree()
+    if octree is None:
+        octree = build_mind_octree(root, mind)
+    return octree
+
+
+def read_mind_octree(root, mind):
+    """Octree for read paths: the stored one, or a throwaway one that is never saved.
+
+    Minds stored before octrees existed get theirs from the recompute thread
+    (mindRecompute), so reads never write to ZODB.
+    """
+    octree = mind.get_octree()
+    if octree is None:
+        octree = new_mind_octree(root, mind)
+    return octree
+
+
+def get_mind_lod_zodb(root, mind_id, max_depth=None, max_error=None):
+    if not hasattr(root, 'minds') or mind_id not in root.minds:
+        return None
+
+    mind = root.minds[mind_id]
+    octree = read_mind_octree(root, mind)
+    return {
+        'mind_id': mind.get_id(),
+        'count': octree.get_count(),
+        'nodes': octree.cut(max_depth=max_depth, max_error=max_error)
+    }
+
+
+def get_mind_label_atlas_zodb(root, mind_id):
+    """Pre-baked name label atlas for every sphere in the mind"""
+    if not hasattr(root, 'minds') or mind_id not in root.minds:
+        return None
+
+    mind = root.minds[mind_id]
+    names = [
+        root.mentalSpheres[int(sphere_id)].get_name()
+        for sphere_id in mind.get_mental_sphere_ids()
+        if hasattr(root, 'mentalSpheres') and int(sphere_id) in root.mentalSpheres
+    ]
+    return {'mind_id': mind.get_id(), **label_atlas_payload(names)}
+
+
+def get_mind_version(mind):
+    """Changes whenever the members or their position, scale or colour do.
+
+    Built from the mind's content version, which only those edits bump, and
+    not from timestamps the recompute thread also writes, so an unchanged
+    mind keeps its ETag and cached GLB.
+    """
+    key = '|'.join([
+        str(mind.get_id()),
+        str(mind.get_content_version()),
+        ','.join(str(sphere_id) for sphere_id in mind.get_mental_sphere_ids()),
+    ])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+
+def get_mind_glb_zodb(root, mind_id):
+    """(version, GLB bytes) of the mind's instanced sphere export, or None when the mind does not exist"""
+    if not hasattr(root, 'minds') or mind_id not in root.minds:
+        return None
+
+    mind = root.minds[mind_id]
+    version = get_mind_version(mind)
+    with _mind_glb_lock:
+        glb = _mind_glb_cache.get((mind_id, version))
+        if glb is not None:
+            _mind_glb_cache.move_to_end((mind_id, version))
+            return version, glb
+
+    spheres = []
+    for sphere_id in mind.get_mental_sphere_ids():
+        sphere_id = int(sphere_id)
+        if hasattr(root, 'mentalSpheres') and sphere_id in root.mentalSpheres:
+            spheres.append((sphere_id, root.mentalSpheres[sphere_id]))
+    spatial = get_positions_and_scales([sphere.get_spatial_data_id() for _, sphere in spheres])
+    members = [
+        (sphere_id, *spatial[sphere.get_spatial_data_id()], sphere.get_color())
+        for sphere_id, sphere in spheres
+        if sphere.get_spatial_data_id() in spatial
+    ]
+    glb = build_mind_glb(members, extras={'mind_id': mind.get_id(), 'version': version})
+
+    with _mind_glb_lock:
+        _mind_glb_cache[(mind_id, version)] = glb
+        while len(_mind_glb_cache) > MIND_GLB_CACHE_SIZE:
+            _mind_glb_cache.popitem(last=False)
+    return version, glb
+
+
+def mind_aggregates_drifted(mind, octree):
+    """True when the stored octree or aggregates of a mind differ from ``octree``, built fresh from PostGIS"""
+    stored = mind.get_octree()
+    if stored is None or dict(stored.entries) != dict(octree.entries):
+        return True
+    node = octree.root
+    if mind.sphere_count != node.count:
+        return True
+    if (mind.bounds is None) != (node.bounds is None):
+        return True
+    stored_values = list(mind.position_sum) + [c for corner in (mind.bounds or ()) for c in corner]
+    exact_values = list(node.position_sum) + [c for corner in (node.bounds or ()) for c in corner]
+    return not all(
+        math.isclose(a, b, rel_tol=AGGREGATE_TOLERANCE, abs_tol=AGGREGATE_TOLERANCE)
+        for a, b in zip(stored_values, exact_values)
+    )
+
+
+def recompute_mind_aggregates(root, mind_id):
+    """Correct incremental drift of a mind's octree and aggregates against PostGIS.
+
+    The exact octree is built in memory and only stored (with fresh aggregates)
+    when it differs from the stored one, so a run over unchanged minds writes
+    nothing to ZODB. Returns True when the mind was rewritten.
+    """
+    try:
+        if not hasattr(root, 'minds') or mind_id not in root.minds:
+            raise ValueError(f"Mind with ID {mind_id} not found")
+
+        mind = root.minds[mind_id]
+        octree = new_mind_octree(root, mind)
+        if not mind_aggregates_drifted(mind, octree):
+            transaction.abort()
+            return False
+        mind.set_octree(octree)
+        update_mind_aggregates(mind)
+        transaction.commit()
+        return True
+    except Exception:
+        transaction.abort()
+        raise
+
+
+def settle_mind_layout(root, mind_id, container_radius=DEFAULT_CONTAINER_RADIUS, seed=None, max_steps=2000):
+    """Run the sphere physics headless and store the relaxed member positions"""
+    try:
+        if not hasattr(root, 'minds') or mind_id not in root.minds:
+            raise ValueError(f"Mind with ID {mind_id} not found")
+
+        mind = root.minds[mind_id]
+        octree = get_mind_octree(root, mind)
+
+        members = []
+        for sphere_id in mind.get_mental_sphere_ids():
+            sphere_id = int(sphere_id)
+            if not hasattr(root, 'mentalSpheres') or sphere_id not in root.mentalSpheres:
+                continue
+            spatial_data_id = root.mentalSpheres[sphere_id].get_spatial_data_id()
+            spatial_data = get_spatial_data(spatial_data_id)
+            if spatial_data:
+                members.append((sphere_id, spatial_data_id, spatial_data))
+
+        if not members:
+            return {'steps': 0, 'settled': True, 'positions': {}}
+
+        positions, steps, settled = settle_layout(
+            [spatial_data['scale'] for _, _, spatial_data in members],
+            container_radius=container_radius,
+            positions=[spatial_data['position'] for _, _, spatial_data in members],
+            seed=seed,
+            max_steps=max_steps
+        )
+
+        new_positions = {}
+        for (sphere_id, spatial_data_id, _), position in zip(members, positions.tolist()):
+            update_spatial_data(spatial_data_id, position=position)
+            octree.move(sphere_id, position=position)
+            new_positions[sphere_id] = position
+
+        update_mind_aggregates(mind)
+        mind.bump_content_version()
         mind.set_updated_at(datetime.now())
         transaction.commit()
+        return {'steps': steps, 'settled': settled, 'positions': new_positions}
     except Exception:
         transaction.abort()
         raise
@@ -0,0 +1,100 @@
+"""Pre-bake the sphere name labels of a mind into one texture atlas.
+
+The labels look like the ones the client ``MindLabels`` helper draws at
+runtime (``client/my_app_name/components/mentalfactor.py``): white bold text
+on a rounded, 60% black pill. Every distinct name is drawn once and packed
+into rows, so the browser loads one image instead of drawing and uploading a
+canvas per sphere.
+"""
+import base64
+import io
+
+from PIL import Image, ImageDraw, ImageFont
+
+FONT_SIZE = 48
+DPI = 2
+MAX_ATLAS_SIZE = 4096
+GAP = 2
+FONT_CANDIDATES = ('DejaVuSans-Bold.ttf', 'Arial Bold.ttf', 'arialbd.ttf')
+
+
+def load_font(size):
+    for name in FONT_CANDIDATES:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default(size=size)
+
+
+def label_metrics(font_size=FONT_SIZE):
+    """Padding and corner radius in the same proportions as the client labels"""
+    return round(font_size * 0.175), round(font_size * 0.075)
+
+
+def pack_rows(sizes, width):
+    """Shelf-pack (w, h) boxes into rows of the given width; returns positions and used height"""
+    positions = []
+    x = y = row_height = 0
+    for w, h in sizes:
+        if x + w > width and x > 0:
+            y += row_height + GAP
+            x = row_height = 0
+        positions.append((x, y))
+        x += w + GAP
+        row_height = max(row_height, h)
+    return positions, y + row_height
+
+
+def build_label_atlas(names, font_size=FONT_SIZE, dpi=DPI):
+    """Draw each distinct name once into an RGBA atlas.
+
+    Returns ``(image, labels)`` where ``labels`` maps a name to its
+    ``[x, y, w, h]`` pixel rectangle, with the origin at the top left.
+    """
+    names = list(dict.fromkeys(name or '' for name in names))
+    padding, radius = label_metrics(font_size)
+    font = load_font(font_size * dpi)
+    measure = ImageDraw.Draw(Image.new('L', (1, 1)))
+
+    sizes = []
+    for name in names:
+        text_width = measure.textlength(name, font=font) / dpi
+        sizes.append((
+            int((text_width + padding * 2) * dpi + 0.999),
+            (font_size + padding * 2) * dpi,
+        ))
+
+    widest = max((w for w, _ in sizes), default=1)
+    total_area = sum((w + GAP) * (h + GAP) for w, h in sizes)
+    # Roughly square; WebGL2 samples non-power-of-two textures without mipmaps just fine
+    width = min(MAX_ATLAS_SIZE, max(widest, int(total_area ** 0.5) + 1))
+    positions, height = pack_rows(sizes, width)
+    height = max(height, 1)
+    if height > MAX_ATLAS_SIZE:
+        raise ValueError(f"{len(names)} labels do not fit in a {MAX_ATLAS_SIZE}px atlas")
+
+    image = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    labels = {}
+    for name, (x, y), (w, h) in zip(names, positions, sizes):
+        draw.rounded_rectangle((x, y, x + w - 1, y + h - 1), radius=radius * dpi, fill=(0, 0, 0, 153))
+        draw.text((x + padding * dpi, y + padding * dpi), name, font=font, fill=(255, 255, 255, 255))
+        labels[name] = [x, y, w, h]
+    return image, labels
+
+
+def label_atlas_payload(names, font_size=FONT_SIZE, dpi=DPI):
+    """Atlas as the JSON the client ``Mind`` accepts in its ``label_atlas`` prop"""
+    image, labels = build_label_atlas(names, font_size=font_size, dpi=dpi)
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', optimize=True)
+    padding, _ = label_metrics(font_size)
+    return {
+        'width': image.width,
+        'height': image.height,
+        'font_size': font_size,
+        'padding': padding,
+        'labels': labels,
+        'image': 'data:image/png;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii'),
+    }
@@ -74,6 +74,13 @@ class MentalSphereObject(persistent.Persistent):
 
 class MindObject(persistent.Persistent):
 
+    octree = None # MindOctree level-of-detail summary, built lazily for older records
+    sphere_count = 0
+    position_sum = (0.0, 0.0, 0.0)
+    bounds = None # ((min_x, min_y, min_z), (max_x, max_y, max_z)) of members including radius
+    aggregates_updated_at = None
+    content_version = 0 # bumped by every change to the members or their position, scale or colour
+
     def __init__(self, id, name, detail, color, rec_status,
                  spatial_data_id, created_by, mental_sphere_ids, created_at):
         self.id = id 
@@ -148,3 +155,43 @@ class MindObject(persistent.Persistent):
     
     def set_spatial_data_id(self, spatial_data_id):
         self.spatial_data_id = spatial_data_id
+
+    def get_octree(self):
+        return self.octree
+
+    def set_octree(self, octree):
+        self.octree = octree
+
+    def get_content_version(self):
+        return self.content_version
+
+    def bump_content_version(self):
+        self.content_version = self.content_version + 1
+
+    def set_aggregates(self, sphere_count, position_sum, bounds, updated_at):
+        self.sphere_count = sphere_count
+        self.position_sum = tuple(position_sum)
+        self.bounds = bounds
+        self.aggregates_updated_at = updated_at
+
+    def get_aggregates(self):
+        if self.sphere_count:
+            centroid = [s / self.sphere_count for s in self.position_sum]
+        else:
+            centroid = [0.0, 0.0, 0.0]
+
+        if self.bounds:
+            lo, hi = self.bounds
+            center = [(a + b) / 2 for a, b in zip(lo, hi)]
+            radius = sum((b - a) ** 2 for a, b in zip(lo, hi)) ** 0.5 / 2
+            bounds = {'min': list(lo), 'max': list(hi)}
+        else:
+            center, radius, bounds = centroid, 0.0, None
+
+        return {
+            'count': self.sphere_count,
+            'centroid': centroid,
+            'bounding_sphere': {'center': center, 'radius': radius},
+            'bounds': bounds,
+            'updated_at': self.aggregates_updated_at.isoformat() if self.aggregates_updated_at else None
+        }
@@ -0,0 +1,149 @@
+"""Export a mind as one binary glTF (GLB) with GPU-instanced spheres.
+
+The file holds a single unit sphere mesh and one node that draws it once
+per member through ``EXT_mesh_gpu_instancing``: per-instance TRANSLATION and
+SCALE from PostGIS and ``_COLOR_0`` from the sphere's colour in ZODB. The
+mesh and material match the client ``Mind`` spheres (32 segments, roughness
+0.4, metalness 0.6), so three.js's GLTFLoader turns it into the same single
+InstancedMesh draw call. Positions are mind-local, as in the client.
+"""
+import json
+import struct
+
+import numpy as np
+
+SPHERE_SEGMENTS = 32
+ROUGHNESS = 0.4
+METALNESS = 0.6
+
+GLB_MAGIC = b'glTF'
+GLB_HEADER = struct.Struct('<4sII')
+GLB_CHUNK_HEADER = struct.Struct('<II')
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+FLOAT = 5126
+UNSIGNED_SHORT = 5123
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+
+
+def sphere_mesh(width_segments=SPHERE_SEGMENTS, height_segments=SPHERE_SEGMENTS):
+    """(positions, normals, indices) of a unit sphere laid out like three's SphereGeometry"""
+    u = np.arange(width_segments + 1) / width_segments
+    v = np.arange(height_segments + 1) / height_segments
+    phi, theta = np.meshgrid(u * 2 * np.pi, v * np.pi)
+    normals = np.stack([
+        -np.cos(phi) * np.sin(theta),
+        np.cos(theta),
+        np.sin(phi) * np.sin(theta),
+    ], axis=-1).reshape(-1, 3).astype(np.float32)
+
+    row = width_segments + 1
+    iy, ix = np.meshgrid(np.arange(height_segments), np.arange(width_segments), indexing='ij')
+    a = iy * row + ix + 1
+    b = iy * row + ix
+    c = (iy + 1) * row + ix
+    d = (iy + 1) * row + ix + 1
+    # The poles collapse one triangle of each quad to a point; drop those like three does
+    top = np.stack([a, b, d], axis=-1)[iy != 0]
+    bottom = np.stack([b, c, d], axis=-1)[iy != height_segments - 1]
+    indices = np.concatenate([top, bottom]).reshape(-1).astype(np.uint16)
+    return normals.copy(), normals, indices
+
+
+def srgb_to_linear(color):
+    """'#rrggbb' -> linear RGB floats, the space glTF colours are stored in"""
+    try:
+        value = color.lstrip('#')
+        srgb = np.array([int(value[i:i + 2], 16) for i in (0, 2, 4)]) / 255.0
+    except (AttributeError, ValueError):
+        srgb = np.ones(3)
+    return np.where(srgb <= 0.04045, srgb / 12.92, ((srgb + 0.055) / 1.055) ** 2.4)
+
+
+class GLBWriter:
+    """Accumulates accessors in one BIN buffer"""
+
+    def __init__(self):
+        self.binary = bytearray()
+        self.buffer_views = []
+        self.accessors = []
+
+    def add(self, array, gltf_type, target=None, bounds=False):
+        data = np.ascontiguousarray(array)
+        self.binary += b'\0' * (-len(self.binary) % 4)
+        view = {'buffer': 0, 'byteOffset': len(self.binary), 'byteLength': data.nbytes}
+        if target is not None:
+            view['target'] = target
+        self.binary += data.tobytes()
+        self.buffer_views.append(view)
+        accessor = {
+            'bufferView': len(self.buffer_views) - 1,
+            'componentType': FLOAT if data.dtype == np.float32 else UNSIGNED_SHORT,
+            'count': len(data),
+            'type': gltf_type,
+        }
+        if bounds:
+            accessor['min'] = data.min(axis=0).tolist()
+            accessor['max'] = data.max(axis=0).tolist()
+        self.accessors.append(accessor)
+        return len(self.accessors) - 1
+
+    def glb(self, data):
+        self.binary += b'\0' * (-len(self.binary) % 4)
+        if self.binary:
+            # glTF buffers must not be empty, so an empty mind has neither buffer nor BIN chunk
+            data = {**data, 'buffers': [{'byteLength': len(self.binary)}], 'bufferViews': self.buffer_views, 'accessors': self.accessors}
+        json_chunk = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        json_chunk += b' ' * (-len(json_chunk) % 4)
+        chunks = GLB_CHUNK_HEADER.pack(len(json_chunk), CHUNK_JSON) + json_chunk
+        if self.binary:
+            chunks += GLB_CHUNK_HEADER.pack(len(self.binary), CHUNK_BIN) + bytes(self.binary)
+        return GLB_HEADER.pack(GLB_MAGIC, 2, GLB_HEADER.size + len(chunks)) + chunks
+
+
+def build_mind_glb(members, extras=None):
+    """GLB bytes for ``members``, a list of (sphere_id, position, scale, color)"""
+    data = {
+        'asset': {'version': '2.0', 'generator': 'Mindsim mind export'},
+        'scene': 0,
+        'scenes': [{'nodes': []}],
+    }
+    writer = GLBWriter()
+    if members:
+        positions, normals, indices = sphere_mesh()
+        translations = np.array([position for _, position, _, _ in members], dtype=np.float32)
+        scales = np.repeat(np.array([[scale] for _, _, scale, _ in members], dtype=np.float32), 3, axis=1)
+        colors = np.array([srgb_to_linear(color) for _, _, _, color in members], dtype=np.float32)
+
+        data['extensionsUsed'] = ['EXT_mesh_gpu_instancing']
+        data['materials'] = [{
+            'name': 'mental_sphere',
+            'pbrMetallicRoughness': {'baseColorFactor': [1, 1, 1, 1], 'metallicFactor': METALNESS, 'roughnessFactor': ROUGHNESS},
+        }]
+        data['meshes'] = [{
+            'name': 'mental_sphere',
+            'primitives': [{
+                'attributes': {
+                    'POSITION': writer.add(positions, 'VEC3', ARRAY_BUFFER, bounds=True),
+                    'NORMAL': writer.add(normals, 'VEC3', ARRAY_BUFFER),
+                },
+                'indices': writer.add(indices, 'SCALAR', ELEMENT_ARRAY_BUFFER),
+                'material': 0,
+            }],
+        }]
+        data['nodes'] = [{
+            'name': 'mental_spheres',
+            'mesh': 0,
+            'extensions': {'EXT_mesh_gpu_instancing': {'attributes': {
+                'TRANSLATION': writer.add(translations, 'VEC3', bounds=True),
+                'SCALE': writer.add(scales, 'VEC3'),
+                '_COLOR_0': writer.add(colors, 'VEC3'),
+            }}},
+            # Instance i is sphere_ids[i], for picking; not walls for GLTFCollision
+            'extras': {'sphere_ids': [sphere_id for sphere_id, _, _, _ in members], 'collider': False},
+        }]
+        data['scenes'][0]['nodes'] = [0]
+    if extras:
+        data['scenes'][0]['extras'] = extras
+    return writer.glb(data)
@@ -0,0 +1,269 @@
+import math
+import persistent
+from persistent.mapping import PersistentMapping
+
+LEAF_CAPACITY = 8
+MAX_DEPTH = 12
+INITIAL_HALF_SIZE = 8.0
+
+
+def _octant(center, position):
+    return (
+        (1 if position[0] >= center[0] else 0)
+        | (2 if position[1] >= center[1] else 0)
+        | (4 if position[2] >= center[2] else 0)
+    )
+
+
+def _child_center(center, half_size, octant):
+    offset = half_size / 2
+    return (
+        center[0] + (offset if octant & 1 else -offset),
+        center[1] + (offset if octant & 2 else -offset),
+        center[2] + (offset if octant & 4 else -offset),
+    )
+
+
+def _item_bounds(position, radius):
+    return (
+        tuple(c - radius for c in position),
+        tuple(c + radius for c in position),
+    )
+
+
+def _union_bounds(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return (
+        tuple(min(x, y) for x, y in zip(a[0], b[0])),
+        tuple(max(x, y) for x, y in zip(a[1], b[1])),
+    )
+
+
+class OctreeNode(persistent.Persistent):
+    """One cell of a mind octree with its cluster summary.
+
+    Leaves keep their members in ``items`` (sphere_id -> (position, radius, color)),
+    internal nodes keep eight ``children``. Every node carries the member count,
+    position sum (for the centroid), content bounds and colour histogram of its subtree.
+    """
+
+    def __init__(self, center, half_size):
+        self.center = tuple(center)
+        self.half_size = half_size
+        self.count = 0
+        self.position_sum = (0.0, 0.0, 0.0)
+        self.bounds = None  # ((min_x, min_y, min_z), (max_x, max_y, max_z)) including radius
+        self.colors = {}
+        self.items = {}
+        self.children = None
+
+    def is_leaf(self):
+        return self.children is None
+
+    def contains(self, position):
+        return all(abs(p - c) <= self.half_size for p, c in zip(position, self.center))
+
+    def get_centroid(self):
+        if self.count == 0:
+            return list(self.center)
+        return [s / self.count for s in self.position_sum]
+
+    def get_bounding_sphere(self):
+        if self.bounds is None:
+            return list(self.center), 0.0
+        lo, hi = self.bounds
+        center = [(a + b) / 2 for a, b in zip(lo, hi)]
+        radius = math.sqrt(sum((b - a) ** 2 for a, b in zip(lo, hi))) / 2
+        return center, radius
+
+    def get_dominant_color(self):
+        if not self.colors:
+            return None
+        return max(self.colors.items(), key=lambda kv: (kv[1], kv[0]))[0]
+
+    def add_stats(self, position, radius, color):
+        self.count += 1
+        self.position_sum = tuple(s + p for s, p in zip(self.position_sum, position))
+        self.bounds = _union_bounds(self.bounds, _item_bounds(position, radius))
+        self.colors[color] = self.colors.get(color, 0) + 1
+        self._p_changed = True
+
+    def remove_stats(self, position, color):
+        self.count -= 1
+        self.position_sum = tuple(s - p for s, p in zip(self.position_sum, position))
+        remaining = self.colors.get(color, 0) - 1
+        if remaining > 0:
+            self.colors[color] = remaining
+        else:
+            self.colors.pop(color, None)
+        if self.count == 0:
+            self.position_sum = (0.0, 0.0, 0.0)
+        self._p_changed = True
+
+    def recompute_bounds(self):
+        """Rebuild content bounds from direct children/items only (O(8) or O(LEAF_CAPACITY))."""
+        bounds = None
+        if self.is_leaf():
+            for position, radius, _ in self.items.values():
+                bounds = _union_bounds(bounds, _item_bounds(position, radius))
+        else:
+            for child in self.children:
+                bounds = _union_bounds(bounds, child.bounds)
+        self.bounds = bounds
+
+    def iter_items(self):
+        if self.is_leaf():
+            yield from self.items.items()
+        else:
+            for child in self.children:
+                yield from child.iter_items()
+
+    def split(self):
+        self.children = [
+            OctreeNode(_child_center(self.center, self.half_size, octant), self.half_size / 2)
+            for octant in range(8)
+        ]
+        for sphere_id, (position, radius, color) in self.items.items():
+            child = self.children[_octant(self.center, position)]
+            child.items[sphere_id] = (position, radius, color)
+            child.add_stats(position, radius, color)
+        self.items = {}
+        self._p_changed = True
+
+    def collapse(self):
+        self.items = dict(self.iter_items())
+        self.children = None
+        self._p_changed = True
+
+    def to_summary(self, depth):
+        center, radius = self.get_bounding_sphere()
+        summary = {
+            'depth': depth,
+            'count': self.count,
+            'centroid': self.get_centroid(),
+            'center': center,
+            'radius': radius,
+            'color': self.get_dominant_color(),
+            'is_leaf': self.is_leaf(),
+        }
+        if self.is_leaf():
+            summary['sphere_ids'] = sorted(self.items.keys())
+        return summary
+
+
+class MindOctree(persistent.Persistent):
+    """Incrementally maintained hierarchical summary of the spheres in a mind."""
+
+    def __init__(self):
+        self.root = OctreeNode((0.0, 0.0, 0.0), INITIAL_HALF_SIZE)
+        self.entries = PersistentMapping()  # sphere_id -> (position, radius, color)
+
+    def get_count(self):
+        return self.root.count
+
+    def has(self, sphere_id):
+        return sphere_id in self.entries
+
+    def _grow_to(self, position):
+        while not self.root.contains(position):
+            old_root = self.root
+            half_size = old_root.half_size
+            direction = [1 if p >= c else -1 for p, c in zip(position, old_root.center)]
+            new_center = tuple(c + d * half_size for c, d in zip(old_root.center, direction))
+            new_root = OctreeNode(new_center, half_size * 2)
+            new_root.children = [
+                OctreeNode(_child_center(new_center, half_size * 2, octant), half_size)
+                for octant in range(8)
+            ]
+            new_root.children[_octant(new_center, old_root.center)] = old_root
+            new_root.items = {}
+            new_root.count = old_root.count
+            new_root.position_sum = old_root.position_sum
+            new_root.bounds = old_root.bounds
+            new_root.colors = dict(old_root.colors)
+            self.root = new_root
+
+    def insert(self, sphere_id, position, radius, color):
+        if sphere_id in self.entries:
+            self.remove(sphere_id)
+        position = tuple(float(c) for c in position)
+        radius = float(radius)
+        self._grow_to(position)
+        self.entries[sphere_id] = (position, radius, color)
+
+        node = self.root
+        depth = 0
+        while True:
+            node.add_stats(position, radius, color)
+            if node.is_leaf():
+                node.items[sphere_id] = (position, radius, color)
+                if len(node.items) > LEAF_CAPACITY and depth < MAX_DEPTH:
+                    node.split()
+                return
+            node = node.children[_octant(node.center, position)]
+            depth += 1
+
+    def remove(self, sphere_id):
+        entry = self.entries.pop(sphere_id, None)
+        if entry is None:
+            return False
+        position, _, color = entry
+
+        path = []
+        node = self.root
+        while True:
+            path.append(node)
+            node.remove_stats(position, color)
+            if node.is_leaf():
+                node.items.pop(sphere_id, None)
+                break
+            node = node.children[_octant(node.center, position)]
+
+        for node in reversed(path):
+            if not node.is_leaf() and node.count <= LEAF_CAPACITY:
+                node.collapse()
+            node.recompute_bounds()
+        return True
+
+    def move(self, sphere_id, position=None, radius=None, color=None):
+        entry = self.entries.get(sphere_id)
+        if entry is None:
+            return False
+        old_position, old_radius, old_color = entry
+        self.insert(
+            sphere_id,
+            position if position is not None else old_position,
+            radius if radius is not None else old_radius,
+            color if color is not None else old_color,
+        )
+        return True
+
+    def cut(self, max_depth=None, max_error=None):
+        """Return node summaries for the tree cut at a depth and/or bounding-radius budget.
+
+        A node is returned as a cluster when it is a leaf, sits at ``max_depth``, or its
+        bounding sphere radius is already within ``max_error``; otherwise its non-empty
+        children are visited instead.
+        """
+        if self.root.count == 0:
+            return []
+
+        nodes = []
+        stack = [(self.root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            _, radius = node.get_bounding_sphere()
+            if (
+                node.is_leaf()
+                or (max_depth is not None and depth >= max_depth)
+                or (max_error is not None and radius <= max_error)
+            ):
+                nodes.append(node.to_summary(depth))
+                continue
+            for child in reversed(node.children):
+                if child.count > 0:
+                    stack.append((child, depth + 1))
+        return nodes
@@ -0,0 +1,316 @@
+"""NumPy port of the floating-sphere simulation of the client ``Mind`` component.
+
+Positions are local to the mind container (its centre is the origin) and each
+sphere's radius is its ``scale``, exactly like the browser version in
+``client/my_app_name/components/mentalfactor.py``. Every step applies random
+drift, clamps speed, integrates, reflects off the container wall and resolves
+sphere-to-sphere contacts with restitution impulses and damping. Contacts are
+resolved for all pairs at once instead of one pair after another, so the result
+is not bit-identical to the browser but follows the same dynamics.
+
+Like the browser, bodies that stay slower than ``sleep_speed`` for
+``sleep_steps`` steps fall asleep: they are no longer integrated and contacts
+between two sleepers are skipped until an awake body hits them or ``wake`` is
+called.
+"""
+import numpy as np
+
+DEFAULT_RADIUS = 0.8
+DEFAULT_CONTAINER_RADIUS = 3.0
+PAIR_CHUNK_ELEMENTS = 2_000_000
+
+
+def random_positions(count, container_radius, rng):
+    """Same start distribution as the client: spherical coords within 60% of the container"""
+    theta = rng.random(count) * np.pi * 2
+    phi = rng.random(count) * np.pi
+    r = rng.random(count) * container_radius * 0.6
+    return np.stack([
+        r * np.sin(phi) * np.cos(theta),
+        r * np.cos(phi),
+        r * np.sin(phi) * np.sin(theta),
+    ], axis=1)
+
+
+def random_velocities(count, rng, spread=0.08):
+    return (rng.random((count, 3)) - 0.5) * spread
+
+
+def dense_pairs(positions, radii):
+    """All overlapping pairs (i < j) by brute force, chunked to bound memory"""
+    count = len(positions)
+    rows = max(1, PAIR_CHUNK_ELEMENTS // max(count, 1))
+    pair_i, pair_j = [], []
+    for start in range(0, count, rows):
+        stop = min(count, start + rows)
+        delta = positions[None, :, :] - positions[start:stop, None, :]
+        dist_sq = np.einsum('ijk,ijk->ij', delta, delta)
+        reach = radii[start:stop, None] + radii[None, :]
+        hit = dist_sq < reach * reach
+        hit &= np.arange(count)[None, :] > np.arange(start, stop)[:, None]
+        i, j = np.nonzero(hit)
+        pair_i.append(i + start)
+        pair_j.append(j)
+    if not pair_i:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    return np.concatenate(pair_i), np.concatenate(pair_j)
+
+
+# Half of the 26 neighbouring cells, so every pair of cells is visited once
+HALF_NEIGHBOURHOOD = [
+    (dx, dy, dz)
+    for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+    if (dx, dy, dz) > (0, 0, 0)
+]
+
+
+def grid_pairs(positions, radii, cell_size=None):
+    """Overlapping pairs (i < j) using a uniform grid broad phase.
+
+    Cells are one largest diameter wide, so any two touching spheres sit in the
+    same or in neighbouring cells. The client runs the same grid in JS.
+    """
+    count = len(positions)
+    if count < 2:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    if cell_size is None:
+        cell_size = 2 * float(radii.max())
+    if cell_size <= 0:
+        return dense_pairs(positions, radii)
+
+    cells = np.floor(positions / cell_size).astype(np.int64)
+    cells -= cells.min(axis=0) - 1  # keep a margin so neighbour offsets stay non-negative
+    dims = cells.max(axis=0) + 2
+
+    def cell_keys(c):
+        return (c[:, 0] * dims[1] + c[:, 1]) * dims[2] + c[:, 2]
+
+    keys = cell_keys(cells)
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    index = np.arange(count)
+
+    pair_i, pair_j = [], []
+    for offset in [(0, 0, 0)] + HALF_NEIGHBOURHOOD:
+        neighbour = cell_keys(cells + np.array(offset)) if offset != (0, 0, 0) else keys
+        lo = np.searchsorted(sorted_keys, neighbour, side='left')
+        hi = np.searchsorted(sorted_keys, neighbour, side='right')
+        counts = hi - lo
+        total = int(counts.sum())
+        if total == 0:
+            continue
+        i = np.repeat(index, counts)
+        first = np.repeat(lo, counts)
+        within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        j = order[first + within]
+        if offset == (0, 0, 0):
+            keep = j > i
+            i, j = i[keep], j[keep]
+        pair_i.append(i)
+        pair_j.append(j)
+
+    if not pair_i:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    i = np.concatenate(pair_i)
+    j = np.concatenate(pair_j)
+
+    delta = positions[j] - positions[i]
+    reach = radii[i] + radii[j]
+    hit = np.einsum('ij,ij->i', delta, delta) < reach * reach
+    i, j = i[hit], j[hit]
+    return np.minimum(i, j), np.maximum(i, j)
+
+
+BROAD_PHASES = {
+    'grid': grid_pairs,
+    'none': dense_pairs,
+}
+
+
+class MindPhysics:
+    """Vectorized sphere simulation inside a spherical glass container.
+
+    Pass ``seed`` for a deterministic run: the random start layout, start
+    velocities and drift all come from one seeded generator. Set
+    ``drift_chance`` to 0 to turn random drift off and ``sleep_steps`` to 0 to
+    keep every body simulated.
+    """
+
+    def __init__(self, radii, container_radius=DEFAULT_CONTAINER_RADIUS, positions=None,
+                 velocities=None, seed=None, dt=0.016, max_speed=0.6, restitution=0.7,
+                 wall_damping=0.8, contact_damping=0.9, linear_damping=1.0,
+                 drift_chance=0.05, drift_strength=0.04, sleep_speed=0.01, sleep_steps=60,
+                 broad_phase='grid'):
+        if broad_phase not in BROAD_PHASES:
+            raise ValueError(f"Unknown broad phase '{broad_phase}', expected one of {sorted(BROAD_PHASES)}")
+        self.rng = np.random.default_rng(seed)
+        self.radii = np.asarray(radii, dtype=np.float64).reshape(-1)
+        count = len(self.radii)
+        self.container_radius = float(container_radius)
+        self.positions = (
+            np.array(positions, dtype=np.float64).reshape(count, 3)
+            if positions is not None
+            else random_positions(count, self.container_radius, self.rng)
+        )
+        self.velocities = (
+            np.array(velocities, dtype=np.float64).reshape(count, 3)
+            if velocities is not None
+            else random_velocities(count, self.rng)
+        )
+        self.dt = dt
+        self.max_speed = max_speed
+        self.restitution = restitution
+        self.wall_damping = wall_damping
+        self.contact_damping = contact_damping
+        self.linear_damping = linear_damping
+        self.drift_chance = drift_chance
+        self.drift_strength = drift_strength
+        self.sleep_speed = sleep_speed
+        self.sleep_steps = sleep_steps
+        self.awake = np.ones(count, dtype=bool)
+        self.calm = np.zeros(count, dtype=np.int64)
+        self.broad_phase = broad_phase
+        self.steps = 0
+
+    def awake_count(self):
+        return int(self.awake.sum())
+
+    def wake(self, indices=None):
+        """Wake the given bodies, or all of them"""
+        if indices is None:
+            indices = slice(None)
+        self.awake[indices] = True
+        self.calm[indices] = 0
+
+    def find_pairs(self):
+        return BROAD_PHASES[self.broad_phase](self.positions, self.radii)
+
+    def step(self):
+        pos, vel, awake = self.positions, self.velocities, self.awake
+        self.steps += 1
+        if len(pos) == 0 or not awake.any():
+            return
+
+        # Random drift
+        if self.drift_chance > 0:
+            drifting = awake & (self.rng.random(len(pos)) < self.drift_chance)
+            vel[drifting] += (self.rng.random((int(drifting.sum()), 3)) - 0.5) * self.drift_strength
+
+        np.clip(vel, -self.max_speed, self.max_speed, out=vel)
+        vel *= self.linear_damping
+        pos[awake] += vel[awake] * self.dt
+
+        self.apply_container()
+        self.update_sleep()
+        self.resolve_contacts(*self.find_pairs())
+
+    def update_sleep(self):
+        """Put bodies to sleep after ``sleep_steps`` consecutive slow steps"""
+        if self.sleep_steps <= 0:
+            return
+        slow = np.einsum('ij,ij->i', self.velocities, self.velocities) < self.sleep_speed ** 2
+        self.calm = np.where(slow & self.awake, self.calm + 1, 0)
+        falling_asleep = self.calm >= self.sleep_steps
+        self.awake[falling_asleep] = False
+        self.velocities[falling_asleep] = 0.0
+
+    def apply_container(self):
+        """Push spheres that left the container back inside, reflect and damp their velocity"""
+        pos, vel = self.positions, self.velocities
+        max_radius = self.container_radius - self.radii
+        dist = np.linalg.norm(pos, axis=1)
+        outside = (dist > max_radius) & self.awake
+        if outside.any():
+            normal = pos[outside] / dist[outside, None]
+            pos[outside] = normal * max_radius[outside, None]
+            dot = np.einsum('ij,ij->i', vel[outside], normal)
+            vel[outside] = (vel[outside] - 2 * dot[:, None] * normal) * self.wall_damping
+
+    def resolve_contacts(self, i, j):
+        pos, vel, radii = self.positions, self.velocities, self.radii
+
+        # Resting contacts between sleepers stay asleep; an awake body hitting a sleeper wakes it
+        active = self.awake[i] | self.awake[j]
+        i, j = i[active], j[active]
+        if len(i) == 0:
+            return
+        self.wake(np.concatenate([i, j]))
+
+        delta = pos[j] - pos[i]
+        distance = np.linalg.norm(delta, axis=1)
+        coincident = distance == 0
+        if coincident.any():
+            # The client skips coincident pairs and leaves them stuck; pick a random axis instead
+            axis = self.rng.normal(size=(int(coincident.sum()), 3))
+            delta[coincident] = axis / np.linalg.norm(axis, axis=1)[:, None] * 1e-9
+            distance[coincident] = 1e-9
+        normal = delta / distance[:, None]
+
+        # Separate overlapping spheres, half the overlap each
+        separation = ((radii[i] + radii[j] - distance) * 0.5)[:, None] * normal
+        np.subtract.at(pos, i, separation)
+        np.add.at(pos, j, separation)
+
+        # Restitution impulse for approaching pairs (equal mass)
+        vel_along_normal = np.einsum('ij,ij->i', vel[j] - vel[i], normal)
+        approaching = vel_along_normal < 0
+        if not approaching.any():
+            return
+        ai, aj, an = i[approaching], j[approaching], normal[approaching]
+        impulse = (-(1 + self.restitution) * vel_along_normal[approaching] / 2)[:, None] * an
+        np.subtract.at(vel, ai, impulse)
+        np.add.at(vel, aj, impulse)
+
+        # Damping once per resolved contact, as the client does pair by pair
+        contacts = np.bincount(np.concatenate([ai, aj]), minlength=len(pos))
+        vel *= np.power(self.contact_damping, contacts)[:, None]
+
+    def max_overlap(self):
+        i, j = self.find_pairs()
+        if len(i) == 0:
+            return 0.0
+        distance = np.linalg.norm(self.positions[j] - self.positions[i], axis=1)
+        return float(np.max(self.radii[i] + self.radii[j] - distance))
+
+    def max_speed_now(self):
+        if len(self.velocities) == 0:
+            return 0.0
+        return float(np.max(np.linalg.norm(self.velocities, axis=1)))
+
+    def settle(self, max_steps=2000, speed_tolerance=1e-3, overlap_tolerance=1e-3, check_every=10):
+        """Step until spheres are at rest and no longer overlap; returns True when settled"""
+        for _ in range(max_steps):
+            self.step()
+            if self.steps % check_every == 0 and self.max_speed_now() < speed_tolerance \
+                    and self.max_overlap() < overlap_tolerance:
+                return True
+        return self.max_overlap() < overlap_tolerance
+
+
+def settle_layout(radii, container_radius=DEFAULT_CONTAINER_RADIUS, positions=None, seed=None,
+                  max_steps=2000, broad_phase='grid'):
+    """Relax a layout into non-overlapping rest positions.
+
+    Drift is turned off and a per-step linear damping is added so the layout
+    converges; collisions, wall reflection and impulses are the client's.
+    Coincident start positions (e.g. every sphere still at the default origin)
+    are replaced by a seeded random start layout.
+    """
+    radii = np.asarray(radii, dtype=np.float64).reshape(-1)
+    if positions is not None:
+        positions = np.array(positions, dtype=np.float64).reshape(len(radii), 3)
+        if len(np.unique(positions, axis=0)) < len(positions):
+            positions = None
+    engine = MindPhysics(
+        radii,
+        container_radius=container_radius,
+        positions=positions,
+        velocities=np.zeros((len(radii), 3)),
+        seed=seed,
+        linear_damping=0.95,
+        drift_chance=0.0,
+        broad_phase=broad_phase,
+    )
+    settled = engine.settle(max_steps=max_steps)
+    engine.apply_container()
+    return engine.positions, engine.steps, settled
@@ -0,0 +1,94 @@
+"""Periodic exact recompute of every mind's octree and aggregates, inside the web process.
+
+The ZODB FileStorage is locked by the process that opened it, the one serving
+requests, so the drift correction cannot run as a separate command. A daemon
+thread of that process (turned on by ``MIND_RECOMPUTE=1``, which only the
+server entrypoint sets) checks each mind against PostGIS right after start and
+then every ``MIND_RECOMPUTE_INTERVAL`` seconds. Only minds whose octree or
+aggregates actually drifted are written: FileStorage only ever appends, so
+rewriting unchanged minds would grow the file on every run. The first run also
+backfills the sphere -> minds index and the octrees of minds stored before
+they had one.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+def recompute_enabled():
+    """True only where the server entrypoint turned the thread on (MIND_RECOMPUTE=1).
+
+    Shells, scripts, tests and other commands never set it, so they never open
+    the storage. runserver with autoreload serves from a child process marked
+    RUN_MAIN; its watching parent inherits the variable but must not start.
+    """
+    if not getattr(settings, 'MIND_RECOMPUTE', False):
+        return False
+    if 'runserver' in sys.argv and '--noreload' not in sys.argv:
+        return os.environ.get('RUN_MAIN') == 'true'
+    return True
+
+
+def recompute_all_minds():
+    """Correct every mind's octree (and backfill the sphere -> minds index); returns (minds, rewritten)"""
+    # Imported here: zodb_management opens (and locks) the storage on import
+    from ZODB.POSException import ConflictError
+    from app_notes.funcHelper import recompute_mind_aggregates, ensure_sphere_minds_index
+    from zodb.zodb_management import get_connection
+
+    connection, root = get_connection()
+    try:
+        ensure_sphere_minds_index(root)
+        mind_ids = list(root.minds.keys()) if hasattr(root, 'minds') else []
+        rewritten = 0
+        for mind_id in mind_ids:
+            try:
+                rewritten += recompute_mind_aggregates(root, mind_id)
+            except ValueError:
+                # Removed since the ids were listed
+                continue
+            except ConflictError:
+                # A request changed the mind meanwhile; the next run gets it
+                logger.warning('Mind %s changed during recompute, skipped', mind_id)
+        return len(mind_ids), rewritten
+    finally:
+        connection.close()
+
+
+class MindRecompute:
+    def __init__(self, interval=None):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def start(self):
+        interval = self.interval if self.interval is not None else getattr(settings, 'MIND_RECOMPUTE_INTERVAL', 0)
+        if interval <= 0 or not recompute_enabled():
+            return
+        with self.lock:
+            if self.thread is not None:
+                return
+            self.thread = threading.Thread(target=self._loop, args=(interval,), name='mind-recompute', daemon=True)
+            self.thread.start()
+
+    def _loop(self, interval):
+        while True:
+            try:
+                started = time.perf_counter()
+                count, rewritten = recompute_all_minds()
+                logger.info('Checked %d minds in %.2fs, %d drifted', count, time.perf_counter() - started, rewritten)
+            except Exception:
+                logger.exception('Recomputing mind aggregates failed')
+            finally:
+                close_old_connections()
+            time.sleep(interval)
+
+
+recompute = MindRecompute()
@@ -1,10 +1,11 @@
 import json
 from functools import wraps
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.db import transaction
 from .models import MentalSphere, Mind
+from .mindPhysics import DEFAULT_CONTAINER_RADIUS
 from .funcHelper import (
     create_mental_sphere_zodb,
     update_mental_sphere_zodb,
@@ -13,7 +14,11 @@ from .funcHelper import (
     update_mind_zodb,
     get_mind_zodb,
     add_mental_spheres_to_mind,
-    delete_mental_spheres_from_mind
+    delete_mental_spheres_from_mind,
+    get_mind_lod_zodb,
+    get_mind_label_atlas_zodb,
+    get_mind_glb_zodb,
+    settle_mind_layout
 )
 from zodb.zodb_management import get_connection
 
@@ -189,6 +194,153 @@ def delete_mental_sphere(request):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+@csrf_exempt
+@require_http_methods(["POST"])
+def get_mind_lod(request):
+    """Return the mind's octree cut at a depth and/or error budget as cluster nodes"""
+    try:
+        data = get_request_data(request)
+        
+        mind_id = data.get('mind_id')
+        depth = data.get('depth')
+        error = data.get('error')
+        
+        if not mind_id:
+            return JsonResponse({'error': 'mind_id is required'}, status=400)
+        
+        try:
+            depth = int(depth) if depth not in (None, '') else None
+            error = float(error) if error not in (None, '') else None
+        except (TypeError, ValueError):
+            return JsonResponse({'error': 'depth must be an integer and error a number'}, status=400)
+        
+        _, root = get_connection()
+        
+        lod = get_mind_lod_zodb(root, int(mind_id), max_depth=depth, max_error=error)
+        if lod is None:
+            return JsonResponse({'error': 'Mind not found'}, status=404)
+        
+        return JsonResponse(lod, status=200)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def get_mind_label_atlas(request):
+    """Return the mind's sphere name labels pre-baked into one PNG atlas"""
+    try:
+        data = get_request_data(request)
+        
+        mind_id = data.get('mind_id')
+        
+        if not mind_id:
+            return JsonResponse({'error': 'mind_id is required'}, status=400)
+        
+        _, root = get_connection()
+        
+        atlas = get_mind_label_atlas_zodb(root, int(mind_id))
+        if atlas is None:
+            return JsonResponse({'error': 'Mind not found'}, status=404)
+        
+        return JsonResponse(atlas, status=200)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@csrf_exempt
+@require_http_methods(["GET"])
+def get_mind_glb(request):
+    """Return the mind as one GLB with GPU-instanced spheres, for a single GLTFLoader call.
+
+    GET so loaders and caches can use it directly. The ETag is the mind's
+    version; with ``v`` set to that version (as get_mind reports it) the URL
+    never changes content and is cached for good.
+    """
+    try:
+        mind_id = request.GET.get('mind_id')
+        
+        if not mind_id:
+            return JsonResponse({'error': 'mind_id is required'}, status=400)
+        
+        try:
+            mind_id = int(mind_id)
+        except ValueError:
+            return JsonResponse({'error': 'mind_id must be an integer'}, status=400)
+        
+        _, root = get_connection()
+        
+        result = get_mind_glb_zodb(root, mind_id)
+        if result is None:
+            return JsonResponse({'error': 'Mind not found'}, status=404)
+        version, glb = result
+        
+        etag = f'"{version}"'
+        if request.GET.get('v') == version:
+            cache_control = 'public, max-age=31536000, immutable'
+        else:
+            cache_control = 'no-cache'
+        
+        if etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponse(status=304)
+        else:
+            response = HttpResponse(glb, content_type='model/gltf-binary')
+            response['Content-Length'] = str(len(glb))
+            response['Content-Disposition'] = f'inline; filename="mind-{mind_id}.glb"'
+        response['ETag'] = etag
+        response['Cache-Control'] = cache_control
+        return response
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def settle_mind(request):
+    """Relax the mind's sphere layout server-side and store the resting positions"""
+    try:
+        data = get_request_data(request)
+        
+        mind_id = data.get('mind_id')
+        
+        if not mind_id:
+            return JsonResponse({'error': 'mind_id is required'}, status=400)
+        
+        try:
+            container_radius = float(data.get('container_radius', DEFAULT_CONTAINER_RADIUS))
+            seed = int(data['seed']) if data.get('seed') not in (None, '') else None
+            max_steps = int(data.get('max_steps', 2000))
+        except (TypeError, ValueError):
+            return JsonResponse({'error': 'container_radius, seed and max_steps must be numbers'}, status=400)
+        
+        _, root = get_connection()
+        
+        result = settle_mind_layout(
+            root,
+            int(mind_id),
+            container_radius=container_radius,
+            seed=seed,
+            max_steps=max_steps
+        )
+        
+        return JsonResponse({
+            'message': 'Mind layout settled' if result['settled'] else 'Mind layout did not fully settle',
+            'mind_id': int(mind_id),
+            'steps': result['steps'],
+            'settled': result['settled'],
+            'positions': [
+                {'id': sphere_id, 'position': position}
+                for sphere_id, position in result['positions'].items()
+            ]
+        }, status=200)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=404)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+
 # ============= MentalSphere CRUD Methods =============
 
 @csrf_exempt
@@ -0,0 +1,67 @@
+"""Benchmark the headless Mind physics engine.
+
+Run from the backend directory:
+
+    python benchmarks/bench_mind_physics.py
+    python benchmarks/bench_mind_physics.py --sizes 10 100 1000 10000 --seed 7
+    python benchmarks/bench_mind_physics.py --broad-phase none
+
+Each size gets a container large enough to keep the same packing density, so
+the numbers compare the cost per step rather than how crowded the mind is.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app_notes.mindPhysics import BROAD_PHASES, MindPhysics, settle_layout  # noqa: E402
+
+SPHERE_RADIUS = 0.2
+PACKING_DENSITY = 0.15
+
+
+def container_radius_for(count):
+    return SPHERE_RADIUS * (count / PACKING_DENSITY) ** (1 / 3) + SPHERE_RADIUS
+
+
+def time_steps(count, seed, steps, broad_phase):
+    engine = MindPhysics(
+        [SPHERE_RADIUS] * count, container_radius_for(count), seed=seed, broad_phase=broad_phase
+    )
+    engine.step()  # warm up
+    start = time.perf_counter()
+    for _ in range(steps):
+        engine.step()
+    return (time.perf_counter() - start) / steps * 1000
+
+
+def time_settle(count, seed, max_steps, broad_phase):
+    start = time.perf_counter()
+    _, steps, settled = settle_layout(
+        [SPHERE_RADIUS] * count, container_radius_for(count), seed=seed, max_steps=max_steps,
+        broad_phase=broad_phase
+    )
+    return (time.perf_counter() - start) * 1000, steps, settled
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--steps', type=int, default=50, help='Steps timed per size (fewer for large sizes)')
+    parser.add_argument('--settle-steps', type=int, default=500)
+    parser.add_argument('--broad-phase', choices=sorted(BROAD_PHASES), default='grid')
+    args = parser.parse_args()
+
+    print(f"{'spheres':>8} {'ms/step':>10} {'settle ms':>10} {'steps':>6} {'settled':>8}")
+    for count in args.sizes:
+        steps = max(3, min(args.steps, 200_000 // max(count, 1)))
+        step_ms = time_steps(count, args.seed, steps, args.broad_phase)
+        settle_ms, settle_steps, settled = time_settle(count, args.seed, args.settle_steps, args.broad_phase)
+        print(f"{count:>8} {step_ms:>10.3f} {settle_ms:>10.1f} {settle_steps:>6} {str(settled):>8}")
+
+
+if __name__ == '__main__':
+    main()
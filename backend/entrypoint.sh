@@ -12,4 +12,6 @@ python manage.py migrate
 # Collect static files
 python manage.py collectstatic --noinput
 
+# Only the server started below runs the mind recompute thread (see app_notes/mindRecompute.py)
+export MIND_RECOMPUTE=1
 exec "$@"
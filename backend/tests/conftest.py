@@ -0,0 +1,8 @@
+"""Tests of the pure modules (no Django, database or ZODB storage). Run from the backend directory:
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,122 @@
+import json
+import random
+
+import pytest
+
+from app_metrics.ddSketch import RELATIVE_ACCURACY, DDSketch
+
+QUANTILES = (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99, 0.999)
+
+
+def sketch_of(values):
+    sketch = DDSketch()
+    for value in values:
+        sketch.add(value)
+    return sketch
+
+
+def exact_quantile(values, q):
+    """The observed value the sketch's rank rule points at"""
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def assert_accurate(sketch, values, accuracy=RELATIVE_ACCURACY):
+    for q in QUANTILES:
+        exact = exact_quantile(values, q)
+        assert abs(sketch.quantile(q) - exact) <= accuracy * exact + 1e-12, q
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_quantiles_within_relative_accuracy(seed):
+    rng = random.Random(seed)
+    # Frame times around 16 ms with a long tail, and asset times over several orders of magnitude
+    values = [rng.lognormvariate(2.8, 0.4) for _ in range(5000)] + [rng.uniform(0.01, 60000) for _ in range(500)]
+    sketch = sketch_of(values)
+    assert sketch.count == len(values)
+    assert sketch.sum == pytest.approx(sum(values))
+    assert sketch.min == min(values) and sketch.max == max(values)
+    assert_accurate(sketch, values)
+    assert sketch.quantile(0) == min(values) and sketch.quantile(1) == max(values)
+
+
+def test_weighted_add_equals_repeated_add():
+    weighted = DDSketch()
+    repeated = DDSketch()
+    for value, count in [(16.7, 540), (33.3, 2), (8.1, 17)]:
+        weighted.add(value, count)
+        for _ in range(count):
+            repeated.add(value)
+    assert weighted.buckets == repeated.buckets
+    assert weighted.count == repeated.count == 559
+    assert weighted.sum == pytest.approx(repeated.sum)
+    weighted.add(5.0, 0)
+    assert weighted.count == 559
+
+
+def test_merge_matches_one_sketch_of_everything():
+    rng = random.Random(4)
+    parts = [[rng.expovariate(1 / 20) for _ in range(rng.randrange(1, 800))] for _ in range(5)]
+    merged = DDSketch()
+    for part in parts:
+        merged.merge(sketch_of(part))
+    everything = [value for part in parts for value in part]
+    whole = sketch_of(everything)
+
+    assert merged.buckets == whole.buckets
+    assert (merged.count, merged.zero_count, merged.min, merged.max) == (whole.count, whole.zero_count, whole.min, whole.max)
+    assert merged.sum == pytest.approx(whole.sum)
+    for q in QUANTILES:
+        assert merged.quantile(q) == whole.quantile(q)
+    assert_accurate(merged, everything)
+
+
+def test_merge_empty_and_different_accuracy():
+    sketch = sketch_of([1.0, 2.0, 3.0])
+    sketch.merge(DDSketch())
+    assert sketch.count == 3 and (sketch.min, sketch.max) == (1.0, 3.0)
+    with pytest.raises(ValueError):
+        sketch.merge(DDSketch(relative_accuracy=0.02))
+
+
+def test_zero_values():
+    values = [0.0] * 30 + [5.0] * 70
+    sketch = sketch_of(values)
+    assert sketch.zero_count == 30
+    assert sketch.quantile(0.1) == 0.0
+    assert sketch.quantile(0.5) == pytest.approx(5.0, rel=RELATIVE_ACCURACY)
+    assert_accurate(sketch, values)
+
+
+def test_empty_sketch():
+    sketch = DDSketch()
+    assert sketch.quantile(0.5) is None
+    assert sketch.mean() is None
+    assert DDSketch.from_dict(sketch.to_dict()).count == 0
+    assert DDSketch.from_dict({}).count == 0
+
+
+def test_json_round_trip():
+    rng = random.Random(5)
+    values = [rng.lognormvariate(3, 1) for _ in range(1000)] + [0.0]
+    sketch = sketch_of(values)
+    restored = DDSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+    assert restored.buckets == sketch.buckets
+    assert (restored.count, restored.zero_count, restored.sum, restored.min, restored.max) == \
+        (sketch.count, sketch.zero_count, sketch.sum, sketch.min, sketch.max)
+    for q in QUANTILES:
+        assert restored.quantile(q) == sketch.quantile(q)
+
+
+def test_collapse_keeps_bucket_limit_and_upper_quantiles():
+    rng = random.Random(6)
+    values = [10 ** rng.uniform(-2, 6) for _ in range(5000)]
+    sketch = DDSketch(max_buckets=100)
+    for value in values:
+        sketch.add(value)
+    assert len(sketch.buckets) <= 100
+    assert sketch.count == len(values)
+    # Only the lowest buckets are folded together
+    for q in (0.95, 0.99):
+        exact = exact_quantile(values, q)
+        assert sketch.quantile(q) == pytest.approx(exact, rel=RELATIVE_ACCURACY)
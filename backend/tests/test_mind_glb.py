@@ -0,0 +1,136 @@
+import json
+
+import numpy as np
+import pytest
+
+from app_notes.mindGlb import (
+    CHUNK_BIN, CHUNK_JSON, FLOAT, GLB_CHUNK_HEADER, GLB_HEADER, GLB_MAGIC, SPHERE_SEGMENTS, UNSIGNED_SHORT,
+    build_mind_glb, sphere_mesh, srgb_to_linear,
+)
+
+COMPONENTS = {'SCALAR': 1, 'VEC3': 3}
+DTYPES = {FLOAT: np.float32, UNSIGNED_SHORT: np.uint16}
+
+MEMBERS = [
+    (3, [0.5, -1.0, 2.0], 0.3, '#ff0000'),
+    (7, [-2.0, 0.25, 0.0], 0.8, '#336699'),
+    (12, [1.5, 1.5, -0.75], 0.1, 'not a colour'),
+]
+
+
+def parse_glb(raw):
+    """(gltf json, bin chunk) after checking the header and chunk layout"""
+    magic, version, length = GLB_HEADER.unpack_from(raw, 0)
+    assert (magic, version, length) == (GLB_MAGIC, 2, len(raw))
+    offset = GLB_HEADER.size
+    chunks = []
+    while offset < len(raw):
+        chunk_length, chunk_type = GLB_CHUNK_HEADER.unpack_from(raw, offset)
+        assert chunk_length % 4 == 0
+        offset += GLB_CHUNK_HEADER.size
+        chunks.append((chunk_type, raw[offset:offset + chunk_length]))
+        offset += chunk_length
+    assert offset == len(raw)
+    assert chunks[0][0] == CHUNK_JSON
+    gltf = json.loads(chunks[0][1])
+    binary = b''
+    if len(chunks) > 1:
+        assert [chunk_type for chunk_type, _ in chunks[1:]] == [CHUNK_BIN]
+        binary = chunks[1][1]
+    return gltf, binary
+
+
+def read_accessor(gltf, binary, index):
+    accessor = gltf['accessors'][index]
+    view = gltf['bufferViews'][accessor['bufferView']]
+    dtype = np.dtype(DTYPES[accessor['componentType']])
+    components = COMPONENTS[accessor['type']]
+    # glTF: views start aligned to their component size and fit in the buffer
+    assert view['byteOffset'] % dtype.itemsize == 0
+    assert view['byteOffset'] + view['byteLength'] <= gltf['buffers'][0]['byteLength']
+    assert view['byteLength'] == accessor['count'] * components * dtype.itemsize
+    data = np.frombuffer(binary, dtype=dtype, count=accessor['count'] * components, offset=view['byteOffset'])
+    return data.reshape(accessor['count'], components) if components > 1 else data
+
+
+@pytest.fixture(scope='module')
+def glb():
+    return parse_glb(build_mind_glb(MEMBERS, extras={'mind_id': 1, 'version': 'abc'}))
+
+
+def test_header_and_chunks(glb):
+    gltf, binary = glb
+    assert gltf['asset']['version'] == '2.0'
+    assert gltf['buffers'] == [{'byteLength': len(binary)}]
+    assert gltf['extensionsUsed'] == ['EXT_mesh_gpu_instancing']
+    assert gltf['scenes'][0] == {'nodes': [0], 'extras': {'mind_id': 1, 'version': 'abc'}}
+
+
+def test_accessor_bounds(glb):
+    gltf, binary = glb
+    for index, accessor in enumerate(gltf['accessors']):
+        data = read_accessor(gltf, binary, index)
+        assert np.isfinite(data.astype(np.float64)).all()
+        if 'min' in accessor:
+            assert accessor['min'] == data.min(axis=0).tolist()
+            assert accessor['max'] == data.max(axis=0).tolist()
+    # POSITION must carry bounds
+    position = gltf['meshes'][0]['primitives'][0]['attributes']['POSITION']
+    assert gltf['accessors'][position]['min'] == pytest.approx([-1, -1, -1], abs=1e-6)
+    assert gltf['accessors'][position]['max'] == pytest.approx([1, 1, 1], abs=1e-6)
+
+
+def test_sphere_mesh(glb):
+    gltf, binary = glb
+    primitive = gltf['meshes'][0]['primitives'][0]
+    positions = read_accessor(gltf, binary, primitive['attributes']['POSITION'])
+    normals = read_accessor(gltf, binary, primitive['attributes']['NORMAL'])
+    indices = read_accessor(gltf, binary, primitive['indices'])
+    assert len(positions) == (SPHERE_SEGMENTS + 1) ** 2
+    assert np.allclose(np.linalg.norm(positions, axis=1), 1, atol=1e-6)
+    assert np.array_equal(positions, normals)
+    # Two triangles per quad, minus the degenerate one at each pole
+    assert len(indices) == 3 * (2 * SPHERE_SEGMENTS * SPHERE_SEGMENTS - 2 * SPHERE_SEGMENTS)
+    assert indices.max() < len(positions)
+    triangles = indices.reshape(-1, 3)
+    assert np.all((triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2]) & (triangles[:, 0] != triangles[:, 2]))
+
+
+def test_instances(glb):
+    gltf, binary = glb
+    node = gltf['nodes'][0]
+    assert node['extras'] == {'sphere_ids': [3, 7, 12], 'collider': False}
+    attributes = node['extensions']['EXT_mesh_gpu_instancing']['attributes']
+    translations = read_accessor(gltf, binary, attributes['TRANSLATION'])
+    scales = read_accessor(gltf, binary, attributes['SCALE'])
+    colors = read_accessor(gltf, binary, attributes['_COLOR_0'])
+    assert np.allclose(translations, [position for _, position, _, _ in MEMBERS])
+    assert np.allclose(scales, [[scale] * 3 for _, _, scale, _ in MEMBERS])
+    assert np.allclose(colors[0], [1, 0, 0])
+    # Stored linear, not sRGB (0x33 / 255 = 0.2); unparseable colours fall back to white
+    assert np.allclose(colors[1], [0.0331048, 0.1328683, 0.3185468], rtol=1e-5)
+    assert np.allclose(colors[2], [1, 1, 1])
+
+
+def test_empty_mind():
+    raw = build_mind_glb([])
+    gltf, binary = parse_glb(raw)
+    # Only the JSON chunk: a glTF buffer may not be empty
+    assert binary == b''
+    assert len(raw) == GLB_HEADER.size + GLB_CHUNK_HEADER.size + GLB_CHUNK_HEADER.unpack_from(raw, GLB_HEADER.size)[0]
+    assert gltf['scenes'] == [{'nodes': []}]
+    assert not {'buffers', 'bufferViews', 'accessors', 'nodes'} & set(gltf)
+
+
+def test_srgb_to_linear():
+    assert np.allclose(srgb_to_linear('#000000'), 0)
+    assert np.allclose(srgb_to_linear('#ffffff'), 1)
+    assert srgb_to_linear('#808080')[0] == pytest.approx(0.2158605, rel=1e-5)
+    assert np.allclose(srgb_to_linear(None), 1)
+
+
+def test_sphere_mesh_segments():
+    positions, _, indices = sphere_mesh(4, 3)
+    assert len(positions) == 5 * 4
+    assert indices.dtype == np.uint16
+    assert len(indices) == 3 * (2 * 4 * 3 - 2 * 4)
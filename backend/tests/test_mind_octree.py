@@ -0,0 +1,133 @@
+import random
+
+import pytest
+
+from app_notes.mindOctree import INITIAL_HALF_SIZE, LEAF_CAPACITY, MindOctree
+
+COLORS = ('#ff0000', '#00ff00', '#0000ff')
+
+
+def brute_force(entries):
+    """(count, position sum, bounds) computed directly from sphere_id -> (position, radius, color)"""
+    if not entries:
+        return 0, (0.0, 0.0, 0.0), None
+    values = list(entries.values())
+    position_sum = tuple(sum(position[axis] for position, _, _ in values) for axis in range(3))
+    lo = tuple(min(position[axis] - radius for position, radius, _ in values) for axis in range(3))
+    hi = tuple(max(position[axis] + radius for position, radius, _ in values) for axis in range(3))
+    return len(values), position_sum, (lo, hi)
+
+
+def check_node(node):
+    """Every node's summary matches its own subtree; returns the subtree's entries"""
+    entries = dict(node.iter_items())
+    count, position_sum, bounds = brute_force(entries)
+    assert node.count == count
+    assert node.position_sum == pytest.approx(position_sum, abs=1e-9)
+    if bounds is None:
+        assert node.bounds is None
+    else:
+        assert node.bounds[0] == pytest.approx(bounds[0])
+        assert node.bounds[1] == pytest.approx(bounds[1])
+    colors = {}
+    for _, _, color in entries.values():
+        colors[color] = colors.get(color, 0) + 1
+    assert node.colors == colors
+    for position, _, _ in entries.values():
+        assert node.contains(position)
+    if node.is_leaf():
+        assert count <= LEAF_CAPACITY
+    else:
+        for child in node.children:
+            check_node(child)
+    return entries
+
+
+def check_tree(octree, expected):
+    assert octree.get_count() == len(expected)
+    assert dict(octree.entries) == expected
+    assert check_node(octree.root) == expected
+    count, _, bounds = brute_force(expected)
+    if count:
+        # A cut with no budget lists every member exactly once
+        ids = [sphere_id for node in octree.cut() for sphere_id in node['sphere_ids']]
+        assert sorted(ids) == sorted(expected)
+        lo, hi = octree.root.bounds
+        assert lo == pytest.approx(bounds[0]) and hi == pytest.approx(bounds[1])
+    else:
+        assert octree.cut() == []
+
+
+def random_entry(rng, spread):
+    position = tuple(rng.uniform(-spread, spread) for _ in range(3))
+    return position, rng.uniform(0.05, 0.5), rng.choice(COLORS)
+
+
+def test_insert_matches_brute_force():
+    rng = random.Random(1)
+    octree = MindOctree()
+    expected = {}
+    for sphere_id in range(200):
+        entry = random_entry(rng, 5.0)
+        octree.insert(sphere_id, *entry)
+        expected[sphere_id] = entry
+    check_tree(octree, expected)
+    assert not octree.root.is_leaf()
+
+
+def test_insert_outside_grows_the_root():
+    octree = MindOctree()
+    expected = {1: ((0.5, 0.5, 0.5), 0.2, COLORS[0]), 2: ((100.0, -40.0, 3.0), 1.0, COLORS[1])}
+    for sphere_id, entry in expected.items():
+        octree.insert(sphere_id, *entry)
+    assert octree.root.half_size > INITIAL_HALF_SIZE
+    assert octree.root.contains((100.0, -40.0, 3.0))
+    check_tree(octree, expected)
+
+
+@pytest.mark.parametrize('seed', [2, 3, 4])
+def test_random_operations_match_brute_force(seed):
+    rng = random.Random(seed)
+    octree = MindOctree()
+    expected = {}
+    for step in range(600):
+        operation = rng.random()
+        if operation < 0.5 or not expected:
+            sphere_id = rng.randrange(300)
+            entry = random_entry(rng, rng.choice([1.0, 10.0]))
+            octree.insert(sphere_id, *entry)
+            expected[sphere_id] = entry
+        elif operation < 0.75:
+            sphere_id = rng.choice(sorted(expected))
+            assert octree.remove(sphere_id)
+            del expected[sphere_id]
+        else:
+            sphere_id = rng.choice(sorted(expected))
+            position, _, _ = random_entry(rng, 10.0)
+            assert octree.move(sphere_id, position=position)
+            expected[sphere_id] = (position, expected[sphere_id][1], expected[sphere_id][2])
+        if step % 50 == 0:
+            check_tree(octree, expected)
+    check_tree(octree, expected)
+
+
+def test_remove_everything():
+    rng = random.Random(5)
+    octree = MindOctree()
+    for sphere_id in range(50):
+        octree.insert(sphere_id, *random_entry(rng, 3.0))
+    for sphere_id in range(50):
+        assert octree.remove(sphere_id)
+    assert not octree.remove(0)
+    check_tree(octree, {})
+    assert octree.root.is_leaf()
+    assert octree.root.position_sum == (0.0, 0.0, 0.0)
+
+
+def test_move_keeps_unchanged_fields():
+    octree = MindOctree()
+    octree.insert(7, (1.0, 2.0, 3.0), 0.3, COLORS[0])
+    assert octree.move(7, radius=0.6)
+    assert octree.move(7, color=COLORS[2])
+    check_tree(octree, {7: ((1.0, 2.0, 3.0), 0.6, COLORS[2])})
+    assert not octree.move(8, position=(0.0, 0.0, 0.0))
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from app_notes.mindPhysics import MindPhysics, dense_pairs, grid_pairs, random_positions, settle_layout
+
+
+def pair_set(pairs):
+    i, j = pairs
+    assert np.all(i < j)
+    found = set(zip(i.tolist(), j.tolist()))
+    # Each pair once
+    assert len(found) == len(i)
+    return found
+
+
+@pytest.mark.parametrize('count, spread, seed', [(0, 1.0, 0), (1, 1.0, 0), (2, 0.1, 1), (50, 2.0, 2), (400, 3.0, 3), (400, 0.5, 4)])
+def test_grid_pairs_match_dense_pairs(count, spread, seed):
+    rng = np.random.default_rng(seed)
+    positions = (rng.random((count, 3)) - 0.5) * 2 * spread
+    radii = rng.uniform(0.05, 0.3, count)
+    assert pair_set(grid_pairs(positions, radii)) == pair_set(dense_pairs(positions, radii))
+
+
+def test_grid_pairs_with_negative_and_far_apart_positions():
+    rng = np.random.default_rng(5)
+    positions = np.concatenate([rng.normal(-50, 0.3, (100, 3)), rng.normal(40, 0.3, (100, 3))])
+    radii = np.full(200, 0.1)
+    # A small explicit cell size puts spheres in many non-adjacent cells
+    for cell_size in (None, 0.2, 1.0):
+        assert pair_set(grid_pairs(positions, radii, cell_size)) == pair_set(dense_pairs(positions, radii))
+
+
+def test_dense_pairs_chunks(monkeypatch):
+    rng = np.random.default_rng(6)
+    positions = random_positions(120, 2.0, rng)
+    radii = np.full(120, 0.3)
+    expected = pair_set(dense_pairs(positions, radii))
+    monkeypatch.setattr('app_notes.mindPhysics.PAIR_CHUNK_ELEMENTS', 500)
+    assert pair_set(dense_pairs(positions, radii)) == expected
+
+
+def test_touching_spheres_do_not_pair():
+    positions = np.array([[0.0, 0.0, 0.0], [0.4, 0.0, 0.0], [0.79, 0.0, 0.0]])
+    radii = np.array([0.2, 0.2, 0.2])
+    expected = {(1, 2)}
+    assert pair_set(dense_pairs(positions, radii)) == expected
+    assert pair_set(grid_pairs(positions, radii)) == expected
+
+
+def test_seeded_settle_layout_is_deterministic():
+    radii = np.full(40, 0.2)
+    first, first_steps, first_settled = settle_layout(radii, container_radius=2.0, seed=11)
+    second, second_steps, second_settled = settle_layout(radii, container_radius=2.0, seed=11)
+    assert np.array_equal(first, second)
+    assert (first_steps, first_settled) == (second_steps, second_settled)
+    other, _, _ = settle_layout(radii, container_radius=2.0, seed=12)
+    assert not np.array_equal(first, other)
+
+
+def test_settle_layout_separates_and_contains():
+    radii = np.random.default_rng(7).uniform(0.1, 0.3, 60)
+    positions, _, settled = settle_layout(radii, container_radius=2.5, seed=3)
+    assert settled
+    engine = MindPhysics(radii, container_radius=2.5, positions=positions)
+    assert engine.max_overlap() < 1e-3
+    assert np.all(np.linalg.norm(positions, axis=1) <= 2.5 - radii + 1e-9)
+
+
+def test_settle_layout_replaces_coincident_start():
+    radii = np.full(10, 0.2)
+    positions, _, _ = settle_layout(radii, positions=np.zeros((10, 3)), seed=1)
+    assert len(np.unique(positions, axis=0)) == 10
+
+
+def test_broad_phases_settle_alike():
+    radii = np.full(30, 0.25)
+    grid, grid_steps, _ = settle_layout(radii, container_radius=2.0, seed=9, broad_phase='grid')
+    dense, dense_steps, _ = settle_layout(radii, container_radius=2.0, seed=9, broad_phase='none')
+    # The same contacts give the same run, up to the order forces are summed in
+    assert grid_steps == dense_steps
+    assert np.allclose(grid, dense)
+
+
+def test_unknown_broad_phase():
+    with pytest.raises(ValueError):
+        MindPhysics([0.1], broad_phase='octree')
@@ -0,0 +1,4 @@
+"""Offline build steps for the 3D assets in ``assets/``.
+
+Run from the client directory, e.g. ``python -m asset_pipeline --help``.
+"""
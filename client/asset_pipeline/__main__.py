@@ -0,0 +1,157 @@
+"""Command line entry point: ``python -m asset_pipeline <command> ...`` from the client directory.
+
+    python -m asset_pipeline occupancy assets/LabPlan.gltf --cell-size 0.1
+    python -m asset_pipeline optimize --max-texture-size 1024 --texture-budget 2
+    python -m asset_pipeline fingerprint
+
+Run ``fingerprint`` last: it hashes the outputs of the other commands.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from .fingerprint import brotli, fingerprint_assets, prune_hashed
+from .fingerprint import save_manifest as save_asset_manifest
+from .gltf import GLTFDocument, GLTFError
+from .occupancy import bake_occupancy, occupancy_path_for
+from .optimize import LOD_COVERAGE, LOD_RATIOS, PROXY_RATIO, asset_url, find_assets, load_manifest, optimize_asset, save_manifest
+
+
+def run_occupancy(args):
+    start = time.perf_counter()
+    triangles = GLTFDocument.load(args.asset).triangles()
+    # Bake in world units: apply the placement the page gives the model
+    triangles = triangles * args.scale + np.array(args.position)
+    grid = bake_occupancy(
+        triangles,
+        cell_size=args.cell_size,
+        floor_y=args.floor_y,
+        step_height=args.step_height,
+        head_height=args.head_height,
+        player_radius=args.player_radius,
+    )
+    output = args.output or occupancy_path_for(args.asset)
+    grid.save(output)
+    print(
+        f"{output}: {grid.width}x{grid.depth} cells of {grid.cell_size} "
+        f"({int(grid.blocked.sum())} blocked, {len(grid.to_bytes())} bytes) "
+        f"from {len(triangles)} triangles in {time.perf_counter() - start:.2f}s"
+    )
+
+
+def run_optimize(args):
+    if len(args.lod_coverage) < len(args.lods):
+        raise SystemExit("--lod-coverage needs a value for every --lods ratio")
+    manifest = load_manifest(args.root)
+    assets = args.assets or find_assets(args.root)
+    total_source = total_output = 0
+    for asset in assets:
+        url = asset_url(args.root, asset)
+        try:
+            result = optimize_asset(
+                asset,
+                max_texture_size=args.max_texture_size,
+                texture_budget=int(args.texture_budget * 1024 * 1024) if args.texture_budget else None,
+                jpeg_quality=args.jpeg_quality,
+                quantize=not args.no_quantize,
+                merge=not args.no_merge,
+                lod_ratios=args.lods,
+                lod_coverage=args.lod_coverage,
+                proxy_ratio=None if args.no_proxy else args.proxy_ratio,
+            )
+        except (GLTFError, OSError, ValueError) as e:
+            print(f"{url}: skipped ({e})")
+            manifest['assets'].pop(url, None)
+            continue
+        saved = result['source_bytes'] - result['bytes']
+        manifest['assets'][url] = {
+            'url': asset_url(args.root, result['output']),
+            'source_bytes': result['source_bytes'],
+            'bytes': result['bytes'],
+            'saved_bytes': saved,
+        }
+        if 'proxy' in result:
+            manifest['assets'][url].update(proxy=asset_url(args.root, result['proxy']), proxy_bytes=result['proxy_bytes'])
+        total_source += result['source_bytes']
+        total_output += result['bytes']
+        print(
+            f"{url}: {result['source_bytes']:,} -> {result['bytes']:,} bytes "
+            f"({saved / max(result['source_bytes'], 1):.0%} saved)"
+            + (f", proxy {result['proxy_bytes']:,} bytes" if 'proxy' in result else '')
+        )
+    path = save_manifest(args.root, manifest)
+    print(f"{path}: {total_source:,} -> {total_output:,} bytes in total")
+
+
+def run_fingerprint(args):
+    manifest, skipped = fingerprint_assets(args.root)
+    for url, reason in skipped.items():
+        print(f"{url}: skipped ({reason})")
+    removed = prune_hashed(args.root, manifest) if not args.keep_stale else 0
+    assets = manifest['assets']
+    total = sum(entry['bytes'] for entry in assets.values())
+    compressed = sum(min([entry['bytes'], *entry['encodings'].values()]) for entry in assets.values())
+    path = save_asset_manifest(args.root, manifest)
+    print(
+        f"{path}: {len(assets)} assets, {total:,} bytes ({compressed:,} precompressed), "
+        f"{removed} stale copies removed"
+    )
+    if brotli is None:
+        print("brotli is not installed: wrote .gz variants only")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m asset_pipeline', description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    occupancy = commands.add_parser('occupancy', help='Bake a walkability grid next to a GLTF/GLB room')
+    occupancy.add_argument('asset', help='Path to the .gltf or .glb file')
+    occupancy.add_argument('--output', help='Defaults to <asset>.occupancy.bin next to the asset')
+    occupancy.add_argument('--cell-size', type=float, default=0.1)
+    occupancy.add_argument('--floor-y', type=float, default=0.0)
+    occupancy.add_argument('--step-height', type=float, default=0.3)
+    occupancy.add_argument('--head-height', type=float, default=2.0)
+    occupancy.add_argument('--player-radius', type=float, default=0.5)
+    occupancy.add_argument('--scale', type=float, default=1.0, help='Model scale used on the page')
+    occupancy.add_argument('--position', type=float, nargs=3, default=[0.0, 0.0, 0.0],
+                           help='Model position used on the page')
+    occupancy.set_defaults(run=run_occupancy)
+
+    optimize = commands.add_parser(
+        'optimize', help='Pack models into quantized, merged GLBs and record them in optimized.json'
+    )
+    optimize.add_argument('assets', nargs='*', help='Models to optimize; defaults to every model under --root')
+    optimize.add_argument('--root', default='assets', help='Asset directory served at /')
+    optimize.add_argument('--max-texture-size', type=int, default=1024, help='Longest image side in pixels')
+    optimize.add_argument('--texture-budget', type=float, help='Image megabytes allowed per model')
+    optimize.add_argument('--jpeg-quality', type=int, default=85)
+    optimize.add_argument('--no-quantize', action='store_true', help='Keep float vertex attributes')
+    optimize.add_argument('--no-merge', action='store_true', help='Keep one mesh per source primitive')
+    optimize.add_argument('--lods', type=float, nargs='*', default=list(LOD_RATIOS),
+                          help='Triangle share of each coarser level; pass no values to skip LODs')
+    optimize.add_argument('--lod-coverage', type=float, nargs='*', default=list(LOD_COVERAGE),
+                          help='Viewport-height share below which each level replaces the one before it')
+    optimize.add_argument('--proxy-ratio', type=float, default=PROXY_RATIO,
+                          help='Triangle share of the untextured proxy shown while the model loads')
+    optimize.add_argument('--no-proxy', action='store_true', help='Skip writing <name>.proxy.glb')
+    optimize.set_defaults(run=run_optimize)
+
+    fingerprint = commands.add_parser(
+        'fingerprint', help='Copy assets to content-hashed names with .br/.gz variants; writes asset-manifest.json'
+    )
+    fingerprint.add_argument('--root', default='assets', help='Asset directory served at /')
+    fingerprint.add_argument('--keep-stale', action='store_true',
+                             help='Keep hashed copies from earlier runs that the manifest no longer lists')
+    fingerprint.set_defaults(run=run_fingerprint)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""Content-hashed copies of the assets, for caching them forever.
+
+Every model, buffer, image and baked grid under the asset root is copied to
+``_hashed/<same directory>/<name>.<hash><suffix>``, where the hash covers the
+file's bytes. A ``.gltf`` is hashed after its buffer and image URIs have been
+rewritten to the hashed copies, so changing a ``.bin`` or a texture changes
+the hash of every model that uses it. Text formats and buffers also get
+precompressed ``.gz`` (and ``.br`` when the ``brotli`` package is installed)
+siblings whenever that saves space.
+
+``asset-manifest.json`` in the asset root maps every source URL to its hashed
+URL, its size and the sizes of its compressed variants. Models optimized by
+``python -m asset_pipeline optimize`` map to the hashed copy of their GLB,
+with the hashed URL of their proxy GLB under ``proxy``.
+The client resolves page assets through the manifest when the app is
+compiled, so the browser never asks for an asset by its plain path.
+
+A hashed URL never changes content, so whatever serves ``/_hashed/`` should
+send ``Cache-Control: public, max-age=31536000, immutable`` and answer
+``Accept-Encoding`` with the ``.br``/``.gz`` sibling (nginx ``gzip_static``
+and ``brotli_static``, or any CDN). Copies no longer in the manifest are
+deleted on each run.
+"""
+import gzip
+import hashlib
+import json
+import posixpath
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+from .optimize import MANIFEST_NAME as OPTIMIZED_MANIFEST_NAME
+
+try:
+    import brotli
+except ImportError:  # .gz variants only
+    brotli = None
+
+MANIFEST_NAME = 'asset-manifest.json'
+HASHED_DIR = '_hashed'
+HASH_LENGTH = 12
+HASHED_SUFFIXES = {'.gltf', '.glb', '.bin', '.json', '.png', '.jpg', '.jpeg', '.webp', '.ktx2'}
+COMPRESSED_SUFFIXES = {'.gltf', '.glb', '.bin', '.json'}
+# Variants must save at least this share of the file to be worth a second copy
+MIN_SAVING = 0.1
+ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(name, digest):
+    """``scene.bin`` -> ``scene.<digest>.bin``; only the last suffix is kept at the end"""
+    stem, dot, suffix = name.rpartition('.')
+    return f"{stem}.{digest}.{suffix}" if dot else f"{name}.{digest}"
+
+
+def compressed_variants(data):
+    """Encoding name -> compressed bytes, for the encodings that pay off"""
+    variants = {'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(data, quality=11)
+    return {
+        encoding: compressed for encoding, compressed in variants.items()
+        if len(compressed) <= len(data) * (1 - MIN_SAVING)
+    }
+
+
+def find_sources(root):
+    """Files under the asset root worth hashing, skipping hashed copies and manifests"""
+    root = Path(root)
+    skipped = {MANIFEST_NAME, OPTIMIZED_MANIFEST_NAME}
+    return sorted(
+        path for path in root.rglob('*')
+        if path.is_file() and path.suffix.lower() in HASHED_SUFFIXES and path.name not in skipped
+        and path.relative_to(root).parts[0] != HASHED_DIR
+    )
+
+
+def rewrite_gltf(path, hashed_names):
+    """The .gltf JSON with buffer and image URIs pointing at their hashed copies.
+
+    Raises FileNotFoundError when a referenced file was not hashed (missing
+    or of an unsupported type), since the hashed model could not load it.
+    """
+    data = json.loads(path.read_text(encoding='utf-8'))
+    for item in data.get('buffers', []) + data.get('images', []):
+        uri = item.get('uri')
+        if uri is None or uri.startswith('data:'):
+            continue
+        dependency = (path.parent / unquote(uri)).resolve()
+        if dependency not in hashed_names:
+            raise FileNotFoundError(f"{uri} referenced by {path.name} was not found")
+        # Hashed copies keep the directory layout, so the relative location is unchanged
+        directory = posixpath.dirname(unquote(uri))
+        item['uri'] = quote(posixpath.join(directory, hashed_names[dependency]))
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def write_hashed(root, source, data):
+    """Write the hashed copy and its variants; returns the manifest entry"""
+    root = Path(root)
+    relative = source.relative_to(root)
+    name = hashed_name(relative.name, content_hash(data))
+    target = root / HASHED_DIR / relative.parent / name
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Same name means same bytes, so existing copies are left alone
+    if not target.exists():
+        target.write_bytes(data)
+    entry = {'url': '/' + target.relative_to(root).as_posix(), 'bytes': len(data), 'encodings': {}}
+    if source.suffix.lower() in COMPRESSED_SUFFIXES:
+        for encoding, compressed in compressed_variants(data).items():
+            variant = target.with_name(target.name + ENCODINGS[encoding])
+            if not variant.exists():
+                variant.write_bytes(compressed)
+            entry['encodings'][encoding] = len(compressed)
+    return name, entry
+
+
+def fingerprint_assets(root):
+    """Hash every asset under ``root``; returns (manifest, {url: reason} of skipped assets)"""
+    root = Path(root)
+    optimized_path = root / OPTIMIZED_MANIFEST_NAME
+    optimized = json.loads(optimized_path.read_text())['assets'] if optimized_path.exists() else {}
+    assets, skipped, hashed_names = {}, {}, {}
+    sources = {'/' + path.relative_to(root).as_posix(): path for path in find_sources(root)}
+    # Dependencies first: a .gltf needs the names of its buffers and images, an optimized model its GLB's
+    order = sorted(sources, key=lambda url: (url in optimized, sources[url].suffix.lower() == '.gltf', url))
+    for url in order:
+        source = sources[url]
+        # A model with an optimized GLB is served as the GLB's hashed copy
+        if url in optimized and optimized[url]['url'] in assets:
+            assets[url] = {**assets[optimized[url]['url']], 'source_bytes': optimized[url]['source_bytes']}
+            if optimized[url].get('proxy') in assets:
+                assets[url]['proxy'] = assets[optimized[url]['proxy']]['url']
+            continue
+        try:
+            data = rewrite_gltf(source, hashed_names) if source.suffix.lower() == '.gltf' else source.read_bytes()
+        except (OSError, ValueError) as e:
+            skipped[url] = str(e)
+            continue
+        hashed_names[source.resolve()], assets[url] = write_hashed(root, source, data)
+    return {'assets': assets}, skipped
+
+
+def prune_hashed(root, manifest):
+    """Delete hashed copies and variants the manifest no longer refers to; returns their count"""
+    root = Path(root)
+    kept = set()
+    for entry in manifest['assets'].values():
+        path = root / entry['url'].lstrip('/')
+        kept.add(path)
+        kept.update(path.with_name(path.name + ENCODINGS[encoding]) for encoding in entry['encodings'])
+    removed = 0
+    for path in (root / HASHED_DIR).rglob('*'):
+        if path.is_file() and path not in kept:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def save_manifest(root, manifest):
+    path = Path(root) / MANIFEST_NAME
+    path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+    return path
@@ -0,0 +1,259 @@
+"""Minimal glTF 2.0 reading for the offline asset tools.
+
+Handles ``.gltf`` files with external or base64-embedded buffers and binary
+``.glb`` files. Accessors come back as NumPy arrays, and mesh primitives can
+be flattened into world-space triangles following the node hierarchy.
+"""
+import base64
+import json
+import struct
+from pathlib import Path
+from urllib.parse import unquote
+
+import numpy as np
+
+GLB_MAGIC = b'glTF'
+GLB_HEADER = struct.Struct('<4sII')
+GLB_CHUNK_HEADER = struct.Struct('<II')
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+COMPONENT_DTYPES = {
+    5120: np.int8,
+    5121: np.uint8,
+    5122: np.int16,
+    5123: np.uint16,
+    5125: np.uint32,
+    5126: np.float32,
+}
+TYPE_SIZES = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3, 'VEC4': 4, 'MAT2': 4, 'MAT3': 9, 'MAT4': 16}
+
+MODE_TRIANGLES = 4
+MODE_TRIANGLE_STRIP = 5
+MODE_TRIANGLE_FAN = 6
+
+
+class GLTFError(ValueError):
+    pass
+
+
+def quaternion_matrix(x, y, z, w):
+    return np.array([
+        [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+        [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+        [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+    ])
+
+
+def node_local_matrix(node):
+    """4x4 local transform of a node from its matrix or translation/rotation/scale"""
+    if 'matrix' in node:
+        return np.array(node['matrix'], dtype=np.float64).reshape(4, 4).T
+    matrix = np.eye(4)
+    matrix[:3, :3] = quaternion_matrix(*node.get('rotation', [0, 0, 0, 1])) * np.array(node.get('scale', [1, 1, 1]))
+    matrix[:3, 3] = node.get('translation', [0, 0, 0])
+    return matrix
+
+
+def triangle_indices(indices, mode):
+    """Triangle list (T, 3) for triangles, strips and fans; None for points and lines"""
+    if mode == MODE_TRIANGLES:
+        return indices[:len(indices) - len(indices) % 3].reshape(-1, 3)
+    if mode == MODE_TRIANGLE_STRIP and len(indices) >= 3:
+        k = np.arange(len(indices) - 2)
+        even = k % 2 == 0
+        return np.stack([
+            indices[k],
+            np.where(even, indices[k + 1], indices[k + 2]),
+            np.where(even, indices[k + 2], indices[k + 1]),
+        ], axis=1)
+    if mode == MODE_TRIANGLE_FAN and len(indices) >= 3:
+        k = np.arange(1, len(indices) - 1)
+        return np.stack([np.full(len(k), indices[0]), indices[k], indices[k + 1]], axis=1)
+    return None
+
+
+def read_uri(base_dir, uri):
+    """Bytes of a base64 data URI or of a file relative to the asset"""
+    if uri.startswith('data:'):
+        return base64.b64decode(uri.split(',', 1)[1])
+    return (Path(base_dir) / unquote(uri)).read_bytes()
+
+
+def glb_bytes(data, binary):
+    """Binary glTF container holding ``data`` as JSON and ``binary`` as the BIN chunk"""
+    json_chunk = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    json_chunk += b' ' * (-len(json_chunk) % 4)
+    chunks = GLB_CHUNK_HEADER.pack(len(json_chunk), CHUNK_JSON) + json_chunk
+    if binary:
+        binary = bytes(binary) + b'\0' * (-len(binary) % 4)
+        chunks += GLB_CHUNK_HEADER.pack(len(binary), CHUNK_BIN) + binary
+    return GLB_HEADER.pack(GLB_MAGIC, 2, GLB_HEADER.size + len(chunks)) + chunks
+
+
+class GLTFDocument:
+    """A parsed glTF asset: its JSON plus the raw bytes of every buffer."""
+
+    def __init__(self, data, buffers, path=None):
+        self.data = data
+        self.buffers = buffers
+        self.path = Path(path) if path else None
+
+    @classmethod
+    def load(cls, path):
+        path = Path(path)
+        raw = path.read_bytes()
+        if raw[:4] == GLB_MAGIC:
+            data, binary = cls.parse_glb(raw)
+        else:
+            data, binary = json.loads(raw.decode('utf-8')), None
+
+        buffers = []
+        for i, buffer in enumerate(data.get('buffers', [])):
+            uri = buffer.get('uri')
+            if uri is None:
+                if binary is None:
+                    raise GLTFError(f"Buffer {i} has no uri and {path.name} has no BIN chunk")
+                buffers.append(binary)
+            else:
+                buffers.append(read_uri(path.parent, uri))
+        return cls(data, buffers, path)
+
+    @staticmethod
+    def parse_glb(raw):
+        magic, version, length = GLB_HEADER.unpack_from(raw, 0)
+        if version != 2:
+            raise GLTFError(f"Unsupported GLB version {version}")
+        offset = GLB_HEADER.size
+        data, binary = None, None
+        while offset < min(length, len(raw)):
+            chunk_length, chunk_type = GLB_CHUNK_HEADER.unpack_from(raw, offset)
+            offset += GLB_CHUNK_HEADER.size
+            chunk = raw[offset:offset + chunk_length]
+            if chunk_type == CHUNK_JSON:
+                data = json.loads(chunk.decode('utf-8'))
+            elif chunk_type == CHUNK_BIN and binary is None:
+                binary = bytes(chunk)
+            offset += chunk_length
+        if data is None:
+            raise GLTFError("GLB has no JSON chunk")
+        return data, binary
+
+    def buffer_view_bytes(self, index):
+        view = self.data['bufferViews'][index]
+        buffer = self.buffers[view['buffer']]
+        start = view.get('byteOffset', 0)
+        return memoryview(buffer)[start:start + view['byteLength']]
+
+    def external_files(self):
+        """Files next to the asset that it references (buffers and images)"""
+        uris = [item.get('uri') for key in ('buffers', 'images') for item in self.data.get(key, [])]
+        return sorted({self.path.parent / unquote(uri) for uri in uris if uri and not uri.startswith('data:')})
+
+    def image_bytes(self, index):
+        image = self.data['images'][index]
+        if 'bufferView' in image:
+            return bytes(self.buffer_view_bytes(image['bufferView']))
+        return read_uri(self.path.parent, image['uri'])
+
+    def read_accessor(self, index):
+        """Accessor data as a (count, components) array; normalized integers become floats"""
+        accessor = self.data['accessors'][index]
+        dtype = np.dtype(COMPONENT_DTYPES[accessor['componentType']]).newbyteorder('<')
+        components = TYPE_SIZES[accessor['type']]
+        count = accessor['count']
+
+        if 'bufferView' in accessor:
+            view = self.data['bufferViews'][accessor['bufferView']]
+            raw = self.buffer_view_bytes(accessor['bufferView'])
+            offset = accessor.get('byteOffset', 0)
+            element_size = dtype.itemsize * components
+            stride = view.get('byteStride') or element_size
+            if stride == element_size:
+                values = np.frombuffer(raw, dtype=dtype, count=count * components, offset=offset)
+                values = values.reshape(count, components).copy()
+            else:
+                rows = np.lib.stride_tricks.as_strided(
+                    np.frombuffer(raw, dtype=np.uint8, offset=offset),
+                    shape=(count, element_size),
+                    strides=(stride, 1),
+                )
+                values = np.ascontiguousarray(rows).view(dtype).reshape(count, components).copy()
+        else:
+            values = np.zeros((count, components), dtype=dtype)
+
+        sparse = accessor.get('sparse')
+        if sparse:
+            index_dtype = np.dtype(COMPONENT_DTYPES[sparse['indices']['componentType']]).newbyteorder('<')
+            sparse_indices = np.frombuffer(
+                self.buffer_view_bytes(sparse['indices']['bufferView']), dtype=index_dtype,
+                count=sparse['count'], offset=sparse['indices'].get('byteOffset', 0),
+            )
+            sparse_values = np.frombuffer(
+                self.buffer_view_bytes(sparse['values']['bufferView']), dtype=dtype,
+                count=sparse['count'] * components, offset=sparse['values'].get('byteOffset', 0),
+            ).reshape(-1, components)
+            values[sparse_indices] = sparse_values
+
+        if accessor.get('normalized') and dtype.kind in 'iu':
+            info = np.iinfo(dtype)
+            values = np.maximum(values.astype(np.float32) / info.max, -1.0)
+        return values
+
+    def scene_roots(self, scene=None):
+        scenes = self.data.get('scenes', [])
+        if not scenes:
+            # No scene: every node that is nobody's child is a root
+            children = {c for node in self.data.get('nodes', []) for c in node.get('children', [])}
+            return [i for i in range(len(self.data.get('nodes', []))) if i not in children]
+        if scene is None:
+            scene = self.data.get('scene', 0)
+        return scenes[scene].get('nodes', [])
+
+    def iter_nodes(self, scene=None):
+        """Yield (node_index, world_matrix) for every node of the scene, parents first"""
+        nodes = self.data.get('nodes', [])
+        stack = [(root, np.eye(4)) for root in reversed(self.scene_roots(scene))]
+        while stack:
+            index, parent = stack.pop()
+            node = nodes[index]
+            world = parent @ node_local_matrix(node)
+            yield index, world
+            for child in reversed(node.get('children', [])):
+                stack.append((child, world))
+
+    def primitive_triangles(self, primitive):
+        """Triangles of one primitive in mesh space as a (T, 3, 3) array, or None"""
+        attributes = primitive.get('attributes', {})
+        if 'POSITION' not in attributes or 'KHR_draco_mesh_compression' in primitive.get('extensions', {}):
+            return None
+        positions = self.read_accessor(attributes['POSITION']).astype(np.float64)
+        if 'indices' in primitive:
+            indices = self.read_accessor(primitive['indices']).reshape(-1).astype(np.int64)
+        else:
+            indices = np.arange(len(positions))
+        triangles = triangle_indices(indices, primitive.get('mode', MODE_TRIANGLES))
+        if triangles is None or len(triangles) == 0:
+            return None
+        return positions[triangles]
+
+    def iter_triangles(self, scene=None):
+        """Yield (node_index, mesh_index, primitive, world-space (T, 3, 3) triangles)"""
+        meshes = self.data.get('meshes', [])
+        nodes = self.data.get('nodes', [])
+        for node_index, world in self.iter_nodes(scene):
+            mesh_index = nodes[node_index].get('mesh')
+            if mesh_index is None:
+                continue
+            for primitive in meshes[mesh_index].get('primitives', []):
+                local = self.primitive_triangles(primitive)
+                if local is None:
+                    continue
+                yield node_index, mesh_index, primitive, local @ world[:3, :3].T + world[:3, 3]
+
+    def triangles(self, scene=None):
+        """All world-space triangles of the scene as one (T, 3, 3) array"""
+        parts = [tris for _, _, _, tris in self.iter_triangles(scene)]
+        if not parts:
+            return np.empty((0, 3, 3))
+        return np.concatenate(parts)
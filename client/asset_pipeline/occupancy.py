@@ -0,0 +1,166 @@
+"""Bake a walkability grid for first-person movement from a glTF room.
+
+Every triangle that reaches into the player's body height (between the step
+height and the top of the head above the floor) is sampled densely and marks
+the grid cells it covers as blocked. Blocked cells are then grown by the
+player radius, so at runtime "can I stand at (x, z)" is a single bit lookup
+of the cell under the player. ``GLTFCollision`` loads the result through its
+``occupancy_url`` prop.
+
+File layout (little-endian): the header below, then one bit per cell, rows
+along +z, cells along +x, least significant bit first; 1 means blocked.
+"""
+import math
+import struct
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b'OCC1'
+# magic, width (cells along x), depth (cells along z), origin x, origin z, cell size,
+# lowest and highest blocking height, player radius
+HEADER = struct.Struct('<4sIIffffff')
+SAMPLE_BATCH_POINTS = 4_000_000
+
+
+class OccupancyGrid:
+    """2D grid of blocked cells over the x/z plane."""
+
+    def __init__(self, blocked, origin, cell_size, min_y, max_y, player_radius):
+        self.blocked = np.asarray(blocked, dtype=bool)
+        self.origin = (float(origin[0]), float(origin[1]))
+        self.cell_size = float(cell_size)
+        self.min_y = float(min_y)
+        self.max_y = float(max_y)
+        self.player_radius = float(player_radius)
+
+    @property
+    def depth(self):
+        return self.blocked.shape[0]
+
+    @property
+    def width(self):
+        return self.blocked.shape[1]
+
+    def cell_of(self, x, z):
+        return (
+            math.floor((x - self.origin[0]) / self.cell_size),
+            math.floor((z - self.origin[1]) / self.cell_size),
+        )
+
+    def is_blocked(self, x, z):
+        """Same answer as the client lookup; positions outside the grid are free"""
+        i, k = self.cell_of(x, z)
+        if i < 0 or k < 0 or i >= self.width or k >= self.depth:
+            return False
+        return bool(self.blocked[k, i])
+
+    def to_bytes(self):
+        header = HEADER.pack(
+            MAGIC, self.width, self.depth, self.origin[0], self.origin[1], self.cell_size,
+            self.min_y, self.max_y, self.player_radius,
+        )
+        return header + np.packbits(self.blocked.reshape(-1), bitorder='little').tobytes()
+
+    @classmethod
+    def from_bytes(cls, raw):
+        magic, width, depth, ox, oz, cell_size, min_y, max_y, radius = HEADER.unpack_from(raw, 0)
+        if magic != MAGIC:
+            raise ValueError("Not an occupancy grid file")
+        bits = np.frombuffer(raw, dtype=np.uint8, offset=HEADER.size)
+        blocked = np.unpackbits(bits, count=width * depth, bitorder='little').astype(bool)
+        return cls(blocked.reshape(depth, width), (ox, oz), cell_size, min_y, max_y, radius)
+
+    def save(self, path):
+        Path(path).write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_bytes(Path(path).read_bytes())
+
+
+def sample_triangles(triangles, spacing):
+    """Points covering each triangle with at most ``spacing`` between neighbours"""
+    edges = np.stack([
+        triangles[:, 1] - triangles[:, 0],
+        triangles[:, 2] - triangles[:, 1],
+        triangles[:, 0] - triangles[:, 2],
+    ], axis=1)
+    longest = np.linalg.norm(edges, axis=2).max(axis=1)
+    divisions = np.maximum(1, np.ceil(longest / spacing)).astype(np.int64)
+
+    # Triangles with the same subdivision share one barycentric template
+    for n in np.unique(divisions):
+        i, j = np.meshgrid(np.arange(n + 1), np.arange(n + 1), indexing='ij')
+        keep = i + j <= n
+        u = i[keep] / n
+        v = j[keep] / n
+        weights = np.stack([1 - u - v, u, v], axis=1)
+        group = triangles[divisions == n]
+        batch = max(1, SAMPLE_BATCH_POINTS // len(weights))
+        for start in range(0, len(group), batch):
+            yield np.einsum('pk,tkc->tpc', weights, group[start:start + batch]).reshape(-1, 3)
+
+
+def disk_offsets(radius_cells):
+    r = int(radius_cells)
+    return [
+        (dk, di)
+        for dk in range(-r, r + 1) for di in range(-r, r + 1)
+        if dk * dk + di * di <= radius_cells * radius_cells
+    ]
+
+
+def dilate(blocked, radius_cells):
+    """Grow blocked cells by a disk of the given radius (in cells)"""
+    if radius_cells <= 0:
+        return blocked
+    grown = blocked.copy()
+    depth, width = blocked.shape
+    for dk, di in disk_offsets(radius_cells):
+        src = blocked[max(0, -dk):depth - max(0, dk), max(0, -di):width - max(0, di)]
+        grown[max(0, dk):depth - max(0, -dk), max(0, di):width - max(0, -di)] |= src
+    return grown
+
+
+def bake_occupancy(triangles, cell_size=0.1, floor_y=0.0, step_height=0.3, head_height=2.0,
+                   player_radius=0.5):
+    """Walkability grid for a player standing on ``floor_y``.
+
+    Geometry between ``floor_y + step_height`` and ``floor_y + head_height``
+    blocks; floors, low steps and ceilings above the head do not. The defaults
+    match the capsule ``GLTFCollision`` tests against at runtime.
+    """
+    if cell_size <= 0:
+        raise ValueError("cell_size must be positive")
+    triangles = np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 3)
+    min_y = floor_y + step_height
+    max_y = floor_y + head_height
+
+    margin = player_radius + cell_size
+    if len(triangles):
+        points = triangles.reshape(-1, 3)
+        lo = points[:, [0, 2]].min(axis=0) - margin
+        hi = points[:, [0, 2]].max(axis=0) + margin
+    else:
+        lo = hi = np.zeros(2)
+    width, depth = np.maximum(1, np.ceil((hi - lo) / cell_size).astype(np.int64))
+    blocked = np.zeros((depth, width), dtype=bool)
+
+    # Only triangles that reach into the body height can block
+    ys = triangles[:, :, 1]
+    relevant = triangles[(ys.max(axis=1) >= min_y) & (ys.min(axis=1) <= max_y)]
+    for points in sample_triangles(relevant, cell_size * 0.5):
+        points = points[(points[:, 1] >= min_y) & (points[:, 1] <= max_y)]
+        i = np.clip(((points[:, 0] - lo[0]) / cell_size).astype(np.int64), 0, width - 1)
+        k = np.clip(((points[:, 2] - lo[1]) / cell_size).astype(np.int64), 0, depth - 1)
+        blocked[k, i] = True
+
+    blocked = dilate(blocked, player_radius / cell_size)
+    return OccupancyGrid(blocked, lo, cell_size, min_y, max_y, player_radius)
+
+
+def occupancy_path_for(asset_path):
+    """Where the grid of an asset lives: next to it as ``<name>.occupancy.bin``"""
+    asset_path = Path(asset_path)
+    return asset_path.with_name(asset_path.stem + '.occupancy.bin')
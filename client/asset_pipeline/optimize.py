@@ -0,0 +1,553 @@
+"""Shrink glTF models for the web.
+
+Each model becomes one self-contained ``<name>.optimized.glb`` next to the
+source:
+
+* node transforms are baked into the vertices and primitives that share a
+  material are merged into one mesh, so the model costs one draw call per
+  material;
+* vertex attributes are quantized (``KHR_mesh_quantization``: 16-bit
+  positions, 8-bit normals and tangents, 16-bit texture coordinates) and
+  identical vertices are welded;
+* images are downscaled to a maximum size, re-encoded, and shrunk further
+  until they fit an optional byte budget;
+* large triangle meshes get coarser ``MSFT_lod`` levels (see simplify.py),
+  each with the screen coverage below which it takes over.
+
+A ``<name>.proxy.glb`` is written beside it: every mesh simplified to a few
+percent of its triangles, untextured, for the client to show while the full
+model streams in.
+
+``optimized.json`` in the asset root maps every source URL to its GLB and
+records the bytes saved; pages resolve asset URLs through it when the app
+compiles (``asset_url`` in the client asset cache), so the GLB is loaded in
+place of the source.
+
+Animations, skins and morph targets would be broken by baking transforms,
+so such assets are rejected rather than optimized.
+"""
+import io
+import json
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from .gltf import (
+    COMPONENT_DTYPES, MODE_TRIANGLES, MODE_TRIANGLE_FAN, MODE_TRIANGLE_STRIP, GLTFDocument, GLTFError,
+    glb_bytes, triangle_indices,
+)
+from .simplify import simplify
+
+MANIFEST_NAME = 'optimized.json'
+OUTPUT_SUFFIX = '.optimized.glb'
+QUANTIZATION = 'KHR_mesh_quantization'
+COMPONENT_TYPES = {np.dtype(dtype): code for code, dtype in COMPONENT_DTYPES.items()}
+TYPE_NAMES = {1: 'SCALAR', 2: 'VEC2', 3: 'VEC3', 4: 'VEC4'}
+TARGET_ARRAY_BUFFER = 34962
+TARGET_ELEMENT_ARRAY_BUFFER = 34963
+
+MODE_POINTS = 0
+MODE_LINES = 1
+MODE_LINE_LOOP = 2
+MODE_LINE_STRIP = 3
+MIN_TEXTURE_SIZE = 64
+
+LOD_EXTENSION = 'MSFT_lod'
+# Share of the triangles kept by each coarser level, and the share of the viewport height the model must
+# cover to still show the level before it (see ScreenSpaceLOD in the client asset cache)
+LOD_RATIOS = (0.5, 0.2, 0.08)
+LOD_COVERAGE = (0.5, 0.25, 0.1)
+MIN_LOD_TRIANGLES = 1000
+
+PROXY_SUFFIX = '.proxy.glb'
+# Share of the triangles kept by the untextured stand-in shown while the full model downloads
+PROXY_RATIO = 0.02
+
+
+def optimized_path_for(asset_path):
+    asset_path = Path(asset_path)
+    return asset_path.with_name(asset_path.stem + OUTPUT_SUFFIX)
+
+
+def proxy_path_for(asset_path):
+    asset_path = Path(asset_path)
+    return asset_path.with_name(asset_path.stem + PROXY_SUFFIX)
+
+
+def list_indices(indices, mode):
+    """Indices as a list primitive: (indices, mode) with strips, fans and loops unrolled"""
+    if mode in (MODE_TRIANGLES, MODE_TRIANGLE_STRIP, MODE_TRIANGLE_FAN):
+        triangles = triangle_indices(indices, mode)
+        return (np.empty((0, 3), dtype=np.int64) if triangles is None else triangles), MODE_TRIANGLES
+    if mode == MODE_LINE_STRIP:
+        return np.stack([indices[:-1], indices[1:]], axis=1), MODE_LINES
+    if mode == MODE_LINE_LOOP:
+        return np.stack([indices, np.roll(indices, -1)], axis=1), MODE_LINES
+    if mode == MODE_LINES:
+        return indices[:len(indices) - len(indices) % 2].reshape(-1, 2), MODE_LINES
+    return indices.reshape(-1, 1), MODE_POINTS
+
+
+def check_supported(data):
+    if data.get('animations'):
+        raise GLTFError("animated assets are not supported")
+    for node in data.get('nodes', []):
+        if 'skin' in node or 'EXT_mesh_gpu_instancing' in node.get('extensions', {}):
+            raise GLTFError("skinned and instanced nodes are not supported")
+    for mesh in data.get('meshes', []):
+        for primitive in mesh.get('primitives', []):
+            if 'targets' in primitive:
+                raise GLTFError("morph targets are not supported")
+            if 'KHR_draco_mesh_compression' in primitive.get('extensions', {}):
+                raise GLTFError("Draco-compressed primitives are not supported")
+            if any(name.startswith(('JOINTS_', 'WEIGHTS_')) for name in primitive.get('attributes', {})):
+                raise GLTFError("skinned primitives are not supported")
+
+
+def baked_parts(document):
+    """Every primitive of the default scene with its node transform applied.
+
+    Yields dicts with ``material``, list ``mode``, float64 ``attributes`` and
+    (N, k) ``indices``.
+    """
+    nodes = document.data.get('nodes', [])
+    meshes = document.data.get('meshes', [])
+    for node_index, world in document.iter_nodes():
+        mesh_index = nodes[node_index].get('mesh')
+        if mesh_index is None:
+            continue
+        linear = world[:3, :3]
+        determinant = np.linalg.det(linear)
+        if abs(determinant) < 1e-12:
+            continue
+        normal_matrix = np.linalg.inv(linear).T
+        for primitive in meshes[mesh_index].get('primitives', []):
+            attributes = {
+                name: document.read_accessor(accessor).astype(np.float64)
+                for name, accessor in primitive.get('attributes', {}).items()
+            }
+            if 'POSITION' not in attributes:
+                continue
+            count = len(attributes['POSITION'])
+            if 'indices' in primitive:
+                indices = document.read_accessor(primitive['indices']).reshape(-1).astype(np.int64)
+            else:
+                indices = np.arange(count, dtype=np.int64)
+            indices, mode = list_indices(indices, primitive.get('mode', MODE_TRIANGLES))
+            if len(indices) == 0:
+                continue
+
+            attributes['POSITION'] = attributes['POSITION'] @ linear.T + world[:3, 3]
+            if 'NORMAL' in attributes:
+                normals = attributes['NORMAL'] @ normal_matrix.T
+                attributes['NORMAL'] = normals / np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+            if 'TANGENT' in attributes:
+                tangents = attributes['TANGENT']
+                xyz = tangents[:, :3] @ linear.T
+                tangents[:, :3] = xyz / np.maximum(np.linalg.norm(xyz, axis=1, keepdims=True), 1e-12)
+                tangents[:, 3] *= np.sign(determinant)
+            if determinant < 0 and mode == MODE_TRIANGLES:
+                # A mirroring transform flips the winding; swap two corners to keep the front faces
+                indices = indices[:, [0, 2, 1]]
+            yield {'material': primitive.get('material'), 'mode': mode, 'attributes': attributes, 'indices': indices}
+
+
+def group_parts(parts, merge=True):
+    """Concatenate parts that can share one draw call: same material, mode and attribute layout"""
+    groups = {}
+    for i, part in enumerate(parts):
+        layout = tuple(sorted((name, values.shape[1]) for name, values in part['attributes'].items()))
+        key = (part['material'], part['mode'], layout) if merge else i
+        groups.setdefault(key, []).append(part)
+
+    for members in groups.values():
+        offset = 0
+        indices = []
+        for part in members:
+            indices.append(part['indices'] + offset)
+            offset += len(part['attributes']['POSITION'])
+        yield {
+            'material': members[0]['material'],
+            'mode': members[0]['mode'],
+            'attributes': {
+                name: np.concatenate([part['attributes'][name] for part in members])
+                for name in members[0]['attributes']
+            },
+            'indices': np.concatenate(indices),
+        }
+
+
+def quantize_attribute(name, values):
+    """(array, normalized) in the smallest type KHR_mesh_quantization allows for the attribute"""
+    if name in ('NORMAL', 'TANGENT'):
+        return np.round(np.clip(values, -1, 1) * 127).astype(np.int8), True
+    in_unit_range = len(values) and values.min() >= 0 and values.max() <= 1
+    if name.startswith('TEXCOORD_') and in_unit_range:
+        return np.round(values * 65535).astype(np.uint16), True
+    if name.startswith('COLOR_') and in_unit_range:
+        return np.round(values * 255).astype(np.uint8), True
+    return values.astype(np.float32), False
+
+
+def quantize_positions(positions):
+    """16-bit positions plus the node translation and uniform scale that restore them.
+
+    The scale is uniform so normals need no correction.
+    """
+    lo = positions.min(axis=0)
+    hi = positions.max(axis=0)
+    center = (lo + hi) / 2
+    step = max(float((hi - lo).max()) / 2, 1e-9) / 32767
+    quantized = np.round((positions - center) / step).astype(np.int16)
+    return quantized, center, step
+
+
+def weld(encoded, indices):
+    """Drop unreferenced vertices and merge identical ones (compared after quantization)"""
+    used, indices = np.unique(indices, return_inverse=True)
+    indices = indices.reshape(-1)
+    encoded = {name: values[used] for name, values in encoded.items()}
+    rows = np.concatenate(
+        [np.ascontiguousarray(values).view(np.uint8).reshape(len(used), -1) for values in encoded.values()], axis=1
+    )
+    _, first, inverse = np.unique(rows, axis=0, return_index=True, return_inverse=True)
+    # Keep the surviving vertices in their source order
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    keep = first[order]
+    return {name: values[keep] for name, values in encoded.items()}, rank[inverse.reshape(-1)][indices]
+
+
+class BinaryBuilder:
+    """Accumulates buffer views and accessors for the single GLB buffer."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.buffer_views = []
+        self.accessors = []
+
+    def add_view(self, raw, target=None, stride=None):
+        self.data += b'\0' * (-len(self.data) % 4)
+        view = {'buffer': 0, 'byteOffset': len(self.data), 'byteLength': len(raw)}
+        if target is not None:
+            view['target'] = target
+        if stride is not None:
+            view['byteStride'] = stride
+        self.data += raw
+        self.buffer_views.append(view)
+        return len(self.buffer_views) - 1
+
+    def add_accessor(self, values, normalized=False, target=TARGET_ARRAY_BUFFER, bounds=False):
+        values = np.ascontiguousarray(values)
+        if values.ndim == 1:
+            values = values.reshape(-1, 1)
+        count, components = values.shape
+        element_size = values.itemsize * components
+        stride = None
+        raw = values.tobytes()
+        if target == TARGET_ARRAY_BUFFER and element_size % 4:
+            # Vertex attributes must start on 4-byte boundaries: pad each element
+            stride = element_size + (-element_size % 4)
+            padded = np.zeros((count, stride), dtype=np.uint8)
+            padded[:, :element_size] = values.view(np.uint8).reshape(count, element_size)
+            raw = padded.tobytes()
+        accessor = {
+            'bufferView': self.add_view(raw, target=target, stride=stride),
+            'componentType': COMPONENT_TYPES[values.dtype],
+            'count': count,
+            'type': TYPE_NAMES[components],
+        }
+        if normalized:
+            accessor['normalized'] = True
+        if bounds:
+            accessor['min'] = values.min(axis=0).tolist()
+            accessor['max'] = values.max(axis=0).tolist()
+        self.accessors.append(accessor)
+        return len(self.accessors) - 1
+
+
+def image_has_alpha(image):
+    if image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info:
+        return image.convert('RGBA').getchannel('A').getextrema()[0] < 255
+    return False
+
+
+def encode_image(raw, max_size, jpeg_quality=85, lossless=False):
+    """(bytes, mime type) of an image no larger than max_size on its longest side.
+
+    Images with transparency, and lossless ones (normal maps stored as PNG),
+    stay PNG; everything else becomes JPEG. The source is kept when it is
+    already small enough and re-encoding would not shrink it.
+    """
+    image = Image.open(io.BytesIO(raw))
+    source_mime = Image.MIME.get(image.format)
+    image.load()
+    resized = max(image.size) > max_size
+    if resized:
+        image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+
+    output = io.BytesIO()
+    if image_has_alpha(image) or (lossless and source_mime == 'image/png'):
+        image.save(output, format='PNG', optimize=True)
+        mime = 'image/png'
+    else:
+        image.convert('RGB').save(output, format='JPEG', quality=jpeg_quality, optimize=True, progressive=True)
+        mime = 'image/jpeg'
+    encoded = output.getvalue()
+    if not resized and len(encoded) >= len(raw):
+        return raw, source_mime
+    return encoded, mime
+
+
+def encode_images(document, max_texture_size, texture_budget=None, jpeg_quality=85):
+    """Encoded (bytes, mime) per image, halving the largest images until the total fits the budget"""
+    data = document.data
+    lossless = {
+        data['textures'][material['normalTexture']['index']].get('source')
+        for material in data.get('materials', []) if 'normalTexture' in material
+    }
+    sources = [document.image_bytes(i) for i in range(len(data.get('images', [])))]
+    limits = [max_texture_size] * len(sources)
+    dimensions = [max(Image.open(io.BytesIO(raw)).size) for raw in sources]
+    encoded = [encode_image(raw, limit, jpeg_quality, i in lossless) for i, (raw, limit) in enumerate(zip(sources, limits))]
+
+    while texture_budget and sum(len(raw) for raw, _ in encoded) > texture_budget:
+        sizes = [min(limit, dimension) for limit, dimension in zip(limits, dimensions)]
+        largest = max(range(len(sizes)), key=lambda i: (sizes[i], len(encoded[i][0])), default=None)
+        if largest is None or sizes[largest] <= MIN_TEXTURE_SIZE:
+            break
+        limits[largest] = sizes[largest] // 2
+        encoded[largest] = encode_image(sources[largest], limits[largest], jpeg_quality, largest in lossless)
+    return encoded
+
+
+def kept_nodes(data, roots):
+    """Indices of nodes that still matter once meshes are moved out: cameras, lights and their parents"""
+    nodes = data.get('nodes', [])
+    keep = set()
+
+    def visit(index):
+        node = nodes[index]
+        children = [visit(child) for child in node.get('children', [])]
+        if any(children) or 'camera' in node or node.get('extensions'):
+            keep.add(index)
+            return True
+        return False
+
+    for root in roots:
+        visit(root)
+    return keep
+
+
+def optimize_document(document, max_texture_size=1024, texture_budget=None, jpeg_quality=85,
+                      quantize=True, merge=True, lod_ratios=LOD_RATIOS, lod_coverage=LOD_COVERAGE):
+    """Optimized GLB bytes for a loaded document"""
+    data = document.data
+    check_supported(data)
+    builder = BinaryBuilder()
+    out_nodes = []
+    meshes = []
+    roots = document.scene_roots()
+
+    # Nodes without geometry (lights, cameras) keep their place in the hierarchy
+    keep = kept_nodes(data, roots)
+    remap = {old: new for new, old in enumerate(sorted(keep))}
+    for old in sorted(keep):
+        node = {key: value for key, value in data['nodes'][old].items() if key != 'mesh'}
+        children = [remap[child] for child in node.get('children', []) if child in remap]
+        if children:
+            node['children'] = children
+        else:
+            node.pop('children', None)
+        out_nodes.append(node)
+    scene_nodes = [remap[root] for root in roots if root in remap]
+
+    materials = data.get('materials', [])
+    extensions_used = set(data.get('extensionsUsed', []))
+    for group in group_parts(list(baked_parts(document)), merge=merge):
+        node = add_mesh(builder, meshes, group['attributes'], group['indices'], group['mode'], group['material'],
+                        materials, quantize)
+        out_nodes.append(node)
+        scene_nodes.append(len(out_nodes) - 1)
+
+        # Coarser copies of the mesh as MSFT_lod levels; the level nodes stay out of the scene
+        if group['mode'] != MODE_TRIANGLES or len(group['indices']) < MIN_LOD_TRIANGLES:
+            continue
+        lod_nodes = []
+        coverage = []
+        for ratio, threshold in zip(lod_ratios, lod_coverage):
+            simplified = simplify(group['attributes'], group['indices'], ratio)
+            if simplified is None:
+                break
+            lod_nodes.append(len(out_nodes))
+            coverage.append(threshold)
+            out_nodes.append(add_mesh(builder, meshes, *simplified, MODE_TRIANGLES, group['material'],
+                                      materials, quantize))
+        if lod_nodes:
+            node['extensions'] = {LOD_EXTENSION: {'ids': lod_nodes}}
+            # Minimum coverage of each level from the full mesh down; 0 means never culled
+            node['extras'] = {'MSFT_screencoverage': coverage + [0]}
+            extensions_used.add(LOD_EXTENSION)
+
+    images = []
+    for i, (raw, mime) in enumerate(encode_images(document, max_texture_size, texture_budget, jpeg_quality)):
+        image = {'bufferView': builder.add_view(raw), 'mimeType': mime}
+        if 'name' in data['images'][i]:
+            image['name'] = data['images'][i]['name']
+        images.append(image)
+
+    extensions_required = set(data.get('extensionsRequired', []))
+    if quantize and meshes:
+        extensions_used.add(QUANTIZATION)
+        extensions_required.add(QUANTIZATION)
+
+    out = {
+        'asset': {'version': '2.0', 'generator': 'Mindsim asset_pipeline'},
+        'scene': 0,
+        'scenes': [{'nodes': scene_nodes}],
+        'nodes': out_nodes,
+        'meshes': meshes,
+        'accessors': builder.accessors,
+        'bufferViews': builder.buffer_views,
+        'buffers': [{'byteLength': len(builder.data)}],
+    }
+    if images:
+        out['images'] = images
+    for key in ('materials', 'textures', 'samplers', 'cameras', 'extensions'):
+        if data.get(key):
+            out[key] = data[key]
+    if extensions_used:
+        out['extensionsUsed'] = sorted(extensions_used)
+    if extensions_required:
+        out['extensionsRequired'] = sorted(extensions_required)
+    return glb_bytes(out, builder.data)
+
+
+def untextured_material(material):
+    """The material with its texture references and extensions dropped; factors are kept"""
+    pbr = {
+        key: value for key, value in material.get('pbrMetallicRoughness', {}).items()
+        if not key.endswith('Texture')
+    }
+    out = {key: value for key, value in material.items() if not key.endswith('Texture') and key != 'extensions'}
+    out['pbrMetallicRoughness'] = pbr
+    return out
+
+
+def proxy_document(document, ratio=PROXY_RATIO, quantize=True):
+    """GLB bytes of a stand-in for the model: simplified triangles, positions and normals only, no textures"""
+    data = document.data
+    check_supported(data)
+    parts = [
+        {**part, 'attributes': {name: part['attributes'][name] for name in ('POSITION', 'NORMAL')
+                                if name in part['attributes']}}
+        for part in baked_parts(document) if part['mode'] == MODE_TRIANGLES
+    ]
+    builder = BinaryBuilder()
+    nodes = []
+    meshes = []
+    materials = [untextured_material(material) for material in data.get('materials', [])]
+    for group in group_parts(parts):
+        attributes, indices = group['attributes'], group['indices']
+        if len(indices) >= MIN_LOD_TRIANGLES:
+            attributes, indices = simplify(attributes, indices, ratio) or (attributes, indices)
+        nodes.append(add_mesh(builder, meshes, attributes, indices, MODE_TRIANGLES, group['material'],
+                              materials, quantize))
+
+    out = {
+        'asset': {'version': '2.0', 'generator': 'Mindsim asset_pipeline'},
+        'scene': 0,
+        'scenes': [{'nodes': list(range(len(nodes)))}],
+        'nodes': nodes,
+        'meshes': meshes,
+        'accessors': builder.accessors,
+        'bufferViews': builder.buffer_views,
+        'buffers': [{'byteLength': len(builder.data)}],
+    }
+    if materials:
+        out['materials'] = materials
+    if quantize and meshes:
+        out['extensionsUsed'] = out['extensionsRequired'] = [QUANTIZATION]
+    return glb_bytes(out, builder.data)
+
+
+def add_mesh(builder, meshes, attributes, indices, mode, material, materials, quantize):
+    """Encode one primitive into a new mesh; returns the node that places it"""
+    node = {}
+    encoded = {}
+    normalized = {}
+    for name, values in attributes.items():
+        if name == 'POSITION' and quantize:
+            encoded[name], center, step = quantize_positions(values)
+            node = {'translation': center.tolist(), 'scale': [step, step, step]}
+            normalized[name] = False
+        elif quantize:
+            encoded[name], normalized[name] = quantize_attribute(name, values)
+        else:
+            encoded[name], normalized[name] = values.astype(np.float32), False
+    encoded, indices = weld(encoded, indices)
+
+    primitive = {
+        'attributes': {
+            name: builder.add_accessor(values, normalized=normalized[name], bounds=name == 'POSITION')
+            for name, values in encoded.items()
+        },
+        'indices': builder.add_accessor(
+            indices.astype(np.uint16 if len(encoded['POSITION']) <= 65535 else np.uint32),
+            target=TARGET_ELEMENT_ARRAY_BUFFER,
+        ),
+        'mode': mode,
+    }
+    mesh = {'primitives': [primitive]}
+    if material is not None:
+        primitive['material'] = material
+        if 'name' in materials[material]:
+            mesh['name'] = materials[material]['name']
+    meshes.append(mesh)
+    return {**node, 'mesh': len(meshes) - 1}
+
+
+def source_size(document):
+    return document.path.stat().st_size + sum(path.stat().st_size for path in document.external_files())
+
+
+def optimize_asset(asset_path, output=None, proxy_ratio=PROXY_RATIO, **options):
+    """Write the optimized GLB of one asset, and its proxy unless ``proxy_ratio`` is None; returns its manifest entry"""
+    document = GLTFDocument.load(asset_path)
+    output = Path(output or optimized_path_for(asset_path))
+    glb = optimize_document(document, **options)
+    output.write_bytes(glb)
+    result = {'output': output, 'source_bytes': source_size(document), 'bytes': len(glb)}
+    if proxy_ratio is not None:
+        proxy = proxy_path_for(asset_path)
+        proxy_glb = proxy_document(document, proxy_ratio, quantize=options.get('quantize', True))
+        proxy.write_bytes(proxy_glb)
+        result.update(proxy=proxy, proxy_bytes=len(proxy_glb))
+    return result
+
+
+def find_assets(root):
+    """Source models under the asset root, skipping earlier outputs"""
+    return sorted(
+        path for pattern in ('*.gltf', '*.glb') for path in Path(root).rglob(pattern)
+        if not path.name.endswith((OUTPUT_SUFFIX, PROXY_SUFFIX))
+    )
+
+
+def asset_url(root, path):
+    return '/' + Path(path).resolve().relative_to(Path(root).resolve()).as_posix()
+
+
+def load_manifest(root):
+    path = Path(root) / MANIFEST_NAME
+    if path.exists():
+        return json.loads(path.read_text())
+    return {'assets': {}}
+
+
+def save_manifest(root, manifest):
+    path = Path(root) / MANIFEST_NAME
+    path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+    return path
@@ -0,0 +1,636 @@
+# asset_cache.py
+import json
+from pathlib import Path
+
+import reflex as rx
+
+# Maps of "/<path in assets/>" to {"url": ...}, most specific first: asset-manifest.json
+# (python -m asset_pipeline fingerprint) points at content-hashed copies, optimized.json
+# (python -m asset_pipeline optimize) at optimized GLBs
+ASSET_MANIFESTS = ("asset-manifest.json", "optimized.json")
+
+
+def load_asset_manifest(assets_dir: Path = Path("assets")) -> dict[str, dict]:
+    for name in ASSET_MANIFESTS:
+        path = assets_dir / name
+        if path.exists():
+            return json.loads(path.read_text())["assets"]
+    return {}
+
+
+# Read once when the app compiles, so pages link the final URLs and the browser never fetches a manifest
+ASSET_MANIFEST = load_asset_manifest()
+ASSET_URLS = {url: entry["url"] for url, entry in ASSET_MANIFEST.items()}
+# Model URL (as resolved above) -> its untextured proxy GLB, shown while the model streams in
+MODEL_PROXIES = {entry["url"]: entry["proxy"] for entry in ASSET_MANIFEST.values() if "proxy" in entry}
+
+
+def resolve_url(url: str) -> str:
+    """``url`` ("/<path in assets/>") as listed in the asset manifests, or unchanged."""
+    return ASSET_URLS.get(url, url)
+
+
+def asset_url(path: str) -> str:
+    """URL of an asset in assets/: its hashed (cacheable forever) or optimized copy when a manifest lists it."""
+    return ASSET_URLS.get("/" + path.lstrip("/")) or rx.asset(path.lstrip("/"))
+
+
+# Models and images shown by each route; AssetPreloader starts loading them when a link to the route
+# is hovered or focused, so the page opens with its assets already in MindAssets
+ROUTE_ASSETS = {
+    route: [resolve_url(url) for url in urls]
+    for route, urls in {
+        "/": [
+            "/humanMind/human.gltf",
+            "/brain/scene.gltf",
+            "/emotion/emotion.png",
+            "/optical/opticBunny.png",
+        ],
+        "/demo": [
+            "/LabPlan.gltf",
+            "/humanMind/human.gltf",
+        ],
+    }.items()
+}
+
+
+def asset_cache_js() -> str:
+    return """
+        // One cache of loaded GLTF files and textures for the whole app. Concurrent requests for an asset share
+        // one load, every user holds a reference, and geometries, materials and textures are disposed once
+        // nobody has used the asset for keepUnusedMs (so navigating between pages that share a model reuses it).
+        // URLs arrive already resolved through the asset manifests (asset_url in asset_cache.py).
+        // Models stream: bytes and bounds are reported while they download, and their textures load afterwards.
+        if (!globalThis.MindAssets) {
+            const entries = new Map(); // key -> { refs, value, promise, timer, dispose, users, listeners, progress }
+            let gltfLoader = null;
+            let textureLoader = null;
+
+            const disposeMaterial = (material) => {
+                Object.values(material).forEach((value) => {
+                    if (value && value.isTexture) value.dispose();
+                });
+                material.dispose();
+            };
+
+            const disposeGLTF = (gltf) => {
+                gltf.scene.traverse((child) => {
+                    if (child.geometry) child.geometry.dispose();
+                    if (child.material) {
+                        (Array.isArray(child.material) ? child.material : [child.material]).forEach(disposeMaterial);
+                    }
+                });
+            };
+
+            const getEntry = (key, load, dispose) => {
+                let entry = entries.get(key);
+                if (entry) return entry;
+                entry = {
+                    key, refs: 0, value: null, timer: null, dispose, disposed: false,
+                    // Who shows the asset (for load priority) and who redraws when it changes
+                    users: new Set(),
+                    listeners: new Set(),
+                    progress: { loaded: 0, total: 0, texturesLoaded: 0, texturesTotal: 0 },
+                    bounds: null,
+                };
+                entry.promise = load(entry).then((value) => {
+                    entry.value = value;
+                    if (entry.disposed) dispose(value);
+                    return value;
+                });
+                // Forget failed loads so the next user retries
+                entry.promise.catch(() => {
+                    if (entries.get(key) === entry) entries.delete(key);
+                });
+                entries.set(key, entry);
+                return entry;
+            };
+
+            const scheduleDispose = (entry) => {
+                clearTimeout(entry.timer);
+                entry.timer = setTimeout(() => {
+                    if (entry.refs > 0) return;
+                    entries.delete(entry.key);
+                    entry.disposed = true;
+                    if (entry.value) entry.dispose(entry.value);
+                }, MindAssets.keepUnusedMs);
+            };
+
+            const retain = (entry) => {
+                entry.refs++;
+                clearTimeout(entry.timer);
+                entry.timer = null;
+            };
+
+            const release = (entry) => {
+                entry.refs--;
+                if (entry.refs === 0) scheduleDispose(entry);
+            };
+
+            const notify = (entry) => entry.listeners.forEach((listener) => listener());
+
+            // Distance from the nearest user's camera to a point in model space (the model's origin by
+            // default); assets nobody shows yet (preloads) come last
+            const ORIGIN = new THREE.Vector3();
+            const viewPoint = new THREE.Vector3();
+            const viewCamera = new THREE.Vector3();
+            const entryDistance = (entry, local = ORIGIN) => {
+                let nearest = Infinity;
+                entry.users.forEach(({ anchor, camera }) => {
+                    const object = anchor && anchor.current;
+                    if (!object || !camera) return;
+                    viewPoint.copy(local).applyMatrix4(object.matrixWorld);
+                    nearest = Math.min(nearest, viewPoint.distanceTo(viewCamera.setFromMatrixPosition(camera.matrixWorld)));
+                });
+                return nearest;
+            };
+
+            // Every model load goes through one queue, maxConcurrentLoads at a time: proxies first, then
+            // geometry, then textures, and within a stage whatever is nearest a camera when a slot frees up
+            const STAGE_PROXY = 0;
+            const STAGE_GEOMETRY = 1;
+            const STAGE_TEXTURE = 2;
+            const queue = []; // { stage, distance, run, resolve, reject }
+            let activeLoads = 0;
+
+            const pumpQueue = () => {
+                while (activeLoads < MindAssets.maxConcurrentLoads && queue.length) {
+                    let next = -1;
+                    let nextStage = Infinity;
+                    let nextDistance = Infinity;
+                    queue.forEach((task, i) => {
+                        if (task.stage > nextStage) return;
+                        const distance = task.distance();
+                        if (task.stage < nextStage || distance < nextDistance) {
+                            next = i;
+                            nextStage = task.stage;
+                            nextDistance = distance;
+                        }
+                    });
+                    const [task] = queue.splice(next, 1);
+                    activeLoads++;
+                    Promise.resolve()
+                        .then(task.run)
+                        .then(task.resolve, task.reject)
+                        .finally(() => {
+                            activeLoads--;
+                            pumpQueue();
+                        });
+                }
+            };
+
+            const schedule = (stage, distance, run) => new Promise((resolve, reject) => {
+                queue.push({ stage, distance, run, resolve, reject });
+                pumpQueue();
+            });
+
+            // Bounds of the default scene from accessor min/max alone, before any buffer has loaded
+            const NORMALIZED_MAX = { 5120: 127, 5121: 255, 5122: 32767, 5123: 65535 };
+            const gltfBounds = (json) => {
+                const box = new THREE.Box3();
+                const part = new THREE.Box3();
+                const visit = (index, parentMatrix) => {
+                    const node = json.nodes[index];
+                    const matrix = new THREE.Matrix4();
+                    if (node.matrix) {
+                        matrix.fromArray(node.matrix);
+                    } else {
+                        matrix.compose(
+                            new THREE.Vector3().fromArray(node.translation || [0, 0, 0]),
+                            new THREE.Quaternion().fromArray(node.rotation || [0, 0, 0, 1]),
+                            new THREE.Vector3().fromArray(node.scale || [1, 1, 1])
+                        );
+                    }
+                    matrix.premultiply(parentMatrix);
+                    const mesh = node.mesh !== undefined ? json.meshes[node.mesh] : null;
+                    (mesh ? mesh.primitives : []).forEach((primitive) => {
+                        const accessor = (json.accessors || [])[primitive.attributes.POSITION];
+                        if (!accessor || !accessor.min || !accessor.max) return;
+                        part.min.fromArray(accessor.min);
+                        part.max.fromArray(accessor.max);
+                        if (accessor.normalized) {
+                            part.min.divideScalar(NORMALIZED_MAX[accessor.componentType] || 1);
+                            part.max.divideScalar(NORMALIZED_MAX[accessor.componentType] || 1);
+                        }
+                        box.union(part.applyMatrix4(matrix));
+                    });
+                    (node.children || []).forEach((child) => visit(child, matrix));
+                };
+                const scene = json.scenes && json.scenes[json.scene || 0];
+                (scene ? scene.nodes : []).forEach((index) => visit(index, new THREE.Matrix4()));
+                return box.isEmpty() ? null : box;
+            };
+
+            // GLB header: magic, version, length, then the JSON chunk's length and type
+            const GLB_MAGIC = 0x46546c67;
+            const isGLB = (bytes) => bytes.length >= 20 && new DataView(bytes.buffer).getUint32(0, true) === GLB_MAGIC;
+            const glbJson = (bytes) => {
+                const length = new DataView(bytes.buffer).getUint32(12, true);
+                return JSON.parse(new TextDecoder().decode(bytes.subarray(20, 20 + length)));
+            };
+
+            const concatChunks = (chunks, length) => {
+                const bytes = new Uint8Array(length);
+                let offset = 0;
+                chunks.forEach((chunk) => {
+                    bytes.set(chunk, offset);
+                    offset += chunk.length;
+                });
+                return bytes;
+            };
+
+            // Download a model file or buffer, counting its bytes into the entry's progress; the bounds are
+            // read from the glTF JSON as soon as it is complete (for a GLB, its first chunk)
+            const streamFile = async (url, entry, readBounds = false) => {
+                const response = await fetch(url);
+                if (!response.ok) throw new Error(`HTTP ${response.status} for ${url}`);
+                // With Content-Encoding this is the compressed size; the total is corrected at the end
+                const expected = Number(response.headers.get('content-length')) || 0;
+                entry.progress.total += expected;
+                const reader = response.body.getReader();
+                const chunks = [];
+                let received = 0;
+                let boundsAt = readBounds ? 20 : Infinity;
+                for (;;) {
+                    const { done, value } = await reader.read();
+                    if (done) break;
+                    chunks.push(value);
+                    received += value.length;
+                    entry.progress.loaded += value.length;
+                    if (received >= boundsAt) {
+                        const start = concatChunks(chunks, received);
+                        if (!isGLB(start)) {
+                            boundsAt = Infinity; // a .gltf: its JSON is the whole file
+                        } else {
+                            boundsAt = 20 + new DataView(start.buffer).getUint32(12, true);
+                            if (received >= boundsAt) {
+                                entry.bounds = gltfBounds(glbJson(start));
+                                boundsAt = Infinity;
+                            }
+                        }
+                    }
+                    notify(entry);
+                }
+                entry.progress.total += received - expected;
+                const bytes = concatChunks(chunks, received);
+                if (readBounds && !entry.bounds && !isGLB(bytes)) {
+                    try {
+                        entry.bounds = gltfBounds(JSON.parse(new TextDecoder().decode(bytes)));
+                    } catch (e) {
+                        // Not JSON either; GLTFLoader will report it
+                    }
+                }
+                notify(entry);
+                return bytes.buffer;
+            };
+
+            // Parse with GLTFLoader, streaming external buffers through streamFile and holding back every
+            // material texture; returns the gltf and the texture assignments that were held back
+            const parseGLTF = async (loader, data, url, entry) => {
+                const deferred = []; // { materialIndex, mapName, mapDef, colorSpace }
+                const streaming = (parser) => {
+                    const loadBuffer = parser.loadBuffer.bind(parser);
+                    parser.loadBuffer = (index) => {
+                        const uri = parser.json.buffers[index].uri;
+                        if (!uri || uri.startsWith('data:')) return loadBuffer(index);
+                        return streamFile(new URL(uri, new URL(url, window.location.href)).href, entry);
+                    };
+                    // Materials assign their textures synchronously while loadMaterial runs
+                    let materialIndex = null;
+                    const loadMaterial = parser.loadMaterial.bind(parser);
+                    parser.loadMaterial = (index) => {
+                        materialIndex = index;
+                        try {
+                            return loadMaterial(index);
+                        } finally {
+                            materialIndex = null;
+                        }
+                    };
+                    const assignTexture = parser.assignTexture.bind(parser);
+                    parser.assignTexture = (params, mapName, mapDef, colorSpace) => {
+                        if (materialIndex === null) return assignTexture(params, mapName, mapDef, colorSpace);
+                        deferred.push({ materialIndex, mapName, mapDef, colorSpace });
+                        return Promise.resolve(null);
+                    };
+                    return { name: 'MindStreaming' };
+                };
+                // Plugins are created synchronously when parsing starts, so the shared loader can drop it again
+                loader.register(streaming);
+                const parsing = loader.parseAsync(data, THREE.LoaderUtils.extractUrlBase(url));
+                loader.unregister(streaming);
+                return { gltf: await parsing, deferred };
+            };
+
+            // Textures held back by parseGLTF, each queued by the distance to the meshes that use it
+            const streamTextures = (gltf, deferred, entry) => {
+                const parser = gltf.parser;
+                const materials = new Map(); // material index -> { objects: Set of materials, box }
+                gltf.scene.updateMatrixWorld(true);
+                gltf.scene.traverse((object) => {
+                    if (!object.isMesh) return;
+                    (Array.isArray(object.material) ? object.material : [object.material]).forEach((material) => {
+                        const association = parser.associations.get(material);
+                        if (!association || association.materials === undefined) return;
+                        if (!materials.has(association.materials)) {
+                            materials.set(association.materials, { objects: new Set(), box: new THREE.Box3() });
+                        }
+                        const used = materials.get(association.materials);
+                        used.objects.add(material);
+                        used.box.expandByObject(object);
+                    });
+                });
+
+                const textures = new Map(); // texture index -> { uses, box }
+                deferred.forEach((use) => {
+                    const used = materials.get(use.materialIndex);
+                    if (!used) return;
+                    if (!textures.has(use.mapDef.index)) textures.set(use.mapDef.index, { uses: [], box: new THREE.Box3() });
+                    const texture = textures.get(use.mapDef.index);
+                    texture.uses.push(use);
+                    texture.box.union(used.box);
+                });
+
+                entry.progress.texturesTotal += textures.size;
+                textures.forEach(({ uses, box }) => {
+                    const center = box.isEmpty() ? ORIGIN : box.getCenter(new THREE.Vector3());
+                    schedule(STAGE_TEXTURE, () => entryDistance(entry, center), async () => {
+                        if (entry.disposed) return;
+                        await Promise.all(uses.map(async ({ materialIndex, mapName, mapDef, colorSpace }) => {
+                            const params = {};
+                            await parser.assignTexture(params, mapName, mapDef, colorSpace);
+                            const texture = params[mapName];
+                            if (!texture) return;
+                            if (entry.disposed) {
+                                texture.dispose();
+                                return;
+                            }
+                            // Materials are shared by every clone of the scene, so all viewers get the texture
+                            materials.get(materialIndex).objects.forEach((material) => {
+                                material[mapName] = texture;
+                                material.needsUpdate = true;
+                            });
+                        }));
+                        entry.progress.texturesLoaded++;
+                        notify(entry);
+                    }).catch((err) => console.error('Error loading texture of model:', entry.key, err));
+                });
+            };
+
+            // Picks its level by how much of the viewport height the model's bounding sphere spans, so the
+            // switch happens at the same on-screen size whatever the model's scale or the camera's fov
+            const lodBox = new THREE.Box3();
+            const lodSphere = new THREE.Sphere();
+            const lodCamera = new THREE.Vector3();
+            class ScreenSpaceLOD extends THREE.LOD {
+                addCoverageLevel(object, coverage) {
+                    this.addLevel(object, 0);
+                    this.levels[this.levels.length - 1].coverage = coverage;
+                    return this;
+                }
+
+                copy(source) {
+                    super.copy(source);
+                    this.levels.forEach((level, i) => {
+                        level.coverage = source.levels[i].coverage;
+                    });
+                    return this;
+                }
+
+                update(camera) {
+                    const levels = this.levels;
+                    if (levels.length < 2) return;
+                    lodBox.setFromObject(levels[0].object).getBoundingSphere(lodSphere);
+                    const distance = Math.max(lodCamera.setFromMatrixPosition(camera.matrixWorld).distanceTo(lodSphere.center), 1e-6);
+                    const halfHeight = camera.isPerspectiveCamera
+                        ? distance * Math.tan(THREE.MathUtils.degToRad(camera.fov) / 2)
+                        : (camera.top - camera.bottom) / 2;
+                    const coverage = (lodSphere.radius * camera.zoom / halfHeight) * MindAssets.lodBias;
+
+                    let next = -1;
+                    for (let i = 0; i < levels.length; i++) {
+                        // 10% hysteresis before switching back to a finer level, so the boundary doesn't flicker
+                        const threshold = levels[i].coverage * (i < this._currentLevel ? 1.1 : 1);
+                        if (coverage >= threshold) {
+                            next = i;
+                            break;
+                        }
+                    }
+                    levels.forEach((level, i) => {
+                        level.object.visible = i === next;
+                    });
+                    this._currentLevel = Math.max(next, 0);
+                }
+
+                // Hit-test only the level on screen; returning false stops the raycaster visiting every level
+                raycast(raycaster, intersects) {
+                    const level = this.levels[this._currentLevel];
+                    if (level && level.object.visible) raycaster.intersectObject(level.object, true, intersects);
+                    return false;
+                }
+            }
+
+            // MSFT_lod (python -m asset_pipeline optimize): the coarser levels are nodes outside the scene,
+            // listed on the full-detail node together with their MSFT_screencoverage thresholds
+            const expandLODs = async (gltf) => {
+                const bases = [];
+                gltf.scene.traverse((object) => {
+                    const extension = object.userData.gltfExtensions && object.userData.gltfExtensions.MSFT_lod;
+                    if (extension) bases.push([object, extension.ids]);
+                });
+                await Promise.all(bases.map(async ([object, ids]) => {
+                    const levels = await Promise.all(ids.map((id) => gltf.parser.getDependency('node', id)));
+                    const coverage = object.userData.MSFT_screencoverage || [];
+                    const lod = new ScreenSpaceLOD();
+                    lod.name = object.name;
+                    object.parent.add(lod);
+                    lod.addCoverageLevel(object, coverage[0] || 0);
+                    levels.forEach((level, i) => {
+                        // Only the full-detail mesh takes part in collision
+                        level.traverse((child) => {
+                            child.userData.collider = false;
+                        });
+                        lod.addCoverageLevel(level, coverage[i + 1] || 0);
+                    });
+                }));
+                return gltf;
+            };
+
+            const gltfEntry = (url, stage = STAGE_GEOMETRY) => getEntry(`gltf:${url}`, (entry) => (
+                schedule(stage, () => entryDistance(entry), async () => {
+                    if (!gltfLoader) {
+                        gltfLoader = import('three/examples/jsm/loaders/GLTFLoader.js').then(({ GLTFLoader }) => new GLTFLoader());
+                    }
+                    const loader = await gltfLoader;
+                    const data = await streamFile(url, entry, true);
+                    const { gltf, deferred } = await parseGLTF(loader, data, url, entry);
+                    await expandLODs(gltf);
+                    // A simplified stand-in must not block the player where the real model doesn't
+                    if (stage === STAGE_PROXY) {
+                        gltf.scene.traverse((child) => {
+                            child.userData.collider = false;
+                        });
+                    }
+                    streamTextures(gltf, deferred, entry);
+                    return gltf;
+                })
+            ), disposeGLTF);
+
+            // Defaults match the image components: top-left origin, sRGB colours
+            const textureEntry = (url, { flipY = false, colorSpace = THREE.SRGBColorSpace } = {}) =>
+                getEntry(`texture:${url}|${flipY}|${colorSpace}`, () => {
+                    if (!textureLoader) textureLoader = new THREE.TextureLoader();
+                    return textureLoader.loadAsync(url).then((texture) => {
+                        texture.flipY = flipY;
+                        texture.colorSpace = colorSpace;
+                        texture.needsUpdate = true;
+                        return texture;
+                    });
+                }, (texture) => texture.dispose());
+
+            const IMAGE_EXTENSIONS = /\\.(png|jpe?g|webp|gif|avif|ktx2)(\\?|#|$)/i;
+
+            const MindAssets = {
+                keepUnusedMs: 30000,
+                maxConcurrentLoads: 4,
+                // Scales the screen coverage LODs see: below 1 switches to coarser levels sooner
+                lodBias: 1,
+
+                // Start loading without holding a reference; unused preloads are dropped after keepUnusedMs
+                preload(urls) {
+                    (Array.isArray(urls) ? urls : [urls]).forEach((url) => {
+                        if (!url) return;
+                        const entry = IMAGE_EXTENSIONS.test(url) ? textureEntry(url) : gltfEntry(url);
+                        if (entry.refs === 0 && !entry.timer) scheduleDispose(entry);
+                    });
+                },
+
+                // Model scene for this user: a clone sharing the cached geometries and materials. Options:
+                // anchor, a ref to the object the model will sit in, makes models nearer the camera load
+                // first; proxy marks a stand-in that loads ahead of all full models.
+                useGLTFScene(url, { anchor = null, proxy = false } = {}) {
+                    const camera = useThree((state) => state.camera);
+                    const invalidate = useThree((state) => state.invalidate);
+                    const [scene, setScene] = React.useState(null);
+                    React.useEffect(() => {
+                        if (!url) return;
+                        let active = true;
+                        const entry = gltfEntry(url, proxy ? STAGE_PROXY : STAGE_GEOMETRY);
+                        const user = { anchor, camera };
+                        // On-demand canvases redraw as bytes and textures arrive
+                        const redraw = () => invalidate();
+                        entry.users.add(user);
+                        entry.listeners.add(redraw);
+                        retain(entry);
+                        entry.promise.then(
+                            (gltf) => active && setScene(gltf.scene.clone(true)),
+                            (err) => console.error('Error loading model:', url, err)
+                        );
+                        return () => {
+                            active = false;
+                            setScene(null);
+                            entry.users.delete(user);
+                            entry.listeners.delete(redraw);
+                            release(entry);
+                        };
+                    }, [url, anchor, proxy, camera, invalidate]);
+                    return scene;
+                },
+
+                // { progress: downloaded share 0-1, bounds: Box3 of the model or null } of a model being loaded
+                // by useGLTFScene, updated in whole percents
+                useGLTFProgress(url) {
+                    const [state, setState] = React.useState({ progress: 0, bounds: null });
+                    React.useEffect(() => {
+                        const entry = url && entries.get(`gltf:${url}`);
+                        if (!entry) return;
+                        let shown = '';
+                        const update = () => {
+                            const { loaded, total } = entry.progress;
+                            const progress = total ? Math.min(loaded / total, 1) : 0;
+                            const key = `${Math.floor(progress * 100)}|${entry.bounds !== null}`;
+                            if (key === shown) return;
+                            shown = key;
+                            setState({ progress, bounds: entry.bounds });
+                        };
+                        entry.listeners.add(update);
+                        update();
+                        return () => entry.listeners.delete(update);
+                    }, [url]);
+                    return state;
+                },
+
+                // Shared texture; options are { flipY, colorSpace } and each combination is cached separately
+                useTexture(url, options = {}) {
+                    const { flipY = false, colorSpace = THREE.SRGBColorSpace } = options;
+                    const [texture, setTexture] = React.useState(null);
+                    React.useEffect(() => {
+                        if (!url) return;
+                        let active = true;
+                        const entry = textureEntry(url, { flipY, colorSpace });
+                        retain(entry);
+                        entry.promise.then(
+                            (tex) => active && setTexture(tex),
+                            (err) => console.error('Error loading image:', url, err)
+                        );
+                        return () => {
+                            active = false;
+                            setTexture(null);
+                            release(entry);
+                        };
+                    }, [url, flipY, colorSpace]);
+                    return texture;
+                },
+
+                stats() {
+                    return Array.from(entries.values(), ({ key, refs, value, progress }) => ({
+                        key, refs, loaded: value !== null, ...progress,
+                    }));
+                },
+            };
+
+            globalThis.MindAssets = MindAssets;
+        }
+        """
+
+
+class AssetPreloader(rx.Component):
+    """Preloads the assets of a route into MindAssets when a link to it is hovered, focused or touched."""
+
+    tag = "AssetPreloader"
+
+    # Route path -> asset URLs, see ROUTE_ASSETS
+    routes: rx.Var[dict[str, list[str]]] = ROUTE_ASSETS
+
+    def add_custom_code(self) -> list[str]:
+        # Imported here: canvacompo itself uses asset_cache_js
+        from .canvacompo import R3FCanvas
+
+        return [
+            *R3FCanvas.add_custom_code(self),
+            asset_cache_js(),
+            """
+            export const AssetPreloader = ({ routes = {} }) => {
+              React.useEffect(() => {
+                const hinted = new Set();
+                const hint = (event) => {
+                  const link = event.target.closest && event.target.closest('a[href]');
+                  if (!link || link.origin !== window.location.origin) return;
+                  const path = link.pathname.replace(/\\/$/, '') || '/';
+                  if (hinted.has(path) || !routes[path]) return;
+                  hinted.add(path);
+                  globalThis.MindAssets.preload(routes[path]);
+                };
+                document.addEventListener('pointerover', hint, { passive: true });
+                document.addEventListener('focusin', hint);
+                document.addEventListener('touchstart', hint, { passive: true });
+                return () => {
+                  document.removeEventListener('pointerover', hint);
+                  document.removeEventListener('focusin', hint);
+                  document.removeEventListener('touchstart', hint);
+                };
+              }, [routes]);
+
+              return null;
+            };
+            """,
+        ]
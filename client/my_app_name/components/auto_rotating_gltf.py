@@ -1,5 +1,6 @@
 import reflex as rx
 from typing import List
+from .asset_cache import asset_cache_js
 
 class AutoRotatingGLTF(rx.Component):
     """GLTF model that rotates slowly and is non-interactable."""
@@ -12,39 +13,18 @@ class AutoRotatingGLTF(rx.Component):
 
     def add_custom_code(self) -> List[str]:
         return [
+            asset_cache_js(),
             """
             function AutoRotatingGLTFComponent({ url, position=[0,0,0], scale=1, rotationSpeed=0.5 }) {
-                const [model, setModel] = React.useState(null);
+                // Shared, ref-counted load; each instance gets its own clone of the scene
+                const model = globalThis.MindAssets.useGLTFScene(url);
                 const groupRef = React.useRef();
 
-                React.useEffect(() => {
-                    if (!url) return;
-                    let cancelled = false;
-
-                    (async () => {
-                        const mod = await import('three/examples/jsm/loaders/GLTFLoader.js');
-                        const { GLTFLoader } = mod;
-                        const loader = new GLTFLoader();
-
-                        loader.load(
-                            url,
-                            (gltf) => {
-                                if (!cancelled) {
-                                    setModel(gltf.scene);
-                                }
-                            },
-                            undefined,
-                            (err) => console.error("Error loading model:", err)
-                        );
-                    })();
-
-                    return () => { cancelled = true; };
-                }, [url]);
-
-                // Slow auto-rotation
+                // Slow auto-rotation; always animating, so it asks for the next frame on a demand frameloop
                 useFrame((state, delta) => {
                     if (groupRef.current) {
-                        groupRef.current.rotation.y += rotationSpeed * delta;
+                        groupRef.current.rotation.y += rotationSpeed * Math.min(delta, 0.1);
+                        state.invalidate();
                     }
                 });
 
@@ -1,28 +1,111 @@
+import os
 from reflex.components.component import NoSSRComponent
 from typing import Any, Dict, List
 import reflex as rx
+from .asset_cache import MODEL_PROXIES, asset_cache_js
+from .perf_beacon import PERF_BEACON_URL, PerfBeacon
+from .perf_hud import PerfProbe
+from .quality import QualityGovernor, quality_js
+
+# The backend as the browser reaches it, for models it builds on request
+PUBLIC_BACKEND_URL = os.getenv("PUBLIC_BACKEND_URL", os.getenv("BACKEND_URL", "http://localhost:8000")).rstrip("/")
 
 class R3FCanvas(NoSSRComponent):
     library = "@react-three/fiber@9.0.0"
     tag = "Canvas"
 
+    # "always" renders every display frame; "demand" only after something calls invalidate()
+    frameloop: rx.Var[str]
+
+    @classmethod
+    def create(cls, *children, pause_when_hidden: bool = True, adaptive_quality: bool = True, **props):
+        """Canvas that, unless ``pause_when_hidden`` is off, stops rendering while off-screen or in a hidden tab,
+        and unless ``adaptive_quality`` is off, runs a QualityGovernor. A PerfProbe feeds PerfHUD when the page has ?perf,
+        and a PerfBeacon reports real-user timings when PERF_BEACON_URL is set."""
+        if pause_when_hidden:
+            children = (*children, PauseWhenHidden.create())
+        if adaptive_quality:
+            children = (*children, QualityGovernor.create())
+        children = (*children, PerfProbe.create())
+        if PERF_BEACON_URL:
+            children = (*children, PerfBeacon.create(url=PERF_BEACON_URL))
+        return super().create(*children, **props)
+
     def add_custom_code(self) -> list[str]:
         return [
             """
             import React, { useRef, useState, useMemo } from 'react';
             import { useThree, useFrame } from '@react-three/fiber';
-            import { useGLTF } from '@react-three/drei';
             import * as THREE from 'three';
             """
         ]
 
+class PauseWhenHidden(rx.Component):
+    """Sets the canvas frameloop to "never" while it is scrolled out of view or the tab is hidden."""
+
+    tag = "PauseWhenHidden"
+
+    def add_custom_code(self) -> list[str]:
+        return [
+            """
+            export const PauseWhenHidden = () => {
+              const { gl, setFrameloop, invalidate } = useThree();
+              const frameloop = useThree((state) => state.frameloop);
+              // The loop the canvas was configured with, restored when it becomes visible again
+              const resumeTo = useRef(frameloop);
+
+              React.useEffect(() => {
+                let onScreen = true;
+                const update = () => {
+                  const visible = onScreen && document.visibilityState !== 'hidden';
+                  setFrameloop(visible ? resumeTo.current : 'never');
+                  if (visible) invalidate();
+                };
+                const observer = typeof IntersectionObserver === 'undefined'
+                  ? null
+                  : new IntersectionObserver((entries) => {
+                      onScreen = entries[entries.length - 1].isIntersecting;
+                      update();
+                    });
+                if (observer) observer.observe(gl.domElement);
+                document.addEventListener('visibilitychange', update);
+                return () => {
+                  if (observer) observer.disconnect();
+                  document.removeEventListener('visibilitychange', update);
+                  setFrameloop(resumeTo.current);
+                };
+              }, [gl, setFrameloop, invalidate]);
+
+              return null;
+            };
+            """
+        ]
+
+
 class ThreeScene(rx.Component):
     tag = "ThreeScene"
 
     def add_custom_code(self) -> list[str]:
         return [
+            quality_js(),
             """
             export const ThreeScene = () => {
+              // Shadow-casting lights and shadow map size follow the quality level
+              const quality = globalThis.MindQuality.useLevel();
+              const spotLight = useRef();
+              const directionalLight = useRef();
+              const shadowMapSize = [quality.shadowMapSize, quality.shadowMapSize];
+
+              // three keeps a shadow map at its first size; drop it so the next frame allocates the new one
+              React.useEffect(() => {
+                [spotLight.current, directionalLight.current].forEach((light) => {
+                  if (light && light.shadow.map) {
+                    light.shadow.map.dispose();
+                    light.shadow.map = null;
+                  }
+                });
+              }, [quality.shadowMapSize]);
+
               return (
                 <>
                   {/* Global ambient light for base illumination - increased for better visibility */}
@@ -30,18 +113,22 @@ class ThreeScene(rx.Component):
 
                   {/* Stronger spotlight with shadows */}
                   <spotLight
+                    ref={spotLight}
                     position={[10, 15, 10]}
                     angle={0.3}
                     penumbra={0.5}
                     intensity={1.5}
-                    castShadow
+                    castShadow={quality.shadowLights >= 1}
+                    shadow-mapSize={shadowMapSize}
                   />
 
                   {/* Directional light for nice shading */}
                   <directionalLight
+                    ref={directionalLight}
                     position={[-5, 10, -5]}
                     intensity={1.2}
-                    castShadow
+                    castShadow={quality.shadowLights >= 2}
+                    shadow-mapSize={shadowMapSize}
                   />
 
                   {/* Additional point light for better illumination */}
@@ -62,64 +149,186 @@ class ThreeScene(rx.Component):
         ]
     
 class ModelViewer3D(rx.Component):
-    """Load and display a GLB model using GLTFLoader."""
+    """Load and display a GLB model using GLTFLoader.
+
+    While the model streams in, its proxy (``<name>.proxy.glb`` from the asset
+    pipeline) or a box of its bounds stands in, with a bar showing the download.
+    """
     tag = "ModelViewer3DComponent"
 
     url: rx.Var[str] = ""
+    # Untextured stand-in; defaults to the one the asset manifest lists for url
+    proxy_url: rx.Var[str] = ""
     position: rx.Var[List[float]] = [0, 0, 0]
     scale: rx.Var[float] = 1.0
     rotation: rx.Var[List[float]] = [0, 0, 0]
 
+    @classmethod
+    def create(cls, *children, **props):
+        url = props.get("url")
+        if isinstance(url, str) and url in MODEL_PROXIES:
+            props.setdefault("proxy_url", MODEL_PROXIES[url])
+        return super().create(*children, **props)
+
     def add_custom_code(self) -> List[str]:
         return [
+            asset_cache_js(),
             """
-            function ModelViewer3DComponent({ url, position=[0,0,0], scale=1, rotation=[0,0,0] }) {
-                const [model, setModel] = React.useState(null);
-                const modelRef = React.useRef();
-
-                React.useEffect(() => {
-                    if (!url) return;
-                    let cancelled = false;
-
-                    (async () => {
-                        const mod = await import('three/examples/jsm/loaders/GLTFLoader.js');
-                        const { GLTFLoader } = mod;
-                        const loader = new GLTFLoader();
-
-                        loader.load(
-                            url,
-                            (gltf) => {
-                                if (!cancelled) {
-                                    setModel(gltf.scene);
-                                }
-                            },
-                            undefined,
-                            (err) => console.error("Error loading model:", err)
-                        );
-                    })();
-
-                    return () => { cancelled = true; };
-                }, [url]);
-
-                if (!model) {
-                    return (
-                        <mesh position={position}>
-                            <boxGeometry args={[1, 1, 1]} />
-                            <meshStandardMaterial wireframe color="gray" />
+            // Bar along the bottom front edge of the placeholder, filled with the downloaded share
+            const ModelLoadProgress = ({ progress, box }) => {
+                const [width, height, depth] = box ? box.size : [1, 1, 1];
+                const [x, y, z] = box ? box.center : [0, 0, 0];
+                const thickness = width * 0.04;
+                return (
+                    <group position={[x, y - height / 2 - thickness * 2, z + depth / 2]}>
+                        <mesh>
+                            <planeGeometry args={[width, thickness]} />
+                            <meshBasicMaterial color="#333333" />
+                        </mesh>
+                        <mesh position={[-width * (1 - progress) / 2, 0, thickness * 0.1]} scale={[Math.max(progress, 1e-3), 1, 1]}>
+                            <planeGeometry args={[width, thickness]} />
+                            <meshBasicMaterial color="#8bd3ff" />
                         </mesh>
-                    );
-                }
+                    </group>
+                );
+            };
+
+            function ModelViewer3DComponent({ url, proxyUrl = '', position=[0,0,0], scale=1, rotation=[0,0,0] }) {
+                // Shared, ref-counted load; each viewer gets its own clone of the scene. The group anchors
+                // load priority, so viewers nearer the camera load first
+                const anchor = React.useRef();
+                const model = globalThis.MindAssets.useGLTFScene(url, { anchor });
+                const proxy = globalThis.MindAssets.useGLTFScene(model ? '' : proxyUrl, { anchor, proxy: true });
+                const { progress, bounds } = globalThis.MindAssets.useGLTFProgress(model ? '' : url);
+                const box = React.useMemo(() => bounds && {
+                    size: bounds.getSize(new THREE.Vector3()).toArray(),
+                    center: bounds.getCenter(new THREE.Vector3()).toArray(),
+                }, [bounds]);
 
                 return (
-                    <primitive
-                        ref={modelRef}
-                        object={model}
-                        position={position}
-                        scale={scale}
-                        rotation={rotation}
-                        dispose={null}
-                    />
+                    <group ref={anchor} position={position} scale={scale} rotation={rotation}>
+                        {model && <primitive object={model} dispose={null} />}
+                        {!model && proxy && <primitive object={proxy} dispose={null} />}
+                        {!model && !proxy && (
+                            <mesh position={box ? box.center : [0, 0, 0]}>
+                                <boxGeometry args={box ? box.size : [1, 1, 1]} />
+                                <meshStandardMaterial wireframe color="gray" />
+                            </mesh>
+                        )}
+                        {!model && <ModelLoadProgress progress={progress} box={box} />}
+                    </group>
                 );
             }
             """
         ]
+
+
+def mind_model(mind_id: int, version: str = "", **props) -> ModelViewer3D:
+    """A mind's spheres as the backend's instanced GLB export, drawn in one call.
+
+    Pass the ``version`` get_mind reports to make the URL immutable, so browsers cache it for good.
+    """
+    query = f"mind_id={mind_id}" + (f"&v={version}" if version else "")
+    return ModelViewer3D.create(url=f"{PUBLIC_BACKEND_URL}/get_mind_glb/?{query}", **props)
+
+
+class SharedCanvas(rx.Component):
+    """One fixed, full-page canvas that draws every ``SceneView`` inside its children.
+
+    Each view is a DOM box; its scene is rendered into the shared WebGL context
+    with the viewport and scissor set to the box, so a page holds one context and
+    one render loop however many 3D cards it shows.
+    """
+
+    tag = "SharedCanvas"
+
+    frameloop: rx.Var[str] = "always"
+    # Real-user timings go here; empty turns them off
+    beacon_url: rx.Var[str] = PERF_BEACON_URL
+
+    def add_custom_code(self) -> list[str]:
+        return [
+            *R3FCanvas.add_custom_code(self),
+            *PauseWhenHidden.add_custom_code(self),
+            *QualityGovernor.add_custom_code(self),
+            *PerfProbe.add_custom_code(self),
+            *PerfBeacon.add_custom_code(self),
+            """
+            import { Canvas as FiberCanvas } from '@react-three/fiber';
+            import { View, PerspectiveCamera } from '@react-three/drei';
+
+            // Views only clear their own rectangle; wipe the whole canvas first so scrolled-away
+            // cards don't leave pixels behind (runs before the views, which use priority 1)
+            const ClearSharedCanvas = () => {
+              const { invalidate } = useThree();
+              useFrame(({ gl }) => {
+                gl.setScissorTest(false);
+                gl.clear(true, true, true);
+              }, 0);
+
+              // Views follow their DOM boxes, so an on-demand canvas redraws when the page moves
+              React.useEffect(() => {
+                const redraw = () => invalidate();
+                window.addEventListener('scroll', redraw, { capture: true, passive: true });
+                window.addEventListener('resize', redraw);
+                return () => {
+                  window.removeEventListener('scroll', redraw, { capture: true });
+                  window.removeEventListener('resize', redraw);
+                };
+              }, [invalidate]);
+              return null;
+            };
+
+            export const SharedCanvas = ({ children, frameloop = 'always', beaconUrl = '', ...props }) => {
+              const container = useRef(null);
+              // The canvas needs the DOM; render it after mount so the page still prerenders
+              const [mounted, setMounted] = useState(false);
+              React.useEffect(() => setMounted(true), []);
+
+              return (
+                <div ref={container} {...props}>
+                  {children}
+                  {mounted && (
+                    <FiberCanvas
+                      eventSource={container}
+                      eventPrefix="client"
+                      frameloop={frameloop}
+                      gl={{ alpha: true, antialias: true }}
+                      style={{ position: 'fixed', inset: 0, width: '100vw', height: '100vh', pointerEvents: 'none', zIndex: 1 }}
+                    >
+                      <ClearSharedCanvas />
+                      <PauseWhenHidden />
+                      <QualityGovernor />
+                      <PerfProbe />
+                      {beaconUrl && <PerfBeacon url={beaconUrl} />}
+                      <View.Port />
+                    </FiberCanvas>
+                  )}
+                </div>
+              );
+            };
+            """,
+        ]
+
+
+class SceneView(rx.Component):
+    """A box whose 3D children are drawn by the enclosing ``SharedCanvas``."""
+
+    tag = "SceneView"
+
+    # Same defaults as the camera R3FCanvas creates
+    camera_position: rx.Var[List[float]] = [0, 0, 5]
+    fov: rx.Var[float] = 75
+
+    def add_custom_code(self) -> list[str]:
+        return [
+            *SharedCanvas.add_custom_code(self),
+            """
+            export const SceneView = ({ children, cameraPosition = [0, 0, 5], fov = 75, className, style }) => (
+              <View className={className} style={{ width: '100%', height: '100%', ...style }}>
+                <PerspectiveCamera makeDefault position={cameraPosition} fov={fov} near={0.1} far={1000} />
+                {children}
+              </View>
+            );
+            """,
+        ]
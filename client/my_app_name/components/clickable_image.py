@@ -1,5 +1,6 @@
 import reflex as rx
 from typing import List
+from .asset_cache import asset_cache_js
 
 class ClickableImage(rx.Component):
     """Image component that rotates 20 degrees on click, toggles back on second click."""
@@ -12,69 +13,41 @@ class ClickableImage(rx.Component):
 
     def add_custom_code(self) -> List[str]:
         return [
+            asset_cache_js(),
             """
             export const ClickableImageComponent = ({ imageUrl, position=[0,0,0], scale=1, initialRotation=[0,0,0] }) => {
                 const meshRef = React.useRef();
-                const [texture, setTexture] = React.useState(null);
+                // Shared, ref-counted texture (flipY off, sRGB); orientation is handled with plane rotation
+                const texture = globalThis.MindAssets.useTexture(imageUrl);
                 const [isRotated, setIsRotated] = React.useState(false);
-                const [aspectRatio, setAspectRatio] = React.useState(1);
-                const { gl } = useThree();
-                
-                // Load image texture
-                React.useEffect(() => {
-                    if (!imageUrl) return;
-                    
-                    const loader = new THREE.TextureLoader();
-                    loader.load(
-                        imageUrl,
-                        (tex) => {
-                            tex.needsUpdate = true;
-                            tex.flipY = false; // Don't flip Y - we'll handle orientation with plane rotation
-                            tex.format = THREE.RGBAFormat;
-                            tex.colorSpace = THREE.SRGBColorSpace;
-                            // Ensure proper transparency handling
-                            if (tex.format === THREE.RGBAFormat) {
-                                tex.premultiplyAlpha = false;
-                            }
-                            
-                            // Calculate aspect ratio from actual texture dimensions
-                            if (tex.image) {
-                                const imgWidth = tex.image.width || tex.image.videoWidth || 1;
-                                const imgHeight = tex.image.height || tex.image.videoHeight || 1;
-                                setAspectRatio(imgWidth / imgHeight);
-                            } else {
-                                // Fallback: wait for image to load
-                                const img = new Image();
-                                img.onload = () => {
-                                    setAspectRatio(img.width / img.height);
-                                };
-                                img.src = imageUrl;
-                            }
-                            
-                            setTexture(tex);
-                        },
-                        undefined,
-                        (err) => console.error("Error loading image:", err)
-                    );
-                }, [imageUrl]);
+                const { gl, invalidate } = useThree();
+
+                // Aspect ratio from the actual texture dimensions
+                const aspectRatio = React.useMemo(() => {
+                    const image = texture && texture.image;
+                    if (!image) return 1;
+                    return (image.width || image.videoWidth || 1) / (image.height || image.videoHeight || 1);
+                }, [texture]);
 
                 // Smooth rotation animation
                 useFrame(() => {
                     if (!meshRef.current) return;
                     
-                    // Toggle between [0,0,0] and [0,0,-0.5]
-                    const targetRotation = isRotated ? [0, 0, -0.5] : [0, 0, 0];
+                    // Toggle between [0,0,0] and [0,0,-0.5]; scalars so no array is allocated per frame
+                    const targetZ = isRotated ? -0.5 : 0;
                     const currentRotation = meshRef.current.rotation;
                     
                     // Smooth interpolation for all axes
                     const lerpFactor = 0.1;
-                    currentRotation.x += (targetRotation[0] - currentRotation.x) * lerpFactor;
-                    currentRotation.y += (targetRotation[1] - currentRotation.y) * lerpFactor;
-                    currentRotation.z += (targetRotation[2] - currentRotation.z) * lerpFactor;
+                    currentRotation.x -= currentRotation.x * lerpFactor;
+                    currentRotation.y -= currentRotation.y * lerpFactor;
+                    currentRotation.z += (targetZ - currentRotation.z) * lerpFactor;
                     
-                    // Snap to target if close enough
-                    if (Math.abs(targetRotation[2] - currentRotation.z) < 0.001) {
-                        meshRef.current.rotation.set(...targetRotation);
+                    // Snap to target if close enough; until then keep requesting frames on a demand frameloop
+                    if (Math.abs(targetZ - currentRotation.z) < 0.001) {
+                        currentRotation.set(0, 0, targetZ);
+                    } else {
+                        invalidate();
                     }
                 });
 
@@ -83,6 +56,9 @@ class ClickableImage(rx.Component):
                     setIsRotated(!isRotated);
                 };
 
+                // Start the rotation animation once the new target has rendered
+                React.useEffect(() => invalidate(), [isRotated, invalidate]);
+
                 // Calculate plane dimensions based on actual texture aspect ratio
                 const planeHeight = 2; // Base height for the plane
                 const planeWidth = aspectRatio * planeHeight;
@@ -2,114 +2,272 @@
 import reflex as rx
 
 class GLTFCollision(rx.Component):
-    """Component that provides collision detection for GLTF room models using raycasting."""
+    """Component that provides collision detection for GLTF room models using a BVH over the static room geometry."""
     tag = "GLTFCollision"
 
+    # Player capsule: radius around the vertical axis, eye height, the step height that is walked over
+    # and the clearance kept above the eyes
+    player_radius: rx.Var[float] = 0.5
+    eye_height: rx.Var[float] = 1.5
+    step_height: rx.Var[float] = 0.3
+    head_clearance: rx.Var[float] = 0.5
+    # Pre-baked walkability grid (python -m asset_pipeline occupancy ...); when it loads,
+    # checkCollision becomes a single bit lookup and the BVH is only used for raycasts
+    occupancy_url: rx.Var[str] = ""
+
     def add_custom_code(self) -> list[str]:
         return [
             """
-            export const GLTFCollision = () => {
-              const { scene, camera } = useThree();
-              const raycaster = React.useMemo(() => new THREE.Raycaster(), []);
-              const playerRadius = 0.5; // Player collision radius
-              const collisionHeight = 1.5; // Height to check collisions at (player eye level)
-              
-              // Collect all meshes from the GLTF room model for collision detection
-              const getRoomMeshes = React.useCallback(() => {
+            import { MeshBVH, INTERSECTED, NOT_INTERSECTED } from 'three-mesh-bvh';
+
+            const COLLIDER_CHECK_FRAMES = 15;
+
+            // What a collider's triangles were baked from: its geometry, that geometry's positions and its world matrix
+            const bakedFrom = (mesh) => ({
+              geometry: mesh.geometry,
+              positionVersion: mesh.geometry.attributes.position.version,
+              matrixWorld: mesh.matrixWorld.clone(),
+            });
+
+            const isBakedFrom = (mesh, baked) => Boolean(baked)
+              && mesh.geometry === baked.geometry
+              && mesh.geometry.attributes.position.version === baked.positionVersion
+              && mesh.matrixWorld.equals(baked.matrixWorld);
+
+            export const GLTFCollision = ({
+              playerRadius = 0.5,
+              eyeHeight = 1.5,
+              stepHeight = 0.3,
+              headClearance = 0.5,
+              occupancyUrl = '',
+            }) => {
+              const { scene, camera, gl } = useThree();
+              const colliders = React.useRef({ bvh: null, meshes: [], baked: [], geometries: -1, frames: 0 });
+              const occupancy = React.useRef(null);
+
+              // Load the baked grid; see client/asset_pipeline/occupancy.py for the layout
+              React.useEffect(() => {
+                if (!occupancyUrl) return;
+                let cancelled = false;
+                fetch(occupancyUrl)
+                  .then((response) => {
+                    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                    return response.arrayBuffer();
+                  })
+                  .then((buffer) => {
+                    if (cancelled) return;
+                    const view = new DataView(buffer);
+                    const magic = String.fromCharCode(view.getUint8(0), view.getUint8(1), view.getUint8(2), view.getUint8(3));
+                    if (magic !== 'OCC1') throw new Error('not an occupancy grid');
+                    occupancy.current = {
+                      width: view.getUint32(4, true),
+                      depth: view.getUint32(8, true),
+                      originX: view.getFloat32(12, true),
+                      originZ: view.getFloat32(16, true),
+                      cellSize: view.getFloat32(20, true),
+                      bits: new Uint8Array(buffer, 36),
+                    };
+                  })
+                  .catch((e) => console.warn('Occupancy grid unavailable, using live collision', occupancyUrl, e));
+                return () => {
+                  cancelled = true;
+                  occupancy.current = null;
+                };
+              }, [occupancyUrl]);
+
+              // Scratch objects reused by every query so moving the player allocates nothing
+              const scratch = React.useMemo(() => ({
+                segment: new THREE.Line3(),
+                capsuleBox: new THREE.Box3(),
+                radius: 0,
+                hit: false,
+                trianglePoint: new THREE.Vector3(),
+                segmentPoint: new THREE.Vector3(),
+                ray: new THREE.Ray(),
+                boxHit: new THREE.Vector3(),
+                far: 0,
+                nearest: Infinity,
+                vertex: new THREE.Vector3(),
+              }), []);
+
+              // shapecast callbacks are created once; they read the query from scratch
+              const capsuleQuery = React.useMemo(() => ({
+                intersectsBounds: (box) => (box.intersectsBox(scratch.capsuleBox) ? INTERSECTED : NOT_INTERSECTED),
+                intersectsTriangle: (tri) => {
+                  const distance = tri.closestPointToSegment(scratch.segment, scratch.trianglePoint, scratch.segmentPoint);
+                  if (distance < scratch.radius) {
+                    scratch.hit = true;
+                    return true; // stop at the first contact
+                  }
+                  return false;
+                },
+              }), [scratch]);
+
+              const rayQuery = React.useMemo(() => ({
+                intersectsBounds: (box) => {
+                  const hit = scratch.ray.intersectBox(box, scratch.boxHit);
+                  if (!hit) return NOT_INTERSECTED;
+                  return hit.distanceTo(scratch.ray.origin) <= Math.min(scratch.far, scratch.nearest) ? INTERSECTED : NOT_INTERSECTED;
+                },
+                intersectsTriangle: (tri) => {
+                  const hit = scratch.ray.intersectTriangle(tri.a, tri.b, tri.c, false, scratch.boxHit);
+                  if (hit) {
+                    const distance = hit.distanceTo(scratch.ray.origin);
+                    if (distance <= scratch.far && distance < scratch.nearest) scratch.nearest = distance;
+                  }
+                  return false;
+                },
+              }), [scratch]);
+
+              // Collect the larger, static meshes of the scene (room geometry)
+              const collectMeshes = React.useCallback(() => {
                 const meshes = [];
-                
-                // Search the scene for all meshes
                 scene.traverse((child) => {
-                  if (child.isMesh && child.geometry) {
-                    // Skip camera
-                    if (child === camera) return;
-                    
-                    // Skip very small objects (likely characters or small props)
-                    // Check bounding sphere radius
-                    child.geometry.computeBoundingSphere();
-                    const radius = child.geometry.boundingSphere?.radius || 0;
-                    
-                    // Only include larger objects (room geometry)
-                    // Adjust this threshold based on your models
-                    if (radius > 0.5) {
-                      meshes.push(child);
-                    }
-                  }
+                  if (!child.isMesh || !child.geometry || child === camera) return;
+                  // Instanced and skinned meshes move; they are not part of the static room
+                  if (child.isInstancedMesh || child.isSkinnedMesh || child.userData.collider === false) return;
+                  if (!child.geometry.boundingSphere) child.geometry.computeBoundingSphere();
+                  // Skip very small objects (likely characters or small props)
+                  if ((child.geometry.boundingSphere?.radius || 0) > 0.5) meshes.push(child);
                 });
-                
                 return meshes;
               }, [scene, camera]);
-              
-              // Check collision at a given x, z position
-              const checkCollision = React.useCallback((x, z) => {
-                const meshes = getRoomMeshes();
-                if (meshes.length === 0) {
-                  return false; // No meshes loaded yet, allow movement
+
+              // Bake every collider into one world-space geometry with a single BVH
+              const rebuild = React.useCallback(() => {
+                const state = colliders.current;
+                state.geometries = gl.info.memory.geometries;
+                scene.updateMatrixWorld();
+                const meshes = collectMeshes();
+                // The same meshes only keep their bake while their geometry, its positions and their placement do too
+                if (
+                  state.bvh
+                  && meshes.length === state.meshes.length
+                  && meshes.every((mesh, i) => mesh === state.meshes[i] && isBakedFrom(mesh, state.baked[i]))
+                ) {
+                  return;
                 }
-                
-                // Check collisions in multiple directions around the player
-                const directions = [
-                  new THREE.Vector3(0, 0, 1),   // Forward
-                  new THREE.Vector3(0, 0, -1),  // Backward
-                  new THREE.Vector3(1, 0, 0),  // Right
-                  new THREE.Vector3(-1, 0, 0), // Left
-                  new THREE.Vector3(0.707, 0, 0.707),   // Forward-right
-                  new THREE.Vector3(-0.707, 0, 0.707),  // Forward-left
-                  new THREE.Vector3(0.707, 0, -0.707),  // Backward-right
-                  new THREE.Vector3(-0.707, 0, -0.707), // Backward-left
-                ];
-                
-                // Check collisions at player height
-                const checkHeight = collisionHeight;
-                const checkPosition = new THREE.Vector3(x, checkHeight, z);
-                
-                for (const direction of directions) {
-                  raycaster.set(checkPosition, direction);
-                  raycaster.far = playerRadius;
-                  
-                  const intersects = raycaster.intersectObjects(meshes, false);
-                  
-                  if (intersects.length > 0) {
-                    const distance = intersects[0].distance;
-                    if (distance < playerRadius) {
-                      return true; // Collision detected
-                    }
+
+                let vertexCount = 0;
+                meshes.forEach((mesh) => {
+                  const geometry = mesh.geometry;
+                  vertexCount += geometry.index ? geometry.index.count : geometry.attributes.position.count;
+                });
+                const positions = new Float32Array(vertexCount * 3);
+                const v = scratch.vertex;
+                let offset = 0;
+                meshes.forEach((mesh) => {
+                  const { index, attributes } = mesh.geometry;
+                  const count = index ? index.count : attributes.position.count;
+                  for (let k = 0; k < count; k++) {
+                    v.fromBufferAttribute(attributes.position, index ? index.getX(k) : k).applyMatrix4(mesh.matrixWorld);
+                    positions[offset++] = v.x;
+                    positions[offset++] = v.y;
+                    positions[offset++] = v.z;
                   }
+                });
+
+                if (state.bvh) state.bvh.geometry.dispose();
+                state.meshes = meshes;
+                state.baked = meshes.map(bakedFrom);
+                if (vertexCount === 0) {
+                  state.bvh = null;
+                  return;
                 }
-                
-                // Also check vertical collision (ceiling/floor)
-                raycaster.set(checkPosition, new THREE.Vector3(0, 1, 0));
-                raycaster.far = 0.5;
-                const verticalIntersects = raycaster.intersectObjects(meshes, false);
-                if (verticalIntersects.length > 0 && verticalIntersects[0].distance < 0.5) {
-                  return true; // Hitting ceiling
+                const geometry = new THREE.BufferGeometry();
+                geometry.setAttribute('position', new THREE.BufferAttribute(positions, 3));
+                state.bvh = new MeshBVH(geometry);
+              }, [collectMeshes, gl, scene, scratch]);
+
+              // Rebuild when the scene changes: right away for a new scene or geometries loaded or
+              // disposed, and within COLLIDER_CHECK_FRAMES for a swapped geometry or a moved mesh
+              // (e.g. Room swapping its merged geometries), which can leave the geometry count as it was
+              useFrame(() => {
+                const state = colliders.current;
+                state.frames += 1;
+                if (state.scene !== scene || state.geometries !== gl.info.memory.geometries || state.frames >= COLLIDER_CHECK_FRAMES) {
+                  state.scene = scene;
+                  state.frames = 0;
+                  rebuild();
                 }
-                
-                raycaster.set(checkPosition, new THREE.Vector3(0, -1, 0));
-                raycaster.far = 1.0;
-                const floorIntersects = raycaster.intersectObjects(meshes, false);
-                if (floorIntersects.length > 0 && floorIntersects[0].distance < 0.5) {
-                  // Floor collision is OK, but too close means we're inside the floor
-                  if (floorIntersects[0].distance < 0.3) {
-                    return true;
-                  }
+              });
+
+              // Does the player capsule standing at x, z touch the room?
+              const checkCollision = React.useCallback((x, z) => {
+                // O(1): one bit of the baked grid; outside the grid is free
+                const grid = occupancy.current;
+                if (grid) {
+                  const i = Math.floor((x - grid.originX) / grid.cellSize);
+                  const k = Math.floor((z - grid.originZ) / grid.cellSize);
+                  if (i < 0 || k < 0 || i >= grid.width || k >= grid.depth) return false;
+                  const cell = k * grid.width + i;
+                  return ((grid.bits[cell >> 3] >> (cell & 7)) & 1) === 1;
+                }
+
+                const bvh = colliders.current.bvh;
+                if (!bvh) {
+                  return false; // No meshes loaded yet, allow movement
                 }
-                
-                return false; // No collision
-              }, [getRoomMeshes, raycaster]);
-              
-              // Store collision function globally so Player can access it
+
+                const start = performance.now();
+                // Capsule from step height to head clearance: floors and low steps are walked over
+                scratch.segment.start.set(x, Math.min(stepHeight + playerRadius, eyeHeight), z);
+                scratch.segment.end.set(x, Math.max(eyeHeight + headClearance - playerRadius, scratch.segment.start.y), z);
+                scratch.radius = playerRadius;
+                scratch.capsuleBox.makeEmpty();
+                scratch.capsuleBox.expandByPoint(scratch.segment.start);
+                scratch.capsuleBox.expandByPoint(scratch.segment.end);
+                scratch.capsuleBox.expandByScalar(playerRadius);
+                scratch.hit = false;
+                bvh.shapecast(capsuleQuery);
+
+                const stats = globalThis.MindsimStats || (globalThis.MindsimStats = {});
+                stats.collisionMs = performance.now() - start;
+                return scratch.hit;
+              }, [capsuleQuery, eyeHeight, stepHeight, headClearance, playerRadius, scratch]);
+
+              // Distance to the first room surface along a ray, or -1 when nothing is hit within far
+              const raycast = React.useCallback((origin, direction, far = Infinity) => {
+                const bvh = colliders.current.bvh;
+                if (!bvh) return -1;
+                scratch.ray.origin.copy(origin);
+                scratch.ray.direction.copy(direction).normalize();
+                scratch.far = far;
+                scratch.nearest = Infinity;
+                bvh.shapecast(rayQuery);
+                return scratch.nearest === Infinity ? -1 : scratch.nearest;
+              }, [rayQuery, scratch]);
+
+              // Store collision functions globally so Player can access them
               React.useEffect(() => {
                 window.checkCollision = checkCollision;
-                
+                window.raycastCollision = raycast;
+                window.rebuildCollision = () => {
+                  colliders.current.meshes = [];
+                  colliders.current.baked = [];
+                  rebuild();
+                };
+
                 return () => {
                   // Cleanup
                   if (window.checkCollision === checkCollision) {
                     delete window.checkCollision;
+                    delete window.raycastCollision;
+                    delete window.rebuildCollision;
                   }
                 };
-              }, [checkCollision]);
-              
+              }, [checkCollision, raycast, rebuild]);
+
+              // Free the baked geometry on unmount
+              React.useEffect(() => () => {
+                const state = colliders.current;
+                if (state.bvh) state.bvh.geometry.dispose();
+                state.bvh = null;
+                state.meshes = [];
+                state.baked = [];
+                state.scene = null;
+              }, []);
+
               return null;
             };
             """
@@ -118,4 +276,3 @@ class GLTFCollision(rx.Component):
 def create_gltf_collision():
     """Factory for GLTF collision detection."""
     return GLTFCollision.create()
-
@@ -1,4 +1,5 @@
 import reflex as rx
+from .asset_cache import asset_cache_js
 
 class DraggableGLTF(rx.Component):
     """Draggable GLTF model component for R3F."""
@@ -12,6 +13,7 @@ class DraggableGLTF(rx.Component):
 
     def add_custom_code(self) -> list[str]:
         return [
+            asset_cache_js(),
             """
             export const DraggableGLTF = ({ 
               url, 
@@ -26,16 +28,17 @@ class DraggableGLTF(rx.Component):
               const [dragOffset, setDragOffset] = React.useState([0, 0]);
               
               const raycaster = React.useMemo(() => new THREE.Raycaster(), []);
+              // Scratch objects reused by every pointer event
+              const mouse = React.useMemo(() => new THREE.Vector2(), []);
+              const intersectPoint = React.useMemo(() => new THREE.Vector3(), []);
               const dragPlane = React.useMemo(() => 
                 new THREE.Plane(new THREE.Vector3(0, 0, 1), -position[2]), 
                 [position]
               );
 
-              // Load GLTF model
-              const { scene } = useGLTF(url);
-              
-              // Clone the scene to avoid reusing the same instance
-              const clonedScene = React.useMemo(() => scene.clone(), [scene]);
+              // Load GLTF model through the shared cache; each instance gets its own clone
+              // of the scene, sharing the cached geometries and materials
+              const clonedScene = globalThis.MindAssets.useGLTFScene(url);
 
               const handlePointerDown = (event) => {
                 event.stopPropagation();
@@ -44,13 +47,12 @@ class DraggableGLTF(rx.Component):
                 
                 console.log('Model clicked at position:', currentPosition);
                 
-                const mouse = new THREE.Vector2(
+                mouse.set(
                   (event.clientX / window.innerWidth) * 2 - 1,
                   -(event.clientY / window.innerHeight) * 2 + 1
                 );
                 
                 raycaster.setFromCamera(mouse, camera);
-                const intersectPoint = new THREE.Vector3();
                 raycaster.ray.intersectPlane(dragPlane, intersectPoint);
                 
                 setDragOffset([
@@ -67,13 +69,12 @@ class DraggableGLTF(rx.Component):
               const handlePointerMove = (event) => {
                 if (!isDragging) return;
                 
-                const mouse = new THREE.Vector2(
+                mouse.set(
                   (event.clientX / window.innerWidth) * 2 - 1,
                   -(event.clientY / window.innerHeight) * 2 + 1
                 );
                 
                 raycaster.setFromCamera(mouse, camera);
-                const intersectPoint = new THREE.Vector3();
                 raycaster.ray.intersectPlane(dragPlane, intersectPoint);
                 
                 const newPosition = [
@@ -85,7 +86,7 @@ class DraggableGLTF(rx.Component):
                 setCurrentPosition(newPosition);
                 
                 if (groupRef.current) {
-                  groupRef.current.position.set(...newPosition);
+                  groupRef.current.position.set(newPosition[0], newPosition[1], newPosition[2]);
                 }
               };
 
@@ -114,7 +115,7 @@ class DraggableGLTF(rx.Component):
                   onPointerEnter={() => !isDragging && (gl.domElement.style.cursor = 'grab')}
                   onPointerLeave={() => !isDragging && (gl.domElement.style.cursor = 'default')}
                 >
-                  <primitive object={clonedScene} />
+                  {clonedScene && <primitive object={clonedScene} dispose={null} />}
                 </group>
               );
             };
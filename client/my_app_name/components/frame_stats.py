@@ -0,0 +1,101 @@
+# frame_stats.py
+import reflex as rx
+
+class FrameStats(rx.Component):
+    """Measures frame time inside an R3FCanvas and writes it into a DOM element."""
+
+    tag = "FrameStats"
+
+    target_id: rx.Var[str] = "frame-stats"
+    # Dev only: count three.js math objects created per frame (see MindsimAllocations below)
+    track_allocations: rx.Var[bool] = False
+
+    def add_custom_code(self) -> list[str]:
+        return [
+            """
+            // Counts Vector3/Quaternion/Matrix4/... constructions. three's constructors assign
+            // `isVector3 = true` (on the instance or prototype), so a setter on that flag sees
+            // every new object. Chromium also exposes heap size, which catches everything else.
+            if (!globalThis.MindsimAllocations) {
+              const counter = { count: 0, installed: false };
+              counter.install = () => {
+                if (counter.installed) return;
+                counter.installed = true;
+                ['Vector2', 'Vector3', 'Vector4', 'Quaternion', 'Euler', 'Matrix3', 'Matrix4', 'Color', 'Box3', 'Sphere']
+                  .forEach((name) => {
+                    const type = THREE[name];
+                    if (!type) return;
+                    Object.defineProperty(type.prototype, 'is' + name, {
+                      configurable: true,
+                      get() { return true; },
+                      set(value) { counter.count++; },
+                    });
+                  });
+              };
+              globalThis.MindsimAllocations = counter;
+            }
+
+            export const FrameStats = ({ targetId = 'frame-stats', trackAllocations = false }) => {
+              const samples = useRef({
+                last: 0, frames: 0, total: 0, worst: 0, physics: 0, reportedAt: 0,
+                allocations: 0, heapGrowth: 0, heap: 0, gcs: 0,
+              });
+
+              React.useEffect(() => {
+                if (trackAllocations) globalThis.MindsimAllocations.install();
+              }, [trackAllocations]);
+
+              useFrame(() => {
+                const now = performance.now();
+                const s = samples.current;
+                if (s.last) {
+                  const frameMs = now - s.last;
+                  s.frames++;
+                  s.total += frameMs;
+                  s.worst = Math.max(s.worst, frameMs);
+                  s.physics += (globalThis.MindsimStats && globalThis.MindsimStats.physicsMs) || 0;
+                }
+                s.last = now;
+
+                if (trackAllocations) {
+                  const counter = globalThis.MindsimAllocations;
+                  s.allocations += counter.count;
+                  counter.count = 0;
+                  const heap = performance.memory ? performance.memory.usedJSHeapSize : 0;
+                  // A shrinking heap means the collector ran since the last frame
+                  if (heap < s.heap) s.gcs++;
+                  else if (s.heap) s.heapGrowth += heap - s.heap;
+                  s.heap = heap;
+                }
+
+                // Report twice a second by writing text directly, so measuring doesn't re-render React
+                if (s.frames > 0 && now - s.reportedAt > 500) {
+                  const el = document.getElementById(targetId);
+                  const stats = globalThis.MindsimStats;
+                  if (el) {
+                    el.textContent =
+                      `${(s.total / s.frames).toFixed(2)} ms/frame (${(1000 * s.frames / s.total).toFixed(0)} fps)` +
+                      ` · worst ${s.worst.toFixed(1)} ms · physics ${(s.physics / s.frames).toFixed(2)} ms` +
+                      (trackAllocations
+                        ? ` · allocs ${(s.allocations / s.frames).toFixed(1)}/frame` +
+                          (s.heap ? ` · heap +${(s.heapGrowth / s.frames / 1024).toFixed(1)} KB/frame · ${s.gcs} GCs` : '')
+                        : '') +
+                      (stats && stats.inputLatencyMs !== undefined
+                        ? ` · input ${stats.inputLatencyMs.toFixed(1)} ms (worst ${stats.inputLatencyWorstMs.toFixed(1)})`
+                        : '') +
+                      (stats && stats.quality ? ` · quality ${stats.quality}` : '');
+                  }
+                  s.frames = 0;
+                  s.total = 0;
+                  s.worst = 0;
+                  s.physics = 0;
+                  s.allocations = 0;
+                  s.heapGrowth = 0;
+                  s.reportedAt = now;
+                }
+              });
+
+              return null;
+            };
+            """
+        ]
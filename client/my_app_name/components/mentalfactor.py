@@ -1,96 +1,219 @@
+import json
 import reflex as rx
 from typing import List, Optional
+from .asset_cache import asset_cache_js
+from .quality import quality_js
+
+def _mind_label_js() -> str:
+    return (
+        """
+        // Sphere name labels packed into shared atlas textures. Each label sprite gets a texture clone that
+        // shares the atlas image (one GPU upload per page) and samples its own sub-rectangle via offset/repeat.
+        if (!globalThis.MindLabels) {
+            const PAGE_SIZE = 2048;
+            const FONT_SIZE = 48;
+            const DPI = 2;
+            const PADDING = Math.round(FONT_SIZE * 0.175);
+            const RADIUS = Math.round(FONT_SIZE * 0.075);
+            const GAP = 2; // keeps linear filtering from bleeding between neighbours
+            const pages = [];
+            const labels = new Map(); // name -> { page, rect, widthUnits, users }
+
+            const createPage = () => {
+                const canvas = document.createElement('canvas');
+                canvas.width = PAGE_SIZE;
+                canvas.height = PAGE_SIZE;
+                const texture = new THREE.CanvasTexture(canvas);
+                texture.minFilter = THREE.LinearFilter;
+                texture.generateMipmaps = false;
+                const page = { canvas, ctx: canvas.getContext('2d'), texture, width: PAGE_SIZE, height: PAGE_SIZE, x: 0, y: 0, rowHeight: 0, live: 0 };
+                pages.push(page);
+                return page;
+            };
+
+            // Shelf packing: fill rows left to right, start a new row (or page) when full
+            const allocate = (w, h) => {
+                let page = pages.find((p) => p.ctx && !p.full);
+                if (!page) page = createPage();
+                if (page.x + w > page.width) {
+                    page.y += page.rowHeight + GAP;
+                    page.x = 0;
+                    page.rowHeight = 0;
+                }
+                if (page.y + h > page.height) {
+                    page.full = true;
+                    return allocate(w, h);
+                }
+                const rect = [page.x, page.y, w, h];
+                page.x += w + GAP;
+                page.rowHeight = Math.max(page.rowHeight, h);
+                return { page, rect };
+            };
+
+            const draw = (name) => {
+                const label = name || '';
+                const measure = (pages.find((p) => p.ctx) || createPage()).ctx;
+                measure.font = `bold ${FONT_SIZE}px Arial`;
+                const textWidth = Math.ceil(measure.measureText(label).width);
+                const w = Math.min(PAGE_SIZE, (textWidth + PADDING * 2) * DPI);
+                const h = (FONT_SIZE + PADDING * 2) * DPI;
+                const { page, rect } = allocate(w, h);
+                const ctx = page.ctx;
+
+                ctx.save();
+                ctx.clearRect(rect[0], rect[1], w, h);
+                ctx.translate(rect[0], rect[1]);
+                ctx.scale(DPI, DPI);
+                // Background rounded rect with semi-transparency
+                const bw = textWidth + PADDING * 2;
+                const bh = FONT_SIZE + PADDING * 2;
+                ctx.beginPath();
+                ctx.moveTo(RADIUS, 0);
+                ctx.arcTo(bw, 0, bw, bh, RADIUS);
+                ctx.arcTo(bw, bh, 0, bh, RADIUS);
+                ctx.arcTo(0, bh, 0, 0, RADIUS);
+                ctx.arcTo(0, 0, bw, 0, RADIUS);
+                ctx.closePath();
+                ctx.fillStyle = 'rgba(0,0,0,0.6)';
+                ctx.fill();
+                // Text
+                ctx.fillStyle = '#ffffff';
+                ctx.textBaseline = 'top';
+                ctx.textAlign = 'left';
+                ctx.font = `bold ${FONT_SIZE}px Arial`;
+                ctx.fillText(label, PADDING, PADDING);
+                ctx.restore();
+
+                // Uploads are coalesced: every label drawn before the next render shares one upload
+                page.texture.needsUpdate = true;
+                return { page, rect, widthUnits: bw / FONT_SIZE, users: 0 };
+            };
+
+            const releasePage = (page) => {
+                page.live--;
+                if (page.live > 0) return;
+                page.texture.dispose();
+                pages.splice(pages.indexOf(page), 1);
+            };
+
+            // Returns { tex, widthUnits }; pair every acquire with a release
+            const acquire = (name) => {
+                const key = name || '';
+                let entry = labels.get(key);
+                if (!entry) {
+                    entry = draw(key);
+                    entry.page.live++;
+                    labels.set(key, entry);
+                }
+                entry.users++;
+                const { page, rect } = entry;
+                const tex = page.texture.clone();
+                tex.offset.set(rect[0] / page.width, 1 - (rect[1] + rect[3]) / page.height);
+                tex.repeat.set(rect[2] / page.width, rect[3] / page.height);
+                return { name: key, tex, widthUnits: entry.widthUnits };
+            };
+
+            const release = (label) => {
+                if (!label) return;
+                label.tex.dispose();
+                const entry = labels.get(label.name);
+                if (!entry || --entry.users > 0) return;
+                labels.delete(label.name);
+                releasePage(entry.page);
+            };
+
+            // Use a server pre-baked atlas (see backend app_notes/labelAtlas.py) for its names.
+            // Returns a function that unregisters it again.
+            const register = (atlas) => {
+                if (!atlas || !atlas.image || !atlas.labels) return () => {};
+                const fresh = Object.keys(atlas.labels).filter((name) => !labels.has(name));
+                if (!fresh.length) return () => {};
+                const texture = new THREE.TextureLoader().load(atlas.image);
+                texture.minFilter = THREE.LinearFilter;
+                texture.generateMipmaps = false;
+                const page = { texture, width: atlas.width, height: atlas.height, live: 0 };
+                pages.push(page);
+                fresh.forEach((name) => {
+                    const rect = atlas.labels[name];
+                    const widthUnits = (rect[2] / rect[3]) * (atlas.font_size + atlas.padding * 2) / atlas.font_size;
+                    // Pinned by the registration itself until it is undone
+                    labels.set(name, { page, rect, widthUnits, users: 1 });
+                    page.live++;
+                });
+                return () => fresh.forEach((name) => {
+                    const entry = labels.get(name);
+                    if (!entry || --entry.users > 0) return;
+                    labels.delete(name);
+                    releasePage(entry.page);
+                });
+            };
+
+            // React helper: acquires the label for name and releases it on change or unmount
+            const useLabel = (name, enabled = true) => {
+                const [label, setLabel] = React.useState(null);
+                React.useEffect(() => {
+                    if (!enabled) { setLabel(null); return; }
+                    const acquired = acquire(name);
+                    setLabel(acquired);
+                    return () => release(acquired);
+                }, [name, enabled]);
+                return label;
+            };
+
+            globalThis.MindLabels = { acquire, release, register, useLabel };
+        }
+        """
+    )
+
 
 def _mental_sphere_js() -> str:
     return (
         """
         // Define MentalSphere once and register globally
         if (!globalThis.MentalSphere) {
-            const MentalSphere = ({ name, detail, color, position = [0, 0, 0], scale = 1.0, index = 0, allSpheres = [], containerRadius = 3.0, onSelect }) => {
+            // Position is driven by the parent Mind writing straight into the group matrix (bodyRef),
+            // so a sphere only re-renders when its own props or hover state change.
+            const MentalSphere = ({ name, detail, color, position, scale = 1.0, bodyRef, onHover, onSelect }) => {
                 const groupRef = useRef();
                 const [hovered, setHovered] = useState(false);
-                const { camera } = useThree();
-                const initialPos = useRef(position);
-                const velocityRef = useRef([
-                    (Math.random() - 0.5) * 0.15,
-                    (Math.random() - 0.5) * 0.15,
-                    (Math.random() - 0.5) * 0.15
-                ]);
-                const currentPosRef = useRef([...position]);
-
-                // Build a billboarded label texture for the sphere name
-                const labelTex = useMemo(() => {
-                    const label = name || '';
-                    const canvas = document.createElement('canvas');
-                    const ctx = canvas.getContext('2d');
-                    if (!ctx) return null;
-
-                    const fontSize = 160;
-                    const padding = 28;
-                    ctx.font = `bold ${fontSize}px Arial`;
-                    const metrics = ctx.measureText(label);
-                    const textWidth = Math.ceil(metrics.width);
-
-                    // High-DPI canvas for crisper texture
-                    const dpi = 2;
-                    canvas.width = (textWidth + padding * 2) * dpi;
-                    canvas.height = (fontSize + padding * 2) * dpi;
-                    ctx.scale(dpi, dpi);
-
-                    // Background rounded rect with semi-transparency
-                    const drawRoundedRect = (x, y, w, h, r) => {
-                        ctx.beginPath();
-                        ctx.moveTo(x + r, y);
-                        ctx.arcTo(x + w, y, x + w, y + h, r);
-                        ctx.arcTo(x + w, y + h, x, y + h, r);
-                        ctx.arcTo(x, y + h, x, y, r);
-                        ctx.arcTo(x, y, x + w, y, r);
-                        ctx.closePath();
-                    };
-                    ctx.fillStyle = 'rgba(0,0,0,0.6)';
-                    drawRoundedRect(0, 0, textWidth + padding * 2, fontSize + padding * 2, 12);
-                    ctx.fill();
 
-                    // Text
-                    ctx.fillStyle = '#ffffff';
-                    ctx.textBaseline = 'top';
-                    ctx.textAlign = 'left';
-                    ctx.font = `bold ${fontSize}px Arial`;
-                    ctx.fillText(label, padding, padding);
+                // Billboarded name label from the shared atlas, released when the sphere is removed
+                const labelTex = globalThis.MindLabels.useLabel(name);
+                const { sphereSegments } = globalThis.MindQuality.useLevel();
 
-                    const tex = new THREE.CanvasTexture(canvas);
-                    tex.needsUpdate = true;
-                    tex.minFilter = THREE.LinearFilter;
-                    return { tex, widthUnits: (textWidth + padding * 2) / fontSize };
-                }, [name]);
+                const setGroup = React.useCallback((obj) => {
+                    groupRef.current = obj;
+                    if (bodyRef) bodyRef(obj);
+                }, [bodyRef]);
 
-                // Update initial position when prop changes
-                useEffect(() => {
-                    initialPos.current = position;
-                    currentPosRef.current = [...position];
+                // Standalone use: place the sphere from its position prop
+                React.useLayoutEffect(() => {
+                    if (!groupRef.current || !position) return;
+                    groupRef.current.matrix.setPosition(position[0], position[1], position[2]);
+                    groupRef.current.matrixWorldNeedsUpdate = true;
                 }, [position]);
 
-                useFrame(() => {
-                    if (!groupRef.current) return;
-
-                    // Update position from parent component
-                    currentPosRef.current = [...position];
-                    groupRef.current.position.set(...currentPosRef.current);
-                });
-
                 return (
-                    <group ref={groupRef} position={position}>
+                    <group ref={setGroup} matrixAutoUpdate={false}>
                         {labelTex && (
                             <sprite position={[0, scale + 0.02, 0]} scale={[Math.max(0.15, labelTex.widthUnits * 0.15), 0.25, 0.25]} renderOrder={1000}>
                                 <spriteMaterial attach="material" map={labelTex.tex} transparent depthTest={false} depthWrite={false} />
                             </sprite>
                         )}
                         <mesh
-                            onPointerEnter={() => setHovered(true)}
+                            onPointerEnter={() => {
+                                setHovered(true);
+                                if (onHover) onHover();
+                            }}
                             onPointerLeave={() => setHovered(false)}
+                            userData={{ collider: false }}
+                            onClick={(e) => {
+                                e.stopPropagation();
+                                if (onSelect) onSelect({ name, detail, color });
+                            }}
                             castShadow
                         >
-                            <sphereGeometry args={[scale, 32, 32]} />
+                            <sphereGeometry args={[scale, sphereSegments, sphereSegments]} />
                             <meshStandardMaterial
                                 color={color}
                                 emissive={hovered ? color : '#000000'}
@@ -107,6 +230,660 @@ def _mental_sphere_js() -> str:
         """
     )
 
+
+def _mind_broad_phase_js() -> str:
+    return (
+        """
+        // Uniform-grid broad phase shared by every Mind (same grid as backend app_notes/mindPhysics.py)
+        if (!globalThis.MindBroadPhase) {
+            const NEIGHBOUR_OFFSETS = new Int8Array(27 * 3);
+            let n = 0;
+            for (let dx = -1; dx <= 1; dx++) {
+                for (let dy = -1; dy <= 1; dy++) {
+                    for (let dz = -1; dz <= 1; dz++) {
+                        NEIGHBOUR_OFFSETS[n++] = dx;
+                        NEIGHBOUR_OFFSETS[n++] = dy;
+                        NEIGHBOUR_OFFSETS[n++] = dz;
+                    }
+                }
+            }
+
+            class MindBroadPhase {
+                constructor() {
+                    this.capacity = 0;
+                    this.tableSize = 0;
+                    this.visited = new Int32Array(27);
+                }
+
+                reserve(count) {
+                    if (count <= this.capacity) return;
+                    this.capacity = Math.max(16, count * 2);
+                    let size = 16;
+                    while (size < this.capacity * 2) size <<= 1;
+                    this.tableSize = size;
+                    this.cellStart = new Int32Array(size + 1);
+                    this.cellEntries = new Int32Array(this.capacity);
+                    this.cellCoords = new Int32Array(this.capacity * 3);
+                    this.bucketOf = new Int32Array(this.capacity);
+                }
+
+                hash(ix, iy, iz) {
+                    return (Math.imul(ix, 73856093) ^ Math.imul(iy, 19349663) ^ Math.imul(iz, 83492791)) & (this.tableSize - 1);
+                }
+
+                // Calls onPair(context, i, j) once for every pair (i < j) in the same or neighbouring cells.
+                // positions is flat [x0, y0, z0, x1, ...]; cellSize should be the largest sphere diameter.
+                forEachPair(positions, count, cellSize, onPair, context) {
+                    this.reserve(count);
+                    const { cellStart, cellEntries, cellCoords, bucketOf, visited, tableSize } = this;
+                    const inv = 1 / cellSize;
+
+                    // Counting sort of spheres into hashed cells
+                    cellStart.fill(0);
+                    for (let i = 0; i < count; i++) {
+                        const ix = Math.floor(positions[i * 3] * inv);
+                        const iy = Math.floor(positions[i * 3 + 1] * inv);
+                        const iz = Math.floor(positions[i * 3 + 2] * inv);
+                        cellCoords[i * 3] = ix;
+                        cellCoords[i * 3 + 1] = iy;
+                        cellCoords[i * 3 + 2] = iz;
+                        const h = this.hash(ix, iy, iz);
+                        bucketOf[i] = h;
+                        cellStart[h]++;
+                    }
+                    let running = 0;
+                    for (let h = 0; h < tableSize; h++) {
+                        running += cellStart[h];
+                        cellStart[h] = running;
+                    }
+                    cellStart[tableSize] = count;
+                    for (let i = 0; i < count; i++) {
+                        cellEntries[--cellStart[bucketOf[i]]] = i;
+                    }
+
+                    // Visit the 27 neighbouring buckets once each (hash collisions can repeat a bucket)
+                    for (let i = 0; i < count; i++) {
+                        const ix = cellCoords[i * 3];
+                        const iy = cellCoords[i * 3 + 1];
+                        const iz = cellCoords[i * 3 + 2];
+                        let seen = 0;
+                        for (let o = 0; o < 27 * 3; o += 3) {
+                            const h = this.hash(ix + NEIGHBOUR_OFFSETS[o], iy + NEIGHBOUR_OFFSETS[o + 1], iz + NEIGHBOUR_OFFSETS[o + 2]);
+                            let repeated = false;
+                            for (let k = 0; k < seen; k++) {
+                                if (visited[k] === h) { repeated = true; break; }
+                            }
+                            if (repeated) continue;
+                            visited[seen++] = h;
+                            for (let e = cellStart[h], end = cellStart[h + 1]; e < end; e++) {
+                                const j = cellEntries[e];
+                                if (j > i) onPair(context, i, j);
+                            }
+                        }
+                    }
+                }
+            }
+            globalThis.MindBroadPhase = MindBroadPhase;
+        }
+        """
+    )
+
+
+def _mind_physics_js() -> str:
+    return (
+        """
+        // Mind sphere physics on flat typed arrays, shared by every Mind (mirrors backend app_notes/mindPhysics.py)
+        if (!globalThis.MindPhysics) {
+            const DEFAULT_RADIUS = 0.8;
+            const MAX_SPEED = 0.6;
+            const RESTITUTION = 0.7;
+            const WALL_DAMPING = 0.8;
+            const CONTACT_DAMPING = 0.9;
+            // Random drift and sleeping; see configure()
+            const DEFAULT_OPTIONS = {
+                driftChance: 0.05,
+                driftStrength: 0.04,
+                sleepSpeed: 0.01,
+                sleepSteps: 60,
+            };
+
+            const createWorld = (options = {}) => ({
+                count: 0,
+                capacity: 0,
+                positions: new Float32Array(0),
+                velocities: new Float32Array(0),
+                radii: new Float32Array(0),
+                // Per body: 1 while simulated, 0 once asleep; calm counts consecutive slow steps
+                awake: new Uint8Array(0),
+                calm: new Uint16Array(0),
+                awakeCount: 0,
+                grid: new globalThis.MindBroadPhase(),
+                ...DEFAULT_OPTIONS,
+                ...options,
+            });
+
+            // Update drift/sleep settings; undefined values keep the current ones
+            const configure = (world, options) => {
+                Object.keys(DEFAULT_OPTIONS).forEach((key) => {
+                    if (options[key] !== undefined && options[key] !== null) world[key] = options[key];
+                });
+                if (!world.sleepSteps) wake(world, -1);
+            };
+
+            const grow = (array, size) => {
+                const next = new array.constructor(size);
+                next.set(array.subarray(0, Math.min(array.length, size)));
+                return next;
+            };
+
+            const reserve = (world, count) => {
+                if (count <= world.capacity) return;
+                const capacity = Math.max(16, count * 2);
+                world.positions = grow(world.positions, capacity * 3);
+                world.velocities = grow(world.velocities, capacity * 3);
+                world.radii = grow(world.radii, capacity);
+                world.awake = grow(world.awake, capacity);
+                world.calm = grow(world.calm, capacity);
+                world.capacity = capacity;
+            };
+
+            // Wake one body, or every body when index is negative
+            const wake = (world, index) => {
+                const from = index < 0 ? 0 : index;
+                const to = index < 0 ? world.count : Math.min(index + 1, world.count);
+                for (let i = from; i < to; i++) {
+                    world.calm[i] = 0;
+                    if (!world.awake[i]) {
+                        world.awake[i] = 1;
+                        world.awakeCount++;
+                    }
+                }
+            };
+
+            // Resize to radii.length bodies; new bodies start at random points within 60% of the container
+            const syncBodies = (world, radii, containerRadius) => {
+                const count = radii.length;
+                reserve(world, count);
+                const p = world.positions;
+                const v = world.velocities;
+                for (let i = world.count; i < count; i++) {
+                    const theta = Math.random() * Math.PI * 2;
+                    const phi = Math.random() * Math.PI;
+                    const r = Math.random() * containerRadius * 0.6;
+                    p[i * 3] = r * Math.sin(phi) * Math.cos(theta);
+                    p[i * 3 + 1] = r * Math.cos(phi);
+                    p[i * 3 + 2] = r * Math.sin(phi) * Math.sin(theta);
+                    v[i * 3] = (Math.random() - 0.5) * 0.08;
+                    v[i * 3 + 1] = (Math.random() - 0.5) * 0.08;
+                    v[i * 3 + 2] = (Math.random() - 0.5) * 0.08;
+                }
+                for (let i = 0; i < count; i++) {
+                    world.radii[i] = radii[i] || DEFAULT_RADIUS;
+                }
+                world.count = count;
+                // The set or the container changed: everything gets simulated again until it settles.
+                // Set the flags directly; wake() only counts bodies that were asleep
+                for (let i = 0; i < count; i++) {
+                    world.awake[i] = 1;
+                    world.calm[i] = 0;
+                }
+                world.awakeCount = count;
+            };
+
+            // Sphere-to-sphere collision response for one candidate pair
+            const resolvePair = (world, i, j) => {
+                const p = world.positions;
+                const v = world.velocities;
+                const dx = p[j * 3] - p[i * 3];
+                const dy = p[j * 3 + 1] - p[i * 3 + 1];
+                const dz = p[j * 3 + 2] - p[i * 3 + 2];
+                const distance = Math.sqrt(dx * dx + dy * dy + dz * dz);
+                const minDistance = world.radii[i] + world.radii[j];
+                if (distance >= minDistance || distance <= 0) return;
+
+                // Resting contacts between sleepers stay asleep; an awake body hitting a sleeper wakes it
+                if (!world.awake[i] && !world.awake[j]) return;
+                if (!world.awake[i]) wake(world, i);
+                if (!world.awake[j]) wake(world, j);
+
+                // Separate spheres to prevent overlap
+                const nx = dx / distance;
+                const ny = dy / distance;
+                const nz = dz / distance;
+                const separation = (minDistance - distance) * 0.5;
+                p[i * 3] -= nx * separation;
+                p[i * 3 + 1] -= ny * separation;
+                p[i * 3 + 2] -= nz * separation;
+                p[j * 3] += nx * separation;
+                p[j * 3 + 1] += ny * separation;
+                p[j * 3 + 2] += nz * separation;
+
+                // Don't resolve if velocities are separating
+                const velAlongNormal =
+                    (v[j * 3] - v[i * 3]) * nx +
+                    (v[j * 3 + 1] - v[i * 3 + 1]) * ny +
+                    (v[j * 3 + 2] - v[i * 3 + 2]) * nz;
+                if (velAlongNormal > 0) return;
+
+                // Equal-mass impulse with restitution, then damping to prevent infinite bouncing
+                const impulseScalar = -(1 + RESTITUTION) * velAlongNormal / 2;
+                v[i * 3] = (v[i * 3] - impulseScalar * nx) * CONTACT_DAMPING;
+                v[i * 3 + 1] = (v[i * 3 + 1] - impulseScalar * ny) * CONTACT_DAMPING;
+                v[i * 3 + 2] = (v[i * 3 + 2] - impulseScalar * nz) * CONTACT_DAMPING;
+                v[j * 3] = (v[j * 3] + impulseScalar * nx) * CONTACT_DAMPING;
+                v[j * 3 + 1] = (v[j * 3 + 1] + impulseScalar * ny) * CONTACT_DAMPING;
+                v[j * 3 + 2] = (v[j * 3 + 2] + impulseScalar * nz) * CONTACT_DAMPING;
+            };
+
+            // Advance one tick; returns the number of bodies still awake (0 means the step was skipped)
+            const step = (world, dt, containerRadius, broadPhase = true) => {
+                if (world.awakeCount === 0) return 0;
+                const { count, positions: p, velocities: v, radii, awake, calm } = world;
+                const { driftChance, driftStrength, sleepSteps } = world;
+                const sleepSpeedSq = world.sleepSpeed * world.sleepSpeed;
+                let maxRadius = 0;
+
+                for (let i = 0; i < count; i++) {
+                    const o = i * 3;
+                    const maxDist = containerRadius - radii[i];
+                    maxRadius = Math.max(maxRadius, radii[i]);
+                    if (!awake[i]) continue;
+
+                    // Add some random movement
+                    if (driftChance > 0 && Math.random() < driftChance) {
+                        v[o] += (Math.random() - 0.5) * driftStrength;
+                        v[o + 1] += (Math.random() - 0.5) * driftStrength;
+                        v[o + 2] += (Math.random() - 0.5) * driftStrength;
+                    }
+
+                    // Clamp velocity and integrate
+                    v[o] = Math.max(-MAX_SPEED, Math.min(MAX_SPEED, v[o]));
+                    v[o + 1] = Math.max(-MAX_SPEED, Math.min(MAX_SPEED, v[o + 1]));
+                    v[o + 2] = Math.max(-MAX_SPEED, Math.min(MAX_SPEED, v[o + 2]));
+                    p[o] += v[o] * dt;
+                    p[o + 1] += v[o + 1] * dt;
+                    p[o + 2] += v[o + 2] * dt;
+
+                    // Container boundary: push back inside, reflect and damp
+                    const dist = Math.sqrt(p[o] * p[o] + p[o + 1] * p[o + 1] + p[o + 2] * p[o + 2]);
+                    if (dist > maxDist) {
+                        const nx = p[o] / dist;
+                        const ny = p[o + 1] / dist;
+                        const nz = p[o + 2] / dist;
+                        p[o] = nx * maxDist;
+                        p[o + 1] = ny * maxDist;
+                        p[o + 2] = nz * maxDist;
+                        const dot = v[o] * nx + v[o + 1] * ny + v[o + 2] * nz;
+                        v[o] = (v[o] - 2 * dot * nx) * WALL_DAMPING;
+                        v[o + 1] = (v[o + 1] - 2 * dot * ny) * WALL_DAMPING;
+                        v[o + 2] = (v[o + 2] - 2 * dot * nz) * WALL_DAMPING;
+                    }
+
+                    // Put the body to sleep after sleepSteps consecutive slow steps
+                    if (sleepSteps > 0) {
+                        const speedSq = v[o] * v[o] + v[o + 1] * v[o + 1] + v[o + 2] * v[o + 2];
+                        if (speedSq >= sleepSpeedSq) {
+                            calm[i] = 0;
+                        } else if (++calm[i] >= sleepSteps) {
+                            awake[i] = 0;
+                            v[o] = 0;
+                            v[o + 1] = 0;
+                            v[o + 2] = 0;
+                            world.awakeCount--;
+                        }
+                    }
+                }
+
+                if (broadPhase) {
+                    // Uniform grid: only spheres in the same or neighbouring cells are tested
+                    world.grid.forEachPair(p, count, maxRadius * 2, resolvePair, world);
+                } else {
+                    for (let i = 0; i < count; i++) {
+                        for (let j = i + 1; j < count; j++) {
+                            resolvePair(world, i, j);
+                        }
+                    }
+                }
+                return world.awakeCount;
+            };
+
+            globalThis.MindPhysics = { createWorld, configure, reserve, syncBodies, wake, step };
+        }
+        """
+    )
+
+
+def _mind_worker_loop_js() -> str:
+    return (
+        """
+        // Runs inside the physics worker: steps every registered Mind at its own fixed tick rate
+        const worlds = new Map();
+        const MAX_CATCH_UP = 5;
+        const HEADER_BYTES = 32;
+        let timer = null;
+
+        const clock = () => performance.timeOrigin + performance.now();
+
+        // Shared mode: seqlock header [seq, count] | tick time | step ms, then positions
+        const ensureShared = (id, entry) => {
+            const bytes = HEADER_BYTES + entry.world.capacity * 12;
+            if (entry.shared && entry.shared.byteLength >= bytes) return;
+            entry.shared = new SharedArrayBuffer(bytes);
+            entry.header = new Int32Array(entry.shared, 0, 2);
+            entry.time = new Float64Array(entry.shared, 8, 1);
+            entry.meta = new Float32Array(entry.shared, 16, 2);
+            entry.data = new Float32Array(entry.shared, HEADER_BYTES);
+            self.postMessage({ type: 'buffer', id, buffer: entry.shared });
+        };
+
+        const publish = (id, entry) => {
+            const { world } = entry;
+            const n = world.count * 3;
+            if (entry.useShared) {
+                ensureShared(id, entry);
+                Atomics.add(entry.header, 0, 1); // odd: write in progress
+                entry.header[1] = world.count;
+                entry.time[0] = clock();
+                entry.meta[0] = entry.stepMs;
+                entry.meta[1] = world.awakeCount;
+                for (let k = 0; k < n; k++) entry.data[k] = world.positions[k];
+                Atomics.add(entry.header, 0, 1);
+                return;
+            }
+
+            // Transfer mode: ping-pong buffers the main thread hands back after use
+            let out = null;
+            while (entry.spare.length) {
+                const candidate = entry.spare.pop();
+                if (candidate.length >= n) { out = candidate; break; }
+            }
+            if (!out) out = new Float32Array(Math.max(world.capacity * 3, 3));
+            for (let k = 0; k < n; k++) out[k] = world.positions[k];
+            self.postMessage(
+                { type: 'frame', id, count: world.count, awake: world.awakeCount, time: clock(), stepMs: entry.stepMs, positions: out },
+                [out.buffer]
+            );
+        };
+
+        const loop = () => {
+            timer = null;
+            const now = performance.now();
+            let nextDue = Infinity;
+            for (const [id, entry] of worlds) {
+                entry.accumulator += Math.min(now - entry.last, 250);
+                entry.last = now;
+                if (entry.accumulator >= entry.tickMs) {
+                    const start = performance.now();
+                    let steps = 0;
+                    while (entry.accumulator >= entry.tickMs && steps < MAX_CATCH_UP) {
+                        globalThis.MindPhysics.step(entry.world, entry.tickMs / 1000, entry.containerRadius, entry.broadPhase);
+                        entry.accumulator -= entry.tickMs;
+                        steps++;
+                    }
+                    // Drop the backlog after a long stall instead of fast-forwarding
+                    if (entry.accumulator >= entry.tickMs) entry.accumulator = 0;
+                    entry.stepMs = (performance.now() - start) / steps;
+                    // A sleeping world publishes its final positions once, then stays quiet until woken
+                    const idle = entry.world.awakeCount === 0;
+                    if (!idle || !entry.idlePublished) publish(id, entry);
+                    entry.idlePublished = idle;
+                }
+                nextDue = Math.min(nextDue, entry.tickMs - entry.accumulator);
+            }
+            if (worlds.size) timer = setTimeout(loop, Math.max(0, nextDue));
+        };
+
+        const schedule = () => {
+            if (timer === null && worlds.size) timer = setTimeout(loop, 0);
+        };
+
+        self.onmessage = (event) => {
+            const msg = event.data;
+            const entry = worlds.get(msg.id);
+            switch (msg.type) {
+                case 'add':
+                    worlds.set(msg.id, {
+                        world: globalThis.MindPhysics.createWorld(msg.options),
+                        containerRadius: 3.0,
+                        broadPhase: msg.broadPhase,
+                        tickMs: 1000 / msg.tickRate,
+                        useShared: msg.useShared,
+                        accumulator: 0,
+                        last: performance.now(),
+                        stepMs: 0,
+                        spare: [],
+                        shared: null,
+                    });
+                    break;
+                case 'sync':
+                    if (!entry) break;
+                    entry.containerRadius = msg.containerRadius;
+                    globalThis.MindPhysics.syncBodies(entry.world, msg.radii, msg.containerRadius);
+                    break;
+                case 'configure':
+                    if (!entry) break;
+                    entry.broadPhase = msg.broadPhase;
+                    entry.tickMs = 1000 / msg.tickRate;
+                    globalThis.MindPhysics.configure(entry.world, msg.options);
+                    break;
+                case 'wake':
+                    if (entry) globalThis.MindPhysics.wake(entry.world, msg.index);
+                    break;
+                case 'return':
+                    if (entry) entry.spare.push(msg.positions);
+                    break;
+                case 'remove':
+                    worlds.delete(msg.id);
+                    break;
+            }
+            schedule();
+        };
+        """
+    )
+
+
+def _mind_simulation_js() -> str:
+    worker_source = _mind_broad_phase_js() + _mind_physics_js() + _mind_worker_loop_js()
+    return (
+        """
+        // Main-thread handle for one Mind's simulation. All Minds on a page share one physics worker;
+        // without Worker support the same fixed-tick loop runs on the main thread instead.
+        if (!globalThis.MindSimulation) {
+            const WORKER_SOURCE = """ + json.dumps(worker_source) + """;
+            const HEADER_BYTES = 32;
+            const handles = new Map();
+            let worker = null;
+            let workerUrl = null;
+            let nextId = 1;
+
+            const clock = () => performance.timeOrigin + performance.now();
+            // SharedArrayBuffer needs a cross-origin isolated page (COOP/COEP headers)
+            const canShare = () => typeof SharedArrayBuffer !== 'undefined' && globalThis.crossOriginIsolated === true;
+
+            const acquireWorker = () => {
+                if (worker) return worker;
+                if (typeof Worker === 'undefined') return null;
+                try {
+                    workerUrl = URL.createObjectURL(new Blob([WORKER_SOURCE], { type: 'text/javascript' }));
+                    worker = new Worker(workerUrl);
+                    worker.onmessage = (event) => {
+                        const handle = handles.get(event.data.id);
+                        if (handle) handle.receive(event.data);
+                    };
+                    worker.onerror = (e) => console.warn('Mind physics worker error', e.message || e);
+                } catch (e) {
+                    console.warn('Mind physics worker unavailable, simulating on the main thread', e);
+                    worker = null;
+                }
+                return worker;
+            };
+
+            const releaseWorker = () => {
+                if (!worker || handles.size) return;
+                worker.terminate();
+                URL.revokeObjectURL(workerUrl);
+                worker = null;
+                workerUrl = null;
+            };
+
+            const ensureCapacity = (array, size) => (array.length >= size ? array : new Float32Array(size));
+
+            class MindSimulation {
+                constructor({ broadPhase = true, tickRate = 60, useWorker = true, ...options } = {}) {
+                    this.broadPhase = broadPhase;
+                    this.idle = false;
+                    this.tickMs = 1000 / tickRate;
+                    this.count = 0;
+                    this.prevCount = 0;
+                    this.prev = new Float32Array(0);
+                    this.curr = new Float32Array(0);
+                    this.currTime = 0;
+                    this.stepMs = 0;
+                    this.worker = useWorker ? acquireWorker() : null;
+                    if (this.worker) {
+                        this.id = nextId++;
+                        this.useShared = canShare();
+                        this.seq = 0;
+                        this.scratch = new Float32Array(0);
+                        handles.set(this.id, this);
+                        this.worker.postMessage({ type: 'add', id: this.id, broadPhase, tickRate, options, useShared: this.useShared });
+                    } else {
+                        this.world = globalThis.MindPhysics.createWorld(options);
+                        this.containerRadius = 3.0;
+                        this.accumulator = 0;
+                        this.last = performance.now();
+                    }
+                }
+
+                sync(radii, containerRadius) {
+                    if (this.worker) {
+                        this.worker.postMessage({ type: 'sync', id: this.id, radii, containerRadius });
+                    } else {
+                        this.containerRadius = containerRadius;
+                        globalThis.MindPhysics.syncBodies(this.world, radii, containerRadius);
+                    }
+                }
+
+                // Options: driftChance, driftStrength, sleepSpeed, sleepSteps (0 disables sleeping)
+                configure({ broadPhase = true, tickRate = 60, ...options }) {
+                    this.broadPhase = broadPhase;
+                    this.tickMs = 1000 / tickRate;
+                    if (this.worker) {
+                        this.worker.postMessage({ type: 'configure', id: this.id, broadPhase, tickRate, options });
+                    } else {
+                        globalThis.MindPhysics.configure(this.world, options);
+                    }
+                }
+
+                // Wake a sleeping body after user interaction; a negative index wakes all
+                wake(index) {
+                    this.idle = false;
+                    if (this.worker) {
+                        this.worker.postMessage({ type: 'wake', id: this.id, index });
+                    } else {
+                        globalThis.MindPhysics.wake(this.world, index);
+                    }
+                }
+
+                receive(msg) {
+                    if (msg.type === 'frame') {
+                        const spent = this.prev;
+                        this.prev = this.curr;
+                        this.prevCount = this.count;
+                        this.curr = msg.positions;
+                        this.count = msg.count;
+                        this.currTime = msg.time;
+                        this.stepMs = msg.stepMs;
+                        this.idle = msg.awake === 0;
+                        if (spent.length) this.worker.postMessage({ type: 'return', id: this.id, positions: spent }, [spent.buffer]);
+                    } else if (msg.type === 'buffer') {
+                        this.header = new Int32Array(msg.buffer, 0, 2);
+                        this.time = new Float64Array(msg.buffer, 8, 1);
+                        this.meta = new Float32Array(msg.buffer, 16, 2);
+                        this.data = new Float32Array(msg.buffer, HEADER_BYTES);
+                    }
+                }
+
+                // Copy the latest shared snapshot, retrying next frame if the worker was mid-write
+                poll() {
+                    if (!this.header) return;
+                    const seq = Atomics.load(this.header, 0);
+                    if (seq === this.seq || (seq & 1)) return;
+                    const count = this.header[1];
+                    const size = count * 3;
+                    const next = ensureCapacity(this.scratch, this.data.length);
+                    for (let k = 0; k < size; k++) next[k] = this.data[k];
+                    const time = this.time[0];
+                    const stepMs = this.meta[0];
+                    const awake = this.meta[1];
+                    this.scratch = next;
+                    if (Atomics.load(this.header, 0) !== seq) return;
+                    this.seq = seq;
+                    this.scratch = this.prev;
+                    this.prev = this.curr;
+                    this.prevCount = this.count;
+                    this.curr = next;
+                    this.count = count;
+                    this.currTime = time;
+                    this.stepMs = stepMs;
+                    this.idle = awake === 0;
+                }
+
+                // Fixed-tick stepping for the main-thread fallback
+                advance() {
+                    const now = performance.now();
+                    this.accumulator += Math.min(now - this.last, 250);
+                    this.last = now;
+                    const world = this.world;
+                    this.curr = world.positions;
+                    this.count = world.count;
+                    this.idle = world.awakeCount === 0;
+                    if (this.idle) {
+                        this.accumulator = 0;
+                        this.stepMs = 0;
+                        return 1;
+                    }
+                    if (this.accumulator >= this.tickMs) {
+                        const start = performance.now();
+                        let steps = 0;
+                        while (this.accumulator >= this.tickMs && steps < 5) {
+                            this.prev = ensureCapacity(this.prev, world.capacity * 3);
+                            for (let k = 0; k < world.count * 3; k++) this.prev[k] = world.positions[k];
+                            this.prevCount = world.count;
+                            globalThis.MindPhysics.step(world, this.tickMs / 1000, this.containerRadius, this.broadPhase);
+                            this.accumulator -= this.tickMs;
+                            steps++;
+                        }
+                        if (this.accumulator >= this.tickMs) this.accumulator = 0;
+                        this.stepMs = (performance.now() - start) / steps;
+                    }
+                    this.curr = world.positions;
+                    this.count = world.count;
+                    return this.accumulator / this.tickMs;
+                }
+
+                // Bring the snapshots up to date; returns the blend factor from prev to curr
+                update() {
+                    if (!this.worker) return this.advance();
+                    if (this.useShared) this.poll();
+                    if (!this.count) return 1;
+                    return Math.min(1, Math.max(0, (clock() - this.currTime) / this.tickMs));
+                }
+
+                dispose() {
+                    if (!this.worker) return;
+                    this.worker.postMessage({ type: 'remove', id: this.id });
+                    handles.delete(this.id);
+                    releaseWorker();
+                }
+            }
+
+            globalThis.MindSimulation = MindSimulation;
+        }
+        """
+    )
+
+
 class MentalSphere(rx.Component):
     """Single floating sphere inside the mind container."""
     tag = "MentalSphere"
@@ -119,6 +896,8 @@ class MentalSphere(rx.Component):
 
     def add_custom_code(self) -> list[str]:
         return [
+            quality_js(),
+            _mind_label_js(),
             _mental_sphere_js()
         ]
 
@@ -137,10 +916,30 @@ class Mind(rx.Component):
     glass_transmission: rx.Var[float] = 0.9
     glass_thickness: rx.Var[float] = 0.4
     glass_roughness: rx.Var[float] = 0.05
+    broad_phase: rx.Var[bool] = True
+    # Physics steps per second, independent of the display refresh rate
+    tick_rate: rx.Var[int] = 60
+    use_worker: rx.Var[bool] = True
+    # Draw all spheres with one InstancedMesh (one draw call) instead of a mesh per sphere
+    instanced: rx.Var[bool] = False
+    # Optional pre-baked name atlas as returned by the backend get_mind_label_atlas endpoint
+    label_atlas: rx.Var[dict] = {}
+    # Random drift: chance per tick that a sphere gets a kick, and its size (0 turns drift off)
+    drift_chance: rx.Var[float] = 0.05
+    drift_strength: rx.Var[float] = 0.04
+    # Spheres slower than sleep_speed for sleep_ticks ticks stop being simulated (0 ticks: never sleep)
+    sleep_speed: rx.Var[float] = 0.01
+    sleep_ticks: rx.Var[int] = 60
 
     def add_custom_code(self) -> list[str]:
         return [
+            quality_js(),
+            _mind_label_js(),
             _mental_sphere_js(),
+            _mind_broad_phase_js(),
+            _mind_physics_js(),
+            _mind_simulation_js(),
+            asset_cache_js(),
             """
             export const Mind = ({
                 mentalSpheres = [],
@@ -152,55 +951,109 @@ class Mind(rx.Component):
                 glassTransmission = 0.9,
                 glassThickness = 0.4,
                 glassRoughness = 0.05,
+                broadPhase = true,
+                tickRate = 60,
+                useWorker = true,
+                instanced = false,
+                labelAtlas = null,
+                driftChance = 0.05,
+                driftStrength = 0.04,
+                sleepSpeed = 0.01,
+                sleepTicks = 60,
             }) => {
-                const [positions, setPositions] = useState([]);
-                const [velocities, setVelocities] = useState([]);
                 const [selected, setSelected] = useState(null);
                 const [centerPopupTex, setCenterPopupTex] = useState(null);
                 const overlayRef = useRef();
+                // Scratch vectors for placing the overlay each frame
+                const overlayForward = useMemo(() => new THREE.Vector3(), []);
+                const overlayDown = useMemo(() => new THREE.Vector3(), []);
+                // Simulation runs at a fixed tick rate (in a worker when available); React only re-renders when the sphere set changes
+                const simulation = useRef(null);
+                const bodyObjects = useRef([]);
+                // Set once the final positions of a fully asleep mind have been written
+                const idleWritten = useRef(false);
+                const instancesRef = useRef();
+                const hoverLabelRef = useRef();
+                const [hovered, setHovered] = useState(null);
                 const MentalSphereComp = globalThis.MentalSphere;
 
-                // Optional glass texture
-                const glassMap = useMemo(() => {
-                    if (!glassTexture) return null;
-                    try {
-                        const loader = new THREE.TextureLoader();
-                        const tex = loader.load(glassTexture);
-                        return tex;
-                    } catch (e) {
-                        console.warn('Failed to load glass texture', glassTexture, e);
-                        return null;
-                    }
-                }, [glassTexture]);
+                // Optional glass texture, from the shared asset cache with TextureLoader's defaults
+                const glassMap = globalThis.MindAssets.useTexture(glassTexture, { flipY: true, colorSpace: THREE.NoColorSpace });
+                // Lower quality levels draw the glass as plain transparency (no transmission pass) and use
+                // coarser spheres
+                const quality = globalThis.MindQuality.useLevel();
+
+                const physicsOptions = { driftChance, driftStrength, sleepSpeed, sleepSteps: sleepTicks };
+                const { invalidate } = useThree();
+                const wakeSphere = (index) => {
+                    if (simulation.current) simulation.current.wake(index);
+                    idleWritten.current = false;
+                    invalidate();
+                };
 
-                // Initialize random starting positions and velocities
                 useEffect(() => {
-                    if (mentalSpheres.length > positions.length) {
-                        // Add positions for newly added spheres
-                        const newPositions = [...positions];
-                        const newVelocities = [...velocities];
-                        
-                        for (let i = positions.length; i < mentalSpheres.length; i++) {
-                            const theta = Math.random() * Math.PI * 2;
-                            const phi = Math.random() * Math.PI;
-                            const r = Math.random() * containerRadius * 0.6; // Start closer to center
-                            newPositions.push([
-                                r * Math.sin(phi) * Math.cos(theta),
-                                r * Math.cos(phi),
-                                r * Math.sin(phi) * Math.sin(theta)
-                            ]);
-                            
-                            newVelocities.push([
-                                (Math.random() - 0.5) * 0.08,
-                                (Math.random() - 0.5) * 0.08,
-                                (Math.random() - 0.5) * 0.08
-                            ]);
-                        }
-                        
-                        setPositions(newPositions);
-                        setVelocities(newVelocities);
-                    }
-                }, [mentalSpheres, containerRadius, positions.length]);
+                    const sim = new globalThis.MindSimulation({ broadPhase, tickRate, useWorker, ...physicsOptions });
+                    simulation.current = sim;
+                    return () => {
+                        sim.dispose();
+                        simulation.current = null;
+                    };
+                }, [useWorker]);
+
+                // Add bodies at random starting positions for new spheres, drop bodies of removed ones
+                useEffect(() => {
+                    if (!simulation.current) return;
+                    simulation.current.sync(
+                        mentalSpheres.map((sphere) => sphere.scale || 0.8),
+                        containerRadius
+                    );
+                    bodyObjects.current.length = mentalSpheres.length;
+                    idleWritten.current = false;
+                    invalidate();
+                }, [mentalSpheres, containerRadius, useWorker]);
+
+                useEffect(() => {
+                    if (simulation.current) simulation.current.configure({ broadPhase, tickRate, ...physicsOptions });
+                }, [broadPhase, tickRate, driftChance, driftStrength, sleepSpeed, sleepTicks]);
+
+                // Instance buffers grow in powers of two so adding a sphere rarely recreates the mesh
+                const capacity = useMemo(
+                    () => Math.max(16, 2 ** Math.ceil(Math.log2(Math.max(1, mentalSpheres.length)))),
+                    [mentalSpheres.length]
+                );
+                useEffect(() => { idleWritten.current = false; invalidate(); }, [instanced, capacity, hovered]);
+
+                // Per-instance scale and colour; positions are written every frame
+                React.useLayoutEffect(() => {
+                    const mesh = instancesRef.current;
+                    if (!instanced || !mesh) return;
+                    const m = mesh.instanceMatrix.array;
+                    const color = new THREE.Color();
+                    const white = new THREE.Color('#ffffff');
+                    mentalSpheres.forEach((sphere, i) => {
+                        const r = sphere.scale || 0.8;
+                        m[i * 16] = r;
+                        m[i * 16 + 5] = r;
+                        m[i * 16 + 10] = r;
+                        color.set(sphere.color);
+                        if (i === hovered) color.lerp(white, 0.3);
+                        mesh.setColorAt(i, color);
+                    });
+                    mesh.count = mentalSpheres.length;
+                    mesh.instanceMatrix.needsUpdate = true;
+                    if (mesh.instanceColor) mesh.instanceColor.needsUpdate = true;
+                    // Instances move every frame, so bound them by the container for culling and raycasting
+                    mesh.boundingSphere = new THREE.Sphere(new THREE.Vector3(), containerRadius);
+                }, [instanced, capacity, mentalSpheres, hovered, containerRadius]);
+
+                const hoveredSphere = instanced && hovered !== null ? mentalSpheres[hovered] : null;
+                const hoverLabel = globalThis.MindLabels.useLabel(
+                    hoveredSphere ? hoveredSphere.name : '',
+                    Boolean(hoveredSphere && hoveredSphere.name)
+                );
+
+                // Pre-baked labels must be registered before the spheres acquire theirs in passive effects
+                React.useLayoutEffect(() => globalThis.MindLabels.register(labelAtlas), [labelAtlas]);
 
                 // Build label texture for center popup when selected changes
                 useEffect(() => {
@@ -244,151 +1097,65 @@ class Mind(rx.Component):
                     setCenterPopupTex(tex);
                 }, [selected]);
 
-                // Collision detection and response
+                // Interpolate between the last two simulation ticks and write straight into each sphere's matrix
                 useFrame(() => {
-                    if (positions.length === 0 || velocities.length === 0) return;
-
-                    const newPositions = [...positions];
-                    const newVelocities = [...velocities];
-                    const dt = 0.016; // frame time
-                    const maxSpeed = 0.6;
-
-                    // Update positions and handle container collisions
-                    for (let i = 0; i < newPositions.length; i++) {
-                        const pos = newPositions[i];
-                        const vel = newVelocities[i];
-                        const radius = mentalSpheres[i].scale || 0.8;
-                        const maxRadius = containerRadius - radius;
-
-                        // Add some random movement
-                        if (Math.random() > 0.95) {
-                            vel[0] += (Math.random() - 0.5) * 0.04;
-                            vel[1] += (Math.random() - 0.5) * 0.04;
-                            vel[2] += (Math.random() - 0.5) * 0.04;
-                        }
-
-                        // Clamp velocity
-                        vel[0] = Math.max(-maxSpeed, Math.min(maxSpeed, vel[0]));
-                        vel[1] = Math.max(-maxSpeed, Math.min(maxSpeed, vel[1]));
-                        vel[2] = Math.max(-maxSpeed, Math.min(maxSpeed, vel[2]));
-
-                        // Update position
-                        pos[0] += vel[0] * dt;
-                        pos[1] += vel[1] * dt;
-                        pos[2] += vel[2] * dt;
-
-                        // Container boundary collision
-                        const dist = Math.sqrt(pos[0] * pos[0] + pos[1] * pos[1] + pos[2] * pos[2]);
-                        if (dist > maxRadius) {
-                            const nx = pos[0] / dist;
-                            const ny = pos[1] / dist;
-                            const nz = pos[2] / dist;
-
-                            // Push back inside
-                            pos[0] = nx * maxRadius;
-                            pos[1] = ny * maxRadius;
-                            pos[2] = nz * maxRadius;
-
-                            // Reflect velocity
-                            const dot = vel[0] * nx + vel[1] * ny + vel[2] * nz;
-                            vel[0] -= 2 * dot * nx;
-                            vel[1] -= 2 * dot * ny;
-                            vel[2] -= 2 * dot * nz;
-
-                            // Damping
-                            vel[0] *= 0.8;
-                            vel[1] *= 0.8;
-                            vel[2] *= 0.8;
-                        }
+                    const sim = simulation.current;
+                    if (!sim) return;
+                    const alpha = sim.update();
+                    const stats = globalThis.MindsimStats || (globalThis.MindsimStats = {});
+                    stats.physicsMs = sim.stepMs;
+                    // A mind whose bodies are all asleep costs nothing per frame once its last positions are drawn
+                    if (sim.idle && alpha >= 1) {
+                        if (idleWritten.current) return;
+                        idleWritten.current = true;
+                    } else {
+                        idleWritten.current = false;
+                        // Moving bodies keep a demand frameloop running; a sleeping mind lets it stop
+                        invalidate();
                     }
+                    const { prev, curr, count, prevCount } = sim;
 
-                    // Sphere-to-sphere collision detection and response
-                    for (let i = 0; i < newPositions.length; i++) {
-                        for (let j = i + 1; j < newPositions.length; j++) {
-                            const pos1 = newPositions[i];
-                            const pos2 = newPositions[j];
-                            const vel1 = newVelocities[i];
-                            const vel2 = newVelocities[j];
-                            const radius1 = mentalSpheres[i].scale || 0.8;
-                            const radius2 = mentalSpheres[j].scale || 0.8;
-
-                            // Calculate distance between spheres
-                            const dx = pos2[0] - pos1[0];
-                            const dy = pos2[1] - pos1[1];
-                            const dz = pos2[2] - pos1[2];
-                            const distance = Math.sqrt(dx * dx + dy * dy + dz * dz);
-                            const minDistance = radius1 + radius2;
-
-                            // Collision detected
-                            if (distance < minDistance && distance > 0) {
-                                // Normalize collision vector
-                                const nx = dx / distance;
-                                const ny = dy / distance;
-                                const nz = dz / distance;
-
-                                // Separate spheres to prevent overlap
-                                const overlap = minDistance - distance;
-                                const separation = overlap * 0.5;
-                                
-                                pos1[0] -= nx * separation;
-                                pos1[1] -= ny * separation;
-                                pos1[2] -= nz * separation;
-                                
-                                pos2[0] += nx * separation;
-                                pos2[1] += ny * separation;
-                                pos2[2] += nz * separation;
-
-                                // Calculate relative velocity
-                                const rvx = vel2[0] - vel1[0];
-                                const rvy = vel2[1] - vel1[1];
-                                const rvz = vel2[2] - vel1[2];
-
-                                // Relative velocity along collision normal
-                                const velAlongNormal = rvx * nx + rvy * ny + rvz * nz;
-
-                                // Don't resolve if velocities are separating
-                                if (velAlongNormal > 0) continue;
-
-                                // Calculate restitution (bounciness)
-                                const restitution = 0.7;
-
-                                // Calculate impulse scalar
-                                const impulse = -(1 + restitution) * velAlongNormal;
-                                const impulseScalar = impulse / 2; // Assuming equal mass
-
-                                // Apply impulse
-                                vel1[0] -= impulseScalar * nx;
-                                vel1[1] -= impulseScalar * ny;
-                                vel1[2] -= impulseScalar * nz;
-
-                                vel2[0] += impulseScalar * nx;
-                                vel2[1] += impulseScalar * ny;
-                                vel2[2] += impulseScalar * nz;
-
-                                // Add some damping to prevent infinite bouncing
-                                vel1[0] *= 0.9;
-                                vel1[1] *= 0.9;
-                                vel1[2] *= 0.9;
-                                
-                                vel2[0] *= 0.9;
-                                vel2[1] *= 0.9;
-                                vel2[2] *= 0.9;
+                    const mesh = instanced ? instancesRef.current : null;
+                    const objects = bodyObjects.current;
+                    if (instanced && !mesh) return;
+                    const im = mesh ? mesh.instanceMatrix.array : null;
+                    const n = Math.min(count, mesh ? mesh.count : objects.length);
+                    for (let i = 0; i < n; i++) {
+                        const o = i * 3;
+                        let x = curr[o];
+                        let y = curr[o + 1];
+                        let z = curr[o + 2];
+                        if (i < prevCount) {
+                            x = prev[o] + (x - prev[o]) * alpha;
+                            y = prev[o + 1] + (y - prev[o + 1]) * alpha;
+                            z = prev[o + 2] + (z - prev[o + 2]) * alpha;
+                        }
+                        if (im) {
+                            im[i * 16 + 12] = x;
+                            im[i * 16 + 13] = y;
+                            im[i * 16 + 14] = z;
+                            if (i === hovered && hoverLabelRef.current) {
+                                hoverLabelRef.current.position.set(x, y + im[i * 16 + 5] + 0.02, z);
                             }
+                            continue;
                         }
+                        const obj = objects[i];
+                        if (!obj) continue;
+                        const e = obj.matrix.elements;
+                        e[12] = x;
+                        e[13] = y;
+                        e[14] = z;
+                        obj.matrixWorldNeedsUpdate = true;
                     }
-
-                    setPositions(newPositions);
-                    setVelocities(newVelocities);
+                    if (mesh) mesh.instanceMatrix.needsUpdate = true;
                 });
 
                 // Keep overlay in front of camera and centered (positioned in world space, independent of Mind position)
                 useFrame(({ camera }) => {
                     if (!overlayRef.current) return;
-                    const dir = new THREE.Vector3();
-                    camera.getWorldDirection(dir);
-                    const forward = dir.multiplyScalar(4.0); // distance in front of camera
-                    const down = camera.up.clone().multiplyScalar(-0.8); // slightly lower on screen
-                    overlayRef.current.position.copy(camera.position.clone().add(forward).add(down));
+                    camera.getWorldDirection(overlayForward).multiplyScalar(4.0); // distance in front of camera
+                    overlayDown.copy(camera.up).multiplyScalar(-0.8); // slightly lower on screen
+                    overlayRef.current.position.copy(camera.position).add(overlayForward).add(overlayDown);
                     // Match camera rotation to keep perfectly facing screen
                     overlayRef.current.quaternion.copy(camera.quaternion);
                 });
@@ -398,12 +1165,12 @@ class Mind(rx.Component):
                         {/* Mind container and spheres - positioned group */}
                         <group position={position}>
                             <mesh renderOrder={998} castShadow={false} receiveShadow={false}>
-                                <sphereGeometry args={[containerRadius, 64, 64]} />
+                                <sphereGeometry args={[containerRadius, quality.containerSegments, quality.containerSegments]} />
                                 <meshPhysicalMaterial
                                     color={glassTint}
                                     transparent
                                     opacity={containerOpacity}
-                                    transmission={glassTransmission}
+                                    transmission={quality.transmission ? glassTransmission : 0}
                                     thickness={glassThickness}
                                     roughness={glassRoughness}
                                     metalness={0.0}
@@ -415,18 +1182,46 @@ class Mind(rx.Component):
                             </mesh>
 
                             {/* Floating mental spheres */}
-                            {mentalSpheres.map((sphere, idx) => (
+                            {instanced && (
+                                <instancedMesh
+                                    key={capacity}
+                                    ref={instancesRef}
+                                    args={[null, null, capacity]}
+                                    castShadow
+                                    onPointerMove={(e) => {
+                                        e.stopPropagation();
+                                        if (e.instanceId !== hovered) {
+                                            setHovered(e.instanceId);
+                                            wakeSphere(e.instanceId);
+                                        }
+                                    }}
+                                    onPointerOut={() => setHovered(null)}
+                                    onClick={(e) => {
+                                        e.stopPropagation();
+                                        const sphere = mentalSpheres[e.instanceId];
+                                        wakeSphere(e.instanceId);
+                                        if (sphere) setSelected(sphere);
+                                    }}
+                                >
+                                    <sphereGeometry args={[1, quality.sphereSegments, quality.sphereSegments]} />
+                                    <meshStandardMaterial roughness={0.4} metalness={0.6} />
+                                </instancedMesh>
+                            )}
+                            {hoverLabel && (
+                                <sprite ref={hoverLabelRef} scale={[Math.max(0.15, hoverLabel.widthUnits * 0.15), 0.25, 0.25]} renderOrder={1000}>
+                                    <spriteMaterial attach="material" map={hoverLabel.tex} transparent depthTest={false} depthWrite={false} />
+                                </sprite>
+                            )}
+                            {!instanced && mentalSpheres.map((sphere, idx) => (
                                 <MentalSphereComp
                                     key={idx}
                                     name={sphere.name}
                                     detail={sphere.detail}
                                     color={sphere.color}
-                                    position={positions[idx] || [0, 0, 0]}
                                     scale={sphere.scale || 0.8}
-                                    index={idx}
-                                    allSpheres={mentalSpheres}
-                                    containerRadius={containerRadius}
-                                    onSelect={(s) => setSelected(s)}
+                                    bodyRef={(obj) => { bodyObjects.current[idx] = obj; }}
+                                    onHover={() => wakeSphere(idx)}
+                                    onSelect={(s) => { wakeSphere(idx); setSelected(s); }}
                                 />
                             ))}
                         </group>
@@ -0,0 +1,144 @@
+# perf_beacon.py
+import os
+
+import reflex as rx
+
+from .quality import frame_gaps_js
+
+# Where browsers send real-user timings (the backend's /perf_beacon/); empty turns beacons off.
+# It has to be reachable from the browser, which BACKEND_URL inside docker-compose is not.
+PERF_BEACON_URL = os.getenv(
+    "PERF_BEACON_URL",
+    os.getenv("BACKEND_URL", "http://localhost:8000").rstrip("/") + "/perf_beacon/",
+)
+
+
+class PerfBeacon(rx.Component):
+    """Collects page load, first render, frame and model download times and posts them in batches."""
+
+    tag = "PerfBeacon"
+
+    url: rx.Var[str]
+
+    def add_custom_code(self) -> list[str]:
+        return [
+            frame_gaps_js(),
+            """
+            // Real-user timings for the backend's /perf_beacon/. Frame times are counted into a
+            // histogram of 0.1 ms steps, so a beacon carries [value, count] pairs instead of one
+            // number per frame. Beacons go out gzipped every 30 s and, uncompressed, when the page
+            // is hidden; both are "simple" requests, so no CORS preflight is needed.
+            if (!globalThis.MindBeacon) {
+                const SEND_MS = 30000;
+                const MAX_VALUES = 2000;
+                const MODEL_FILE = /\\.(gltf|glb|bin|ktx2)$/i;
+
+                const pending = new Map();
+                let url = null;
+                let timer = null;
+
+                const pagePath = () => window.location.pathname;
+                const add = (metric, value, asset = '', page = pagePath()) => {
+                    const key = page + '\\n' + metric + '\\n' + asset;
+                    let values = pending.get(key);
+                    if (!values) pending.set(key, (values = new Map()));
+                    // 0.1 ms steps below 100 ms, whole ms above; the server keeps 1% accuracy anyway
+                    const rounded = value < 100 ? Math.round(value * 10) / 10 : Math.round(value);
+                    if (values.size < MAX_VALUES || values.has(rounded)) values.set(rounded, (values.get(rounded) || 0) + 1);
+                };
+
+                const takeBatch = () => {
+                    if (!pending.size) return null;
+                    const pages = new Map();
+                    pending.forEach((values, key) => {
+                        const [page, metric, asset] = key.split('\\n');
+                        if (!pages.has(page)) pages.set(page, []);
+                        pages.get(page).push({ metric, asset, values: Array.from(values) });
+                    });
+                    pending.clear();
+                    return JSON.stringify(Array.from(pages, ([page, metrics]) => ({ page, metrics })));
+                };
+
+                const send = async () => {
+                    const body = takeBatch();
+                    if (!body || !url) return;
+                    try {
+                        const payload = typeof CompressionStream === 'undefined'
+                            ? body
+                            : await new Response(new Blob([body]).stream().pipeThrough(new CompressionStream('gzip'))).blob();
+                        await fetch(url, { method: 'POST', body: payload, mode: 'no-cors', credentials: 'omit', keepalive: true });
+                    } catch (e) {
+                        // Timings are best effort; a lost batch is not worth retrying
+                    }
+                };
+
+                // A hidden page may never run script again, so this one goes out synchronously
+                const sendNow = () => {
+                    const body = takeBatch();
+                    if (body && url && navigator.sendBeacon) navigator.sendBeacon(url, new Blob([body], { type: 'text/plain' }));
+                };
+
+                const MindBeacon = {
+                    add,
+                    firstRenderSeen: false,
+
+                    start(beaconUrl) {
+                        url = beaconUrl;
+                        if (timer !== null || typeof window === 'undefined') return;
+                        timer = setInterval(send, SEND_MS);
+                        document.addEventListener('visibilitychange', () => {
+                            if (document.visibilityState === 'hidden') sendNow();
+                        });
+                        window.addEventListener('pagehide', sendNow);
+
+                        const recordLoad = () => {
+                            const [navigation] = performance.getEntriesByType('navigation');
+                            if (navigation && navigation.loadEventEnd > 0) add('load_ms', navigation.loadEventEnd);
+                        };
+                        if (document.readyState === 'complete') recordLoad();
+                        else window.addEventListener('load', () => setTimeout(recordLoad, 0), { once: true });
+
+                        if (typeof PerformanceObserver !== 'undefined') {
+                            new PerformanceObserver((list) => {
+                                list.getEntries().forEach((entry) => {
+                                    const path = new URL(entry.name).pathname;
+                                    if (MODEL_FILE.test(path)) add('asset_ms', entry.duration, path);
+                                });
+                            }).observe({ type: 'resource', buffered: true });
+                        }
+                    },
+                };
+
+                globalThis.MindBeacon = MindBeacon;
+            }
+
+            // Gaps longer than this (a background tab, a stalled loop) are not frames
+            const BEACON_MAX_FRAME_MS = 250;
+
+            export const PerfBeacon = ({ url }) => {
+              const last = useRef({ at: 0, idle: 0 });
+
+              React.useEffect(() => {
+                if (url) globalThis.MindBeacon.start(url);
+              }, [url]);
+
+              useFrame(() => {
+                const beacon = globalThis.MindBeacon;
+                const now = performance.now();
+                // Time from navigation to the first frame of any scene; only meaningful once per document
+                if (!beacon.firstRenderSeen) {
+                  beacon.firstRenderSeen = true;
+                  beacon.add('first_render_ms', now);
+                }
+                // The first frame after the demand loop went idle measures the idle time, not a frame
+                const idle = globalThis.MindFrameGaps.idle;
+                const delta = last.current.at && last.current.idle === idle ? now - last.current.at : 0;
+                last.current.at = now;
+                last.current.idle = idle;
+                if (delta && delta <= BEACON_MAX_FRAME_MS) beacon.add('frame_ms', delta);
+              });
+
+              return null;
+            };
+            """
+        ]
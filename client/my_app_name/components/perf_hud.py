@@ -0,0 +1,248 @@
+# perf_hud.py
+import reflex as rx
+
+from .quality import frame_gaps_js
+
+
+def perf_js() -> str:
+    return """
+        // Frame samples for the performance HUD. Everything is off unless the page URL has ?perf
+        // (any value but 0), so production pages pay nothing for it. PerfProbe fills the samples
+        // from inside a canvas, PerfHUD shows them and records traces.
+        if (!globalThis.MindPerf) {
+            // Recent frames kept for percentiles
+            const WINDOW = 600;
+            // A trace keeps at most this many frames (about ten minutes at 60 fps)
+            const MAX_TRACE_FRAMES = 36000;
+
+            let enabled = false;
+            if (typeof window !== 'undefined') {
+                try {
+                    const param = new URLSearchParams(window.location.search).get('perf');
+                    enabled = param !== null && param !== '0' && param !== 'false';
+                } catch (e) {
+                    enabled = false;
+                }
+            }
+
+            const frameMs = new Float32Array(WINDOW);
+            const MindPerf = {
+                enabled,
+                count: 0,
+                // The last frame's renderer and physics numbers
+                latest: { drawCalls: 0, triangles: 0, geometries: 0, textures: 0, physicsMs: 0, collisionMs: 0 },
+                trace: null,
+
+                record(ms, sample) {
+                    frameMs[MindPerf.count % WINDOW] = ms;
+                    MindPerf.count++;
+                    MindPerf.latest = sample;
+                    const trace = MindPerf.trace;
+                    if (trace && trace.frames.length < MAX_TRACE_FRAMES) {
+                        trace.frames.push({ t: +(performance.now() - trace.start).toFixed(2), frameMs: +ms.toFixed(2), ...sample });
+                    }
+                },
+
+                // Frame time percentiles over the recent window, in ms
+                percentiles(points = [50, 95, 99]) {
+                    const n = Math.min(MindPerf.count, WINDOW);
+                    if (!n) return null;
+                    const sorted = frameMs.slice(0, n).sort();
+                    let total = 0;
+                    for (let i = 0; i < n; i++) total += sorted[i];
+                    const result = { mean: total / n, max: sorted[n - 1] };
+                    points.forEach((p) => {
+                        result['p' + p] = sorted[Math.min(n - 1, Math.ceil((p / 100) * n) - 1)];
+                    });
+                    return result;
+                },
+
+                startTrace() {
+                    MindPerf.trace = { start: performance.now(), startedAt: new Date().toISOString(), frames: [] };
+                },
+
+                // Ends the recording and returns it as a plain object ready for JSON
+                stopTrace() {
+                    const trace = MindPerf.trace;
+                    if (!trace) return null;
+                    MindPerf.trace = null;
+                    const stats = globalThis.MindsimStats || {};
+                    return {
+                        page: window.location.pathname,
+                        userAgent: navigator.userAgent,
+                        devicePixelRatio: window.devicePixelRatio,
+                        quality: stats.quality || null,
+                        startedAt: trace.startedAt,
+                        durationMs: +(performance.now() - trace.start).toFixed(1),
+                        frames: trace.frames,
+                    };
+                },
+
+                download(trace) {
+                    const blob = new Blob([JSON.stringify(trace)], { type: 'application/json' });
+                    const link = document.createElement('a');
+                    link.href = URL.createObjectURL(blob);
+                    link.download = `mindsim-trace-${trace.startedAt.replace(/[:.]/g, '-')}.json`;
+                    link.click();
+                    setTimeout(() => URL.revokeObjectURL(link.href), 0);
+                },
+            };
+
+            globalThis.MindPerf = MindPerf;
+        }
+        """
+
+
+class PerfProbe(rx.Component):
+    """Samples frame time, renderer counters and physics time into MindPerf; does nothing without ?perf."""
+
+    tag = "PerfProbe"
+
+    def add_custom_code(self) -> list[str]:
+        return [
+            perf_js(),
+            frame_gaps_js(),
+            """
+            // Gaps longer than this (a background tab, a stalled loop) are not frames
+            const PERF_MAX_FRAME_MS = 250;
+
+            const ActivePerfProbe = () => {
+              const { gl } = useThree();
+              const last = useRef({ at: 0, idle: 0 });
+
+              // Shared canvases render several views a frame; count all of them, not only the last
+              React.useEffect(() => {
+                const autoReset = gl.info.autoReset;
+                gl.info.autoReset = false;
+                gl.info.reset();
+                return () => {
+                  gl.info.autoReset = autoReset;
+                };
+              }, [gl]);
+
+              // Runs before this frame's render, so gl.info holds the totals of the previous one
+              useFrame(() => {
+                const now = performance.now();
+                // The first frame after the demand loop went idle measures the idle time, not a frame
+                const idle = globalThis.MindFrameGaps.idle;
+                const delta = last.current.at && last.current.idle === idle ? now - last.current.at : 0;
+                last.current.at = now;
+                last.current.idle = idle;
+                const info = gl.info;
+                if (delta && delta <= PERF_MAX_FRAME_MS) {
+                  const stats = globalThis.MindsimStats || {};
+                  globalThis.MindPerf.record(delta, {
+                    drawCalls: info.render.calls,
+                    triangles: info.render.triangles,
+                    geometries: info.memory.geometries,
+                    textures: info.memory.textures,
+                    physicsMs: stats.physicsMs || 0,
+                    collisionMs: stats.collisionMs || 0,
+                  });
+                }
+                info.reset();
+              });
+
+              return null;
+            };
+
+            export const PerfProbe = () => (globalThis.MindPerf.enabled ? <ActivePerfProbe /> : null);
+            """,
+        ]
+
+
+class PerfHUD(rx.Component):
+    """Overlay with FPS, frame time percentiles and renderer counters, plus trace recording; needs ?perf."""
+
+    tag = "PerfHUD"
+
+    def add_custom_code(self) -> list[str]:
+        return [
+            perf_js(),
+            """
+            const PERF_REFRESH_MS = 500;
+
+            const ActivePerfHUD = () => {
+              const [view, setView] = useState(null);
+              const [recording, setRecording] = useState(false);
+              const counted = useRef({ count: 0, at: 0 });
+
+              React.useEffect(() => {
+                const perf = globalThis.MindPerf;
+                counted.current = { count: perf.count, at: performance.now() };
+                const timer = setInterval(() => {
+                  const now = performance.now();
+                  const frames = perf.count - counted.current.count;
+                  const fps = (1000 * frames) / (now - counted.current.at);
+                  counted.current = { count: perf.count, at: now };
+                  setView({ fps, percentiles: perf.percentiles(), latest: perf.latest, tracing: perf.trace ? perf.trace.frames.length : 0 });
+                }, PERF_REFRESH_MS);
+                return () => clearInterval(timer);
+              }, []);
+
+              const toggleTrace = () => {
+                const perf = globalThis.MindPerf;
+                if (perf.trace) {
+                  const trace = perf.stopTrace();
+                  setRecording(false);
+                  if (trace && trace.frames.length) perf.download(trace);
+                } else {
+                  perf.startTrace();
+                  setRecording(true);
+                }
+              };
+
+              const p = view && view.percentiles;
+              const latest = view ? view.latest : null;
+              const lines = view
+                ? [
+                    `${view.fps.toFixed(0)} fps`,
+                    p ? `frame p50 ${p.p50.toFixed(1)} · p95 ${p.p95.toFixed(1)} · p99 ${p.p99.toFixed(1)} · max ${p.max.toFixed(1)} ms` : 'frame -',
+                    `draw calls ${latest.drawCalls} · triangles ${latest.triangles.toLocaleString()}`,
+                    `geometries ${latest.geometries} · textures ${latest.textures}`,
+                    `physics ${latest.physicsMs.toFixed(2)} ms/step · collision ${latest.collisionMs.toFixed(2)} ms`,
+                  ]
+                : ['Measuring...'];
+
+              return (
+                <div style={{
+                  position: 'fixed',
+                  left: '12px',
+                  bottom: '12px',
+                  padding: '8px 10px',
+                  background: 'rgba(0, 0, 0, 0.7)',
+                  color: 'rgba(255, 255, 255, 0.9)',
+                  fontFamily: 'monospace',
+                  fontSize: '12px',
+                  lineHeight: '1.5',
+                  borderRadius: '6px',
+                  zIndex: 1001
+                }}>
+                  {lines.map((line, i) => <div key={i}>{line}</div>)}
+                  <button
+                    onClick={toggleTrace}
+                    style={{
+                      marginTop: '6px',
+                      padding: '2px 8px',
+                      fontFamily: 'monospace',
+                      fontSize: '12px',
+                      color: 'white',
+                      background: recording ? 'rgba(220, 50, 50, 0.9)' : 'rgba(255, 255, 255, 0.15)',
+                      border: '1px solid rgba(255, 255, 255, 0.4)',
+                      borderRadius: '4px',
+                      cursor: 'pointer'
+                    }}
+                  >
+                    {recording ? `Stop and save trace (${view ? view.tracing : 0} frames)` : 'Record trace'}
+                  </button>
+                </div>
+              );
+            };
+
+            export const PerfHUD = () => (globalThis.MindPerf.enabled ? <ActivePerfHUD /> : null);
+            """,
+        ]
+
+
+def create_perf_hud() -> PerfHUD:
+    return PerfHUD.create()
@@ -6,18 +6,63 @@ class Player(rx.Component):
 
     tag = "Player"
 
+    move_speed: rx.Var[float] = 5.0
+    look_speed: rx.Var[float] = 0.0005
+    # Log key and pointer-lock events to the console
+    debug: rx.Var[bool] = False
+    # Record key-down to camera-moved latency into MindsimStats (shown by FrameStats)
+    measure_latency: rx.Var[bool] = False
+
     def add_custom_code(self) -> list[str]:
         return [
             """
-            export const Player = () => {
+            const MOVE_KEYS = { KeyW: true, KeyA: true, KeyS: true, KeyD: true };
+            // Longer frames are clamped so a stalled tab doesn't teleport the player on resume
+            const MAX_FRAME_DELTA = 0.1;
+            const LATENCY_SAMPLES = 60;
+
+            // Time from a movement key going down to the frame that moves the camera for it.
+            // Event timestamps share performance.now()'s clock; compositor time is not included.
+            const useInputLatency = (enabled) => {
+              const state = useRef(null);
+              if (!state.current) {
+                state.current = { pending: -1, samples: new Float32Array(LATENCY_SAMPLES), next: 0, filled: 0 };
+              }
+              return useMemo(() => ({
+                mark: (timeStamp) => {
+                  if (enabled && state.current.pending < 0) state.current.pending = timeStamp;
+                },
+                commit: () => {
+                  const s = state.current;
+                  if (s.pending < 0) return;
+                  s.samples[s.next] = performance.now() - s.pending;
+                  s.pending = -1;
+                  s.next = (s.next + 1) % LATENCY_SAMPLES;
+                  s.filled = Math.min(s.filled + 1, LATENCY_SAMPLES);
+                  let total = 0;
+                  let worst = 0;
+                  for (let i = 0; i < s.filled; i++) {
+                    total += s.samples[i];
+                    worst = Math.max(worst, s.samples[i]);
+                  }
+                  const stats = globalThis.MindsimStats || (globalThis.MindsimStats = {});
+                  stats.inputLatencyMs = total / s.filled;
+                  stats.inputLatencyWorstMs = worst;
+                },
+              }), [enabled]);
+            };
+
+            export const Player = ({ moveSpeed = 5.0, lookSpeed = 0.0005, debug = false, measureLatency = false }) => {
               const { camera } = useThree();
-              const [keys, setKeys] = useState({});
-              const [isPointerLocked, setIsPointerLocked] = useState(false);
-              const moveSpeed = 5.0; // Units per second
-              const lookSpeed = 0.0005;
+              // Input lives in refs: key presses and pointer lock changes never re-render the player
+              const keys = useRef({});
+              const pointerLocked = useRef(false);
+              const latency = useInputLatency(measureLatency);
               
-              // Create reusable Euler object to prevent snapping
-              const euler = new THREE.Euler(0, 0, 0, 'YXZ');
+              // Reusable Euler and movement vectors, created once rather than every render/frame
+              const euler = useMemo(() => new THREE.Euler(0, 0, 0, 'YXZ'), []);
+              const forward = useMemo(() => new THREE.Vector3(), []);
+              const right = useMemo(() => new THREE.Vector3(), []);
 
               // Set initial camera position
               useEffect(() => {
@@ -28,12 +73,14 @@ class Player(rx.Component):
               // Handle keyboard input
               useEffect(() => {
                 const handleKeyDown = (event) => {
-                  console.log('Key pressed:', event.code);
-                  setKeys(prev => ({ ...prev, [event.code]: true }));
+                  if (event.repeat) return;
+                  if (debug) console.log('Key pressed:', event.code);
+                  keys.current[event.code] = true;
+                  if (MOVE_KEYS[event.code] && pointerLocked.current) latency.mark(event.timeStamp);
                   
                   // Handle E key for pointer lock toggle
                   if (event.code === 'KeyE') {
-                    if (isPointerLocked) {
+                    if (pointerLocked.current) {
                       document.exitPointerLock();
                     } else {
                       document.body.requestPointerLock();
@@ -42,23 +89,30 @@ class Player(rx.Component):
                 };
 
                 const handleKeyUp = (event) => {
-                  console.log('Key released:', event.code);
-                  setKeys(prev => ({ ...prev, [event.code]: false }));
+                  if (debug) console.log('Key released:', event.code);
+                  keys.current[event.code] = false;
+                };
+
+                // Key-ups are lost while the window is unfocused; don't keep walking
+                const handleBlur = () => {
+                  keys.current = {};
                 };
 
                 window.addEventListener('keydown', handleKeyDown);
                 window.addEventListener('keyup', handleKeyUp);
+                window.addEventListener('blur', handleBlur);
 
                 return () => {
                   window.removeEventListener('keydown', handleKeyDown);
                   window.removeEventListener('keyup', handleKeyUp);
+                  window.removeEventListener('blur', handleBlur);
                 };
-              }, [isPointerLocked]);
+              }, [debug, latency]);
 
               // Handle mouse movement for camera look
               useEffect(() => {
                 const handleMouseMove = (event) => {
-                  if (isPointerLocked) {
+                  if (pointerLocked.current) {
                     const deltaX = event.movementX;
                     const deltaY = event.movementY;
                     
@@ -79,8 +133,9 @@ class Player(rx.Component):
 
                 const handlePointerLockChange = () => {
                   const locked = document.pointerLockElement === document.body;
-                  console.log('Pointer lock changed:', locked);
-                  setIsPointerLocked(locked);
+                  if (debug) console.log('Pointer lock changed:', locked);
+                  pointerLocked.current = locked;
+                  if (!locked) keys.current = {};
                 };
 
                 document.addEventListener('mousemove', handleMouseMove);
@@ -90,48 +145,32 @@ class Player(rx.Component):
                   document.removeEventListener('mousemove', handleMouseMove);
                   document.removeEventListener('pointerlockchange', handlePointerLockChange);
                 };
-              }, [camera, isPointerLocked]);
+              }, [camera, debug, euler, lookSpeed]);
 
               // Movement logic
               useFrame((state, delta) => {
-                if (!isPointerLocked) return;
+                if (!pointerLocked.current) return;
+                const pressed = keys.current;
+                const z = (pressed['KeyW'] ? 1 : 0) - (pressed['KeyS'] ? 1 : 0);
+                const x = (pressed['KeyD'] ? 1 : 0) - (pressed['KeyA'] ? 1 : 0);
+                if (x === 0 && z === 0) return;
 
                 // Get camera rotation as Euler angles
                 euler.setFromQuaternion(camera.quaternion);
                 
                 // Calculate movement vectors from yaw only (ignore pitch for horizontal movement)
                 const yaw = euler.y;
-                const forward = new THREE.Vector3(
-                  -Math.sin(yaw),
-                  0,
-                  -Math.cos(yaw)
-                );
-                const right = new THREE.Vector3(
-                  Math.cos(yaw),
-                  0,
-                  -Math.sin(yaw)
-                );
+                forward.set(-Math.sin(yaw), 0, -Math.cos(yaw));
+                right.set(Math.cos(yaw), 0, -Math.sin(yaw));
 
                 // Store current position
                 const oldX = camera.position.x;
                 const oldZ = camera.position.z;
                 
-                // Calculate frame-independent movement distance
-                const movement = moveSpeed * delta;
-                
-                // Apply movement based on pressed keys
-                if (keys['KeyW']) {
-                  camera.position.addScaledVector(forward, movement);
-                }
-                if (keys['KeyS']) {
-                  camera.position.addScaledVector(forward, -movement);
-                }
-                if (keys['KeyA']) {
-                  camera.position.addScaledVector(right, -movement);
-                }
-                if (keys['KeyD']) {
-                  camera.position.addScaledVector(right, movement);
-                }
+                // Same speed at any frame rate, and diagonals are no faster than straight lines
+                const movement = moveSpeed * Math.min(delta, MAX_FRAME_DELTA) / Math.hypot(x, z);
+                camera.position.addScaledVector(forward, z * movement);
+                camera.position.addScaledVector(right, x * movement);
 
                 // Check collision with walls
                 if (window.checkCollision && window.checkCollision(camera.position.x, camera.position.z)) {
@@ -144,6 +183,7 @@ class Player(rx.Component):
                 if (camera.position.y < 1) {
                   camera.position.y = 1;
                 }
+                latency.commit();
               });
 
               return null; // Player doesn't render anything visible
@@ -152,5 +192,5 @@ class Player(rx.Component):
         ]
 
 
-def create_player() -> Player:
-    return Player.create()
\ No newline at end of file
+def create_player(**props) -> Player:
+    return Player.create(**props)
\ No newline at end of file
@@ -0,0 +1,206 @@
+# quality.py
+import reflex as rx
+
+
+def frame_gaps_js() -> str:
+    return """
+        import { addTail } from '@react-three/fiber';
+
+        // R3F runs tail effects when its render loop stops: frameloop="demand" with nothing left to draw.
+        // The frame that restarts it follows idle time, so the gap before it is not what the frame cost.
+        // Frame timers compare MindFrameGaps.idle with the value they saw last and drop that one interval.
+        if (!globalThis.MindFrameGaps) {
+            const gaps = { idle: 0 };
+            addTail(() => {
+                gaps.idle++;
+            });
+            globalThis.MindFrameGaps = gaps;
+        }
+        """
+
+
+def quality_js() -> str:
+    return """
+        // Rendering quality shared by every canvas on the page. Levels go from cheapest to the full look;
+        // QualityGovernor moves between them from measured frame times, and components read the current
+        // one with MindQuality.useLevel(). ?quality=<name> (or MindQuality.setOverride) pins a level.
+        if (!globalThis.MindQuality) {
+            const screenDpr = () => (typeof window === 'undefined' ? 1 : window.devicePixelRatio || 1);
+            const levels = [
+                { name: 'low', dpr: () => 0.75, shadowLights: 0, shadowMapSize: 512, transmission: false, containerSegments: 24, sphereSegments: 12 },
+                { name: 'medium', dpr: () => 1, shadowLights: 1, shadowMapSize: 1024, transmission: false, containerSegments: 32, sphereSegments: 16 },
+                { name: 'high', dpr: () => Math.min(screenDpr(), 1.5), shadowLights: 2, shadowMapSize: 1024, transmission: true, containerSegments: 48, sphereSegments: 24 },
+                { name: 'ultra', dpr: () => Math.min(screenDpr(), 2), shadowLights: 2, shadowMapSize: 2048, transmission: true, containerSegments: 64, sphereSegments: 32 },
+            ];
+            // Step down when frames run this much over budget, up only when they keep within it
+            const SLOW_RATIO = 1.2;
+            const FAST_RATIO = 1.05;
+            const DOWN_WINDOWS = 2;
+            const UP_WINDOWS = 6;
+            const MAX_UP_WINDOWS = 64;
+            // Shader compiles and reallocated shadow maps make the first frames after a change slow
+            const SETTLE_MS = 1000;
+            const STORAGE_KEY = 'mindsim-quality';
+
+            const listeners = new Set();
+            const state = {
+                level: levels.length - 1,
+                override: null,
+                slow: 0,
+                fast: 0,
+                settleUntil: 0,
+                // Windows of headroom needed to step up into each level; doubles each time it proves too slow
+                upWindows: levels.map(() => UP_WINDOWS),
+            };
+
+            const findLevel = (name) => levels.findIndex((level) => level.name === name);
+            const publish = () => {
+                const stats = globalThis.MindsimStats || (globalThis.MindsimStats = {});
+                stats.quality = MindQuality.current().name + (state.override === null ? '' : ' (fixed)');
+                listeners.forEach((listener) => listener());
+            };
+            const setLevel = (index) => {
+                if (index === state.level) return;
+                state.level = index;
+                state.slow = 0;
+                state.fast = 0;
+                state.settleUntil = performance.now() + SETTLE_MS;
+                publish();
+            };
+
+            const MindQuality = {
+                levels,
+
+                current() {
+                    const level = levels[state.override === null ? state.level : state.override];
+                    return { ...level, dpr: level.dpr() };
+                },
+
+                // Pin a level by name, or pass null to hand control back to the governor; remembered per browser
+                setOverride(name) {
+                    const index = name === null ? -1 : findLevel(name);
+                    state.override = index >= 0 ? index : null;
+                    try {
+                        if (state.override === null) window.localStorage.removeItem(STORAGE_KEY);
+                        else window.localStorage.setItem(STORAGE_KEY, name);
+                    } catch (e) {
+                        // Storage can be unavailable (private mode); the override still applies to this page
+                    }
+                    publish();
+                },
+
+                // One window of measured frames: average frame time against the frame budget
+                report(frameMs, budgetMs) {
+                    if (state.override !== null || performance.now() < state.settleUntil) return;
+                    if (frameMs > budgetMs * SLOW_RATIO) {
+                        state.fast = 0;
+                        if (++state.slow >= DOWN_WINDOWS && state.level > 0) {
+                            state.upWindows[state.level] = Math.min(state.upWindows[state.level] * 2, MAX_UP_WINDOWS);
+                            setLevel(state.level - 1);
+                        }
+                    } else if (frameMs <= budgetMs * FAST_RATIO) {
+                        state.slow = 0;
+                        const next = state.level + 1;
+                        if (next < levels.length && ++state.fast >= state.upWindows[next]) setLevel(next);
+                    } else {
+                        state.slow = 0;
+                        state.fast = 0;
+                    }
+                },
+
+                subscribe(listener) {
+                    listeners.add(listener);
+                    return () => listeners.delete(listener);
+                },
+
+                useLevel() {
+                    const [level, setLevelState] = React.useState(() => MindQuality.current());
+                    React.useEffect(() => {
+                        const update = () => setLevelState(MindQuality.current());
+                        update();
+                        return MindQuality.subscribe(update);
+                    }, []);
+                    return level;
+                },
+            };
+
+            if (typeof window !== 'undefined') {
+                let pinned = null;
+                try {
+                    pinned = new URLSearchParams(window.location.search).get('quality') || window.localStorage.getItem(STORAGE_KEY);
+                } catch (e) {
+                    pinned = null;
+                }
+                if (pinned === 'auto') MindQuality.setOverride(null);
+                else if (pinned && findLevel(pinned) >= 0) state.override = findLevel(pinned);
+            }
+            publish();
+
+            globalThis.MindQuality = MindQuality;
+        }
+        """
+
+
+class QualityGovernor(rx.Component):
+    """Measures frame time in a canvas and steps MindQuality down or up; also applies the pixel ratio."""
+
+    tag = "QualityGovernor"
+
+    # Frame rate the levels are chosen to hold
+    target_fps: rx.Var[int] = 60
+
+    def add_custom_code(self) -> list[str]:
+        return [
+            quality_js(),
+            frame_gaps_js(),
+            """
+            // Frames further apart than this are idle gaps (a background tab, a stalled loop)
+            const MAX_SAMPLE_MS = 250;
+            const QUALITY_WINDOW_MS = 500;
+
+            export const QualityGovernor = ({ targetFps = 60 }) => {
+              const { gl, scene, setDpr, invalidate } = useThree();
+              const level = globalThis.MindQuality.useLevel();
+              const samples = useRef({ last: 0, idle: 0, frames: 0, total: 0 });
+
+              // Shadow maps stay on; each level chooses which lights cast. Materials compiled before this
+              // point are recompiled once with shadow support.
+              React.useEffect(() => {
+                if (gl.shadowMap.enabled) return;
+                gl.shadowMap.enabled = true;
+                gl.shadowMap.type = THREE.PCFSoftShadowMap;
+                scene.traverse((child) => {
+                  if (child.material) {
+                    (Array.isArray(child.material) ? child.material : [child.material]).forEach((material) => {
+                      material.needsUpdate = true;
+                    });
+                  }
+                });
+              }, [gl, scene]);
+
+              React.useEffect(() => {
+                setDpr(level.dpr);
+                invalidate();
+              }, [level, setDpr, invalidate]);
+
+              useFrame(() => {
+                const now = performance.now();
+                const s = samples.current;
+                const idle = globalThis.MindFrameGaps.idle;
+                // Only back-to-back frames count: on-demand renders a hover apart are not slow frames
+                const delta = s.last && s.idle === idle ? now - s.last : 0;
+                s.last = now;
+                s.idle = idle;
+                if (!delta || delta > MAX_SAMPLE_MS) return;
+                s.frames++;
+                s.total += delta;
+                if (s.total < QUALITY_WINDOW_MS) return;
+                globalThis.MindQuality.report(s.total / s.frames, 1000 / targetFps);
+                s.frames = 0;
+                s.total = 0;
+              });
+
+              return null;
+            };
+            """,
+        ]
@@ -1,234 +1,148 @@
 # room.py
+from typing import Any, Dict, List
+
 import reflex as rx
 
+DEFAULT_ROOM = {
+    "position": (0, 0, 0),
+    "width": 20,
+    "length": 20,
+    "height": 10,
+    "color": "#FFFFFF",
+}
+
+
 class Room(rx.Component):
-    """A 3D room component with customizable walls, floor, and ceiling."""
+    """Rooms with walls, doors, floor and ceiling, built at runtime from ``rooms``.
+
+    Each room config has ``position``, ``width``, ``length``, ``height``, ``color``
+    and ``doors`` (any of "front", "back", "left", "right"; ``door_width`` and
+    ``door_height`` size them). Floors, ceilings and walls of every room are
+    merged into one geometry each, coloured per vertex and drawn with three shared
+    materials, so any number of rooms costs three draw calls and ``rooms`` can
+    be a state var that changes the layout without recompiling.
+    """
     tag = "Room"
 
-    def __init__(self, rooms, **kwargs):
-        super().__init__(**kwargs)
-        self.rooms = rooms
+    rooms: rx.Var[List[Dict[str, Any]]] = []
 
     def add_custom_code(self) -> list[str]:
-        room_jsx = ""
-        for i, room in enumerate(self.rooms):
-            px, py, pz = room.get("position", (0,0,0))
-            w = room.get("width", 20)
-            l = room.get("length", 20)
-            h = room.get("height", 10)
-            c = room.get("color", "#FFFFFF")
-            doors = room.get("doors", [])  # List of door positions: "front", "back", "left", "right"
-            
-            y_floor = -2
-            y_ceil = h - 2
-            y_mid = (h / 2) - 2
-            x_left = -(w / 2)
-            x_right = (w / 2)
-            z_back = -(l / 2)
-            z_front = (l / 2)
-
-            # Prebuild strings with single JSX braces
-            group_pos = '{' + f'[{px}, {py}, {pz}]' + '}'
-            floor_pos = '{' + f'[0, {y_floor}, 0]' + '}'
-            ceil_pos = '{' + f'[0, {y_ceil}, 0]' + '}'
-
-            args_wl = '{' + f'[{w}, {l}]' + '}'
-
-            rot_down = '{[-Math.PI / 2, 0, 0]}'
-            rot_up = '{[Math.PI / 2, 0, 0]}'
-            rot_left = '{[0, Math.PI / 2, 0]}'
-            rot_right = '{[0, -Math.PI / 2, 0]}'
-            
-            # Door dimensions
-            door_width = 3
-            door_height = 6
-
-            room_jsx += f"""
-                  <group key={{{i}}} position={group_pos}>
-                    <mesh position={floor_pos} rotation={rot_down} receiveShadow>
-                      <planeGeometry args={args_wl} />
-                      <meshStandardMaterial color=\"{c}\" roughness={{0.8}} side={{THREE.DoubleSide}} />
-                    </mesh>
-                    <mesh position={ceil_pos} rotation={rot_up} receiveShadow>
-                      <planeGeometry args={args_wl} />
-                      <meshStandardMaterial color=\"{c}\" roughness={{0.9}} side={{THREE.DoubleSide}} />
-                    </mesh>
-            """
-            
-            # Back wall (with optional door)
-            if "back" not in doors:
-                back_pos = '{' + f'[0, {y_mid}, {z_back}]' + '}'
-                args_wh = '{' + f'[{w}, {h}]' + '}'
-                room_jsx += f"""
-                    <mesh position={back_pos} receiveShadow>
-                      <planeGeometry args={args_wh} />
-                      <meshStandardMaterial color=\"{c}\" roughness={{0.7}} side={{THREE.DoubleSide}} />
-                    </mesh>
-                """
-            else:
-                # Create wall segments around door
-                wall_side_width = (w - door_width) / 2
-                wall_top_height = h - door_height
-                
-                # Left segment
-                left_seg_pos = '{' + f'[{-w/4 - door_width/4}, {y_mid}, {z_back}]' + '}'
-                left_seg_args = '{' + f'[{wall_side_width}, {h}]' + '}'
-                # Right segment
-                right_seg_pos = '{' + f'[{w/4 + door_width/4}, {y_mid}, {z_back}]' + '}'
-                right_seg_args = '{' + f'[{wall_side_width}, {h}]' + '}'
-                # Top segment
-                top_seg_pos = '{' + f'[0, {y_mid + door_height/2 + wall_top_height/2}, {z_back}]' + '}'
-                top_seg_args = '{' + f'[{door_width}, {wall_top_height}]' + '}'
-                
-                room_jsx += f"""
-                    <mesh position={left_seg_pos} receiveShadow>
-                      <planeGeometry args={left_seg_args} />
-                      <meshStandardMaterial color=\"{c}\" roughness={{0.7}} side={{THREE.DoubleSide}} />
-                    </mesh>
-                    <mesh position={right_seg_pos} receiveShadow>
-                      <planeGeometry args={right_seg_args} />
-                      <meshStandardMaterial color=\"{c}\" roughness={{0.7}} side={{THREE.DoubleSide}} />
-                    </mesh>
-                    <mesh position={top_seg_pos} receiveShadow>
-                      <planeGeometry args={top_seg_args} />
-                      <meshStandardMaterial color=\"{c}\" roughness={{0.7}} side={{THREE.DoubleSide}} />
-                    </mesh>
-                """
-            
-            # Front wall (with optional door)
-            if "front" not in doors:
-                front_pos = '{' + f'[0, {y_mid}, {z_front}]' + '}'
-                args_wh = '{' + f'[{w}, {h}]' + '}'
-                room_jsx += f"""
-                    <mesh position={front_pos} receiveShadow>
-                      <planeGeometry args={args_wh} />
-                      <meshStandardMaterial color=\"{c}\" roughness={{0.7}} side={{THREE.DoubleSide}} />
-                    </mesh>
-                """
-            else:
-                # Create wall segments around door
-                wall_side_width = (w - door_width) / 2
-                wall_top_height = h - door_height
-                
-                left_seg_pos = '{' + f'[{-w/4 - door_width/4}, {y_mid}, {z_front}]' + '}'
-                left_seg_args = '{' + f'[{wall_side_width}, {h}]' + '}'
-                right_seg_pos = '{' + f'[{w/4 + door_width/4}, {y_mid}, {z_front}]' + '}'
-                right_seg_args = '{' + f'[{wall_side_width}, {h}]' + '}'
-                top_seg_pos = '{' + f'[0, {y_mid + door_height/2 + wall_top_height/2}, {z_front}]' + '}'
-                top_seg_args = '{' + f'[{door_width}, {wall_top_height}]' + '}'
-                
-                room_jsx += f"""
-                    <mesh position={left_seg_pos} receiveShadow>
-                      <planeGeometry args={left_seg_args} />
-                      <meshStandardMaterial color=\"{c}\" roughness={{0.7}} side={{THREE.DoubleSide}} />
-                    </mesh>
-                    <mesh position={right_seg_pos} receiveShadow>
-                      <planeGeometry args={right_seg_args} />
-                      <meshStandardMaterial color=\"{c}\" roughness={{0.7}} side={{THREE.DoubleSide}} />
-                    </mesh>
-                    <mesh position={top_seg_pos} receiveShadow>
-                      <planeGeometry args={top_seg_args} />
-                      <meshStandardMaterial color=\"{c}\" roughness={{0.7}} side={{THREE.DoubleSide}} />
-                    </mesh>
-                """
-            
-            # Left wall (with optional door)
-            if "left" not in doors:
-                left_pos = '{' + f'[{x_left}, {y_mid}, 0]' + '}'
-                args_lh = '{' + f'[{l}, {h}]' + '}'
-                room_jsx += f"""
-                    <mesh position={left_pos} rotation={rot_left} receiveShadow>
-                      <planeGeometry args={args_lh} />
-                      <meshStandardMaterial color=\"{c}\" roughness={{0.7}} side={{THREE.DoubleSide}} />
-                    </mesh>
-                """
-            else:
-                wall_side_width = (l - door_width) / 2
-                wall_top_height = h - door_height
-                
-                left_seg_pos = '{' + f'[{x_left}, {y_mid}, {-l/4 - door_width/4}]' + '}'
-                left_seg_args = '{' + f'[{wall_side_width}, {h}]' + '}'
-                right_seg_pos = '{' + f'[{x_left}, {y_mid}, {l/4 + door_width/4}]' + '}'
-                right_seg_args = '{' + f'[{wall_side_width}, {h}]' + '}'
-                top_seg_pos = '{' + f'[{x_left}, {y_mid + door_height/2 + wall_top_height/2}, 0]' + '}'
-                top_seg_args = '{' + f'[{door_width}, {wall_top_height}]' + '}'
-                
-                room_jsx += f"""
-                    <mesh position={left_seg_pos} rotation={rot_left} receiveShadow>
-                      <planeGeometry args={left_seg_args} />
-                      <meshStandardMaterial color=\"{c}\" roughness={{0.7}} side={{THREE.DoubleSide}} />
-                    </mesh>
-                    <mesh position={right_seg_pos} rotation={rot_left} receiveShadow>
-                      <planeGeometry args={right_seg_args} />
-                      <meshStandardMaterial color=\"{c}\" roughness={{0.7}} side={{THREE.DoubleSide}} />
-                    </mesh>
-                    <mesh position={top_seg_pos} rotation={rot_left} receiveShadow>
-                      <planeGeometry args={top_seg_args} />
-                      <meshStandardMaterial color=\"{c}\" roughness={{0.7}} side={{THREE.DoubleSide}} />
-                    </mesh>
-                """
-            
-            # Right wall (with optional door)
-            if "right" not in doors:
-                right_pos = '{' + f'[{x_right}, {y_mid}, 0]' + '}'
-                args_lh = '{' + f'[{l}, {h}]' + '}'
-                room_jsx += f"""
-                    <mesh position={right_pos} rotation={rot_right} receiveShadow>
-                      <planeGeometry args={args_lh} />
-                      <meshStandardMaterial color=\"{c}\" roughness={{0.7}} side={{THREE.DoubleSide}} />
-                    </mesh>
-                """
-            else:
-                wall_side_width = (l - door_width) / 2
-                wall_top_height = h - door_height
-                
-                left_seg_pos = '{' + f'[{x_right}, {y_mid}, {-l/4 - door_width/4}]' + '}'
-                left_seg_args = '{' + f'[{wall_side_width}, {h}]' + '}'
-                right_seg_pos = '{' + f'[{x_right}, {y_mid}, {l/4 + door_width/4}]' + '}'
-                right_seg_args = '{' + f'[{wall_side_width}, {h}]' + '}'
-                top_seg_pos = '{' + f'[{x_right}, {y_mid + door_height/2 + wall_top_height/2}, 0]' + '}'
-                top_seg_args = '{' + f'[{door_width}, {wall_top_height}]' + '}'
-                
-                room_jsx += f"""
-                    <mesh position={left_seg_pos} rotation={rot_right} receiveShadow>
-                      <planeGeometry args={left_seg_args} />
-                      <meshStandardMaterial color=\"{c}\" roughness={{0.7}} side={{THREE.DoubleSide}} />
-                    </mesh>
-                    <mesh position={right_seg_pos} rotation={rot_right} receiveShadow>
-                      <planeGeometry args={right_seg_args} />
-                      <meshStandardMaterial color=\"{c}\" roughness={{0.7}} side={{THREE.DoubleSide}} />
-                    </mesh>
-                    <mesh position={top_seg_pos} rotation={rot_right} receiveShadow>
-                      <planeGeometry args={top_seg_args} />
-                      <meshStandardMaterial color=\"{c}\" roughness={{0.7}} side={{THREE.DoubleSide}} />
-                    </mesh>
-                """
-            
-            room_jsx += """
-                  </group>
-            """
         return [
-            f"""
-            export const Room = () => {{
-              return (<group>{room_jsx}\n</group>);
-            }};
+            """
+            // Surfaces of every Room share these; roughness per surface kind as before the merge
+            const roomMaterials = () => {
+              if (!globalThis.MindRoomMaterials) {
+                const material = (roughness) => new THREE.MeshStandardMaterial({ roughness, vertexColors: true, side: THREE.DoubleSide });
+                globalThis.MindRoomMaterials = { floor: material(0.8), ceiling: material(0.9), walls: material(0.7) };
+              }
+              return globalThis.MindRoomMaterials;
+            };
+
+            const ROOM_FLOOR_Y = -2;
+            const ROOM_DEFAULTS = { position: [0, 0, 0], width: 20, length: 20, height: 10, color: '#FFFFFF', doors: [], door_width: 3, door_height: 6 };
+
+            // Quads collected into flat arrays, turned into one indexed BufferGeometry at the end
+            class RoomSurfaces {
+              constructor() {
+                this.positions = [];
+                this.normals = [];
+                this.colors = [];
+                this.indices = [];
+              }
+
+              // Rectangle spanning [u0, u1] along the unit vector u and [v0, v1] along v, from origin
+              quad(origin, u, v, u0, u1, v0, v1, normal, color) {
+                if (u1 <= u0 || v1 <= v0) return;
+                const first = this.positions.length / 3;
+                [[u0, v0], [u1, v0], [u1, v1], [u0, v1]].forEach(([a, b]) => {
+                  this.positions.push(
+                    origin[0] + u[0] * a + v[0] * b,
+                    origin[1] + u[1] * a + v[1] * b,
+                    origin[2] + u[2] * a + v[2] * b,
+                  );
+                  this.normals.push(normal[0], normal[1], normal[2]);
+                  this.colors.push(color.r, color.g, color.b);
+                });
+                this.indices.push(first, first + 1, first + 2, first, first + 2, first + 3);
+              }
+
+              geometry() {
+                const geometry = new THREE.BufferGeometry();
+                geometry.setAttribute('position', new THREE.Float32BufferAttribute(this.positions, 3));
+                geometry.setAttribute('normal', new THREE.Float32BufferAttribute(this.normals, 3));
+                geometry.setAttribute('color', new THREE.Float32BufferAttribute(this.colors, 3));
+                geometry.setIndex(this.indices);
+                geometry.computeBoundingSphere();
+                return geometry;
+              }
+            }
+
+            // A wall of the given length centred on origin (at floor level) along u, with an optional door in the middle
+            const addRoomWall = (walls, origin, u, length, height, normal, color, door, doorWidth, doorHeight) => {
+              const up = [0, 1, 0];
+              const half = length / 2;
+              if (!door) {
+                walls.quad(origin, u, up, -half, half, 0, height, normal, color);
+                return;
+              }
+              const doorHalf = Math.min(doorWidth, length) / 2;
+              walls.quad(origin, u, up, -half, -doorHalf, 0, height, normal, color);
+              walls.quad(origin, u, up, doorHalf, half, 0, height, normal, color);
+              walls.quad(origin, u, up, -doorHalf, doorHalf, Math.min(doorHeight, height), height, normal, color);
+            };
+
+            const buildRoomGeometries = (rooms) => {
+              const floor = new RoomSurfaces();
+              const ceiling = new RoomSurfaces();
+              const walls = new RoomSurfaces();
+              const color = new THREE.Color();
+              (rooms || []).forEach((config) => {
+                const room = { ...ROOM_DEFAULTS, ...config };
+                const [px, py, pz] = room.position;
+                const { width: w, length: l, height: h } = room;
+                const doors = room.doors || [];
+                color.set(room.color);
+                const y = py + ROOM_FLOOR_Y;
+                const x = [1, 0, 0];
+                const z = [0, 0, 1];
+                floor.quad([px, y, pz], x, z, -w / 2, w / 2, -l / 2, l / 2, [0, 1, 0], color);
+                ceiling.quad([px, y + h, pz], x, z, -w / 2, w / 2, -l / 2, l / 2, [0, -1, 0], color);
+                // Normals face into the room
+                const wall = (side, origin, u, length, normal) =>
+                  addRoomWall(walls, origin, u, length, h, normal, color, doors.includes(side), room.door_width, room.door_height);
+                wall('back', [px, y, pz - l / 2], x, w, [0, 0, 1]);
+                wall('front', [px, y, pz + l / 2], x, w, [0, 0, -1]);
+                wall('left', [px - w / 2, y, pz], z, l, [1, 0, 0]);
+                wall('right', [px + w / 2, y, pz], z, l, [-1, 0, 0]);
+              });
+              return { floor: floor.geometry(), ceiling: ceiling.geometry(), walls: walls.geometry() };
+            };
+
+            export const Room = ({ rooms = [] }) => {
+              const materials = roomMaterials();
+              const geometries = useMemo(() => buildRoomGeometries(rooms), [rooms]);
+              React.useEffect(() => () => Object.values(geometries).forEach((geometry) => geometry.dispose()), [geometries]);
+
+              return (
+                <group>
+                  <mesh geometry={geometries.floor} material={materials.floor} receiveShadow />
+                  <mesh geometry={geometries.ceiling} material={materials.ceiling} receiveShadow />
+                  <mesh geometry={geometries.walls} material={materials.walls} receiveShadow />
+                </group>
+              );
+            };
             """
         ]
 
+
 def create_rooms(room_configs=None):
-    """Factory for one or more rooms."""
-    if not room_configs:
+    """Factory for one or more rooms; ``room_configs`` may also be a state var."""
+    if room_configs is None or (isinstance(room_configs, list) and not room_configs):
         # Default single room
-        room_configs = [{
-            "position": (0,0,0),
-            "width": 20,
-            "length": 20,
-            "height": 10,
-            "color": "#FFFFFF"
-        }]
+        room_configs = [DEFAULT_ROOM]
     return Room.create(rooms=room_configs)
 
+
 def create_room():
     # Backwards compatibility: creates default room
     return create_rooms()
-
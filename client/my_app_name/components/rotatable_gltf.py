@@ -1,4 +1,5 @@
 import reflex as rx
+from .asset_cache import asset_cache_js
 
 class RotatableGLTF(rx.Component):
     """Rotatable GLTF model component that spins on drag and resets on release."""
@@ -12,6 +13,7 @@ class RotatableGLTF(rx.Component):
 
     def add_custom_code(self) -> list[str]:
         return [
+            asset_cache_js(),
             """
             export const RotatableGLTF = ({ 
               url, 
@@ -20,13 +22,12 @@ class RotatableGLTF(rx.Component):
               initial_rotation=[0,0,0]
             }) => {
               const groupRef = React.useRef();
-              const { gl } = useThree();
+              const { gl, invalidate } = useThree();
               const [isDragging, setIsDragging] = React.useState(false);
               const lastMousePos = React.useRef({ x: 0, y: 0 });
               
-              // Load GLTF model
-              const { scene } = useGLTF(url);
-              const clonedScene = React.useMemo(() => scene.clone(), [scene]);
+              // Load GLTF model through the shared cache; the clone shares its geometries and materials
+              const clonedScene = globalThis.MindAssets.useGLTFScene(url);
 
               const handlePointerDown = (event) => {
                 event.stopPropagation();
@@ -55,6 +56,7 @@ class RotatableGLTF(rx.Component):
                 groupRef.current.rotation.x = Math.max(-Math.PI / 6, Math.min(Math.PI / 24, groupRef.current.rotation.x));
                 
                 lastMousePos.current = { x: event.clientX, y: event.clientY };
+                invalidate();
               };
 
               React.useEffect(() => {
@@ -79,6 +81,10 @@ class RotatableGLTF(rx.Component):
                 current.x += (target[0] - current.x) * lerpFactor;
                 current.y += (target[1] - current.y) * lerpFactor;
                 current.z += (target[2] - current.z) * lerpFactor;
+
+                // On a demand frameloop, keep drawing only until the model has settled
+                const remaining = Math.abs(target[0] - current.x) + Math.abs(target[1] - current.y) + Math.abs(target[2] - current.z);
+                if (remaining > 0.0005) invalidate();
               });
 
               return (
@@ -91,7 +97,7 @@ class RotatableGLTF(rx.Component):
                   onPointerEnter={() => !isDragging && (gl.domElement.style.cursor = 'grab')}
                   onPointerLeave={() => !isDragging && (gl.domElement.style.cursor = 'default')}
                 >
-                  <primitive object={clonedScene} />
+                  {clonedScene && <primitive object={clonedScene} dispose={null} />}
                 </group>
               );
             };
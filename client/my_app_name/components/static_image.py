@@ -1,5 +1,6 @@
 import reflex as rx
 from typing import List
+from .asset_cache import asset_cache_js
 
 class StaticImage(rx.Component):
     """Static image component without any interaction."""
@@ -11,31 +12,11 @@ class StaticImage(rx.Component):
 
     def add_custom_code(self) -> List[str]:
         return [
+            asset_cache_js(),
             """
             export const StaticImageComponent = ({ imageUrl, position=[0,0,0], scale=1 }) => {
-                const [texture, setTexture] = React.useState(null);
-                
-                // Load image texture
-                React.useEffect(() => {
-                    if (!imageUrl) return;
-                    
-                    const loader = new THREE.TextureLoader();
-                    loader.load(
-                        imageUrl,
-                        (tex) => {
-                            tex.needsUpdate = true;
-                            tex.flipY = false;
-                            tex.format = THREE.RGBAFormat;
-                            tex.colorSpace = THREE.SRGBColorSpace;
-                            if (tex.format === THREE.RGBAFormat) {
-                                tex.premultiplyAlpha = false;
-                            }
-                            setTexture(tex);
-                        },
-                        undefined,
-                        (err) => console.error("Error loading image:", err)
-                    );
-                }, [imageUrl]);
+                // Shared, ref-counted texture (flipY off, sRGB)
+                const texture = globalThis.MindAssets.useTexture(imageUrl);
 
                 // Calculate aspect ratio for 1280x963
                 const targetWidth = 1280;
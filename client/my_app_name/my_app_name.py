@@ -4,6 +4,7 @@ from .pages.home import home
 from .pages.demo import first_page
 from .pages.login import login
 from .pages.register import signup
+from .pages.benchmark import benchmark
 
 
 app = rx.App()
@@ -11,6 +12,7 @@ app.add_page(home, route='/')
 app.add_page(first_page, route='/demo')
 app.add_page(login, route='/login')
 app.add_page(signup, route='/register')
+app.add_page(benchmark, route='/benchmark')
 
 if __name__ == "__main__":
     app.run()
\ No newline at end of file
@@ -0,0 +1,97 @@
+import reflex as rx
+from reflex.utils.exec import is_prod_mode
+from ..components.base import base_page
+from ..components.canvacompo import R3FCanvas, ThreeScene
+from ..components.frame_stats import FrameStats
+from ..components.mentalfactor import Mind
+from ..state import BenchmarkState, BENCHMARK_SPHERE_COUNTS
+
+
+def count_button(count: int) -> rx.Component:
+    return rx.button(
+        str(count),
+        on_click=BenchmarkState.set_sphere_count(count),
+        size="1",
+        variant=rx.cond(BenchmarkState.sphere_count == count, "solid", "outline"),
+    )
+
+
+def benchmark() -> rx.Component:
+    """Spawns N spheres in one Mind and reports ms/frame."""
+
+    controls = rx.box(
+        rx.vstack(
+            rx.heading("Mind physics benchmark", size="4"),
+            rx.hstack(
+                *[count_button(count) for count in BENCHMARK_SPHERE_COUNTS],
+                spacing="2",
+                wrap="wrap",
+            ),
+            rx.button(
+                rx.cond(BenchmarkState.broad_phase, "Broad phase: grid", "Broad phase: off (all pairs)"),
+                on_click=BenchmarkState.toggle_broad_phase,
+                size="1",
+                variant="outline",
+            ),
+            rx.button(
+                rx.cond(BenchmarkState.instanced, "Rendering: instanced", "Rendering: mesh per sphere"),
+                on_click=BenchmarkState.toggle_instanced,
+                size="1",
+                variant="outline",
+            ),
+            rx.button(
+                rx.cond(BenchmarkState.drift, "Drift: on", "Drift: off (spheres sleep)"),
+                on_click=BenchmarkState.toggle_drift,
+                size="1",
+                variant="outline",
+            ),
+            rx.text(
+                "Measuring...",
+                id="frame-stats",
+                size="2",
+                font_family="monospace",
+            ),
+            spacing="3",
+            align="start",
+        ),
+        style={
+            "position": "absolute",
+            "top": "20px",
+            "left": "20px",
+            "padding": "16px",
+            "background": "rgba(255, 255, 255, 0.95)",
+            "border_radius": "12px",
+            "box_shadow": "0 4px 6px rgba(0,0,0,0.1)",
+            "z_index": "1000",
+        },
+    )
+
+    canvas = R3FCanvas.create(
+        ThreeScene.create(),
+        Mind.create(
+            mental_spheres=BenchmarkState.spheres,
+            container_radius=BenchmarkState.container_radius,
+            container_opacity=0.2,
+            position=[0, 0, -4],
+            broad_phase=BenchmarkState.broad_phase,
+            instanced=BenchmarkState.instanced,
+            drift_chance=rx.cond(BenchmarkState.drift, 0.05, 0.0),
+        ),
+        FrameStats.create(target_id="frame-stats", track_allocations=not is_prod_mode()),
+        style={
+            "width": "100%",
+            "height": "100vh",
+        },
+    )
+
+    return base_page(
+        rx.box(
+            canvas,
+            controls,
+            style={
+                "position": "relative",
+                "width": "100%",
+                "height": "100%",
+            },
+        )
+    )
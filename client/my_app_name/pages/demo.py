@@ -4,8 +4,16 @@ from ..components.base import base_page
 from ..components.mentalfactor import MentalSphere, Mind
 from ..components.player import Player, create_player
 from ..components.canvacompo import R3FCanvas, ThreeScene, ModelViewer3D
+from ..components.asset_cache import ASSET_URLS, asset_url
+from ..components.collision import GLTFCollision
+from ..components.perf_hud import create_perf_hud
 from ..state import MindState
 
+# Walkability grid of LabPlan, listed once it is baked and fingerprinted (from client/):
+#   python -m asset_pipeline occupancy assets/LabPlan.gltf
+#   python -m asset_pipeline fingerprint
+LAB_OCCUPANCY_URL = ASSET_URLS.get("/LabPlan.occupancy.bin")
+
 
 def mental_factor_item(factor: dict) -> rx.Component:
     return rx.box(
@@ -112,13 +120,15 @@ def first_page() -> rx.Component:
     my_child = R3FCanvas.create(
         ThreeScene.create(),
         ModelViewer3D.create(
-            url=rx.asset("LabPlan.gltf"),
+            url=asset_url("LabPlan.gltf"),
             position=[0, 0, 0],
             scale=1.0,
         ),
         create_player(),
+        # Only with a baked grid in the manifest; otherwise walls are tested against the BVH
+        GLTFCollision.create(occupancy_url=LAB_OCCUPANCY_URL) if LAB_OCCUPANCY_URL else GLTFCollision.create(),
         ModelViewer3D.create(
-            url=rx.asset("humanMind/human.gltf"),
+            url=asset_url("humanMind/human.gltf"),
             position=[3, 0, -3.5],
             scale=0.1,
         ),
@@ -148,6 +158,8 @@ def first_page() -> rx.Component:
     page_content = rx.box(
         my_child,
         side_panel,
+        # Shown only with ?perf in the URL
+        create_perf_hud(),
         style={
             "position": "relative",
             "width": "100%",
@@ -1,13 +1,25 @@
 import reflex as rx
 from ..components.base import base_page
-from ..components.canvacompo import R3FCanvas, ThreeScene, ModelViewer3D
+from ..components.canvacompo import R3FCanvas, SceneView, SharedCanvas, ThreeScene, ModelViewer3D
 from ..components.clickable_image import ClickableImage
+from ..components.asset_cache import AssetPreloader, asset_url
 from ..components.auto_rotating_gltf import AutoRotatingGLTF
 from ..components.static_image import StaticImage
 from ..components.rotatable_gltf import RotatableGLTF
 from ..components.mentalfactor import Mind
 from ..mentalfactorsdata import MENTAL_FACTOR_DATA
 
+# Draw every skandha card through one shared canvas instead of a WebGL context per card
+SHARED_CANVAS = True
+
+
+def scene_view(*children: rx.Component) -> rx.Component:
+    """Lit 3D scene filling its box, as a shared-canvas view or its own canvas."""
+    if SHARED_CANVAS:
+        return SceneView.create(ThreeScene.create(), *children)
+    return R3FCanvas.create(ThreeScene.create(), *children, frameloop="demand")
+
+
 def home() -> rx.Component:
     """Homepage with welcome section and call-to-action."""
     
@@ -113,10 +125,9 @@ def home() -> rx.Component:
                 ),
                 # GLTF box for Rupa
                 rx.box(
-                    R3FCanvas.create(
-                        ThreeScene.create(),
+                    scene_view(
                         RotatableGLTF.create(
-                            url=rx.asset("humanMind/human.gltf"),
+                            url=asset_url("humanMind/human.gltf"),
                             position=[0, -18, 0],
                             scale=1.0,
                             initial_rotation=[0, 0, 0],
@@ -142,10 +153,9 @@ def home() -> rx.Component:
             rx.hstack(
                 # Emotion image for Vedana - static, non-interactive
                 rx.box(
-                    R3FCanvas.create(
-                        ThreeScene.create(),
+                    scene_view(
                         StaticImage.create(
-                            image_url=rx.asset("emotion/emotion.png"),
+                            image_url=asset_url("emotion/emotion.png"),
                             position=[0, 0, 0],
                             scale=3.0,
                         ),
@@ -216,10 +226,9 @@ def home() -> rx.Component:
                 ),
                 # Image box for Samjna (Perception)
                 rx.box(
-                    R3FCanvas.create(
-                        ThreeScene.create(),
+                    scene_view(
                         ClickableImage.create(
-                            image_url=rx.asset("optical/opticBunny.png"),
+                            image_url=asset_url("optical/opticBunny.png"),
                             position=[0, 0, 0],
                             scale=4.5,
                             initial_rotation=[0, 0, -0.5],
@@ -245,8 +254,7 @@ def home() -> rx.Component:
             rx.hstack(
                 # Mental sphere with bouncing factors for Samskara
                 rx.box(
-                    R3FCanvas.create(
-                        ThreeScene.create(),
+                    scene_view(
                         Mind.create(
                             mental_spheres=MENTAL_FACTOR_DATA,
                             container_radius=3.0,
@@ -324,10 +332,9 @@ def home() -> rx.Component:
                 ),
                 # GLTF box for Vijnana - auto-rotating, non-interactable
                 rx.box(
-                    R3FCanvas.create(
-                        ThreeScene.create(),
+                    scene_view(
                         AutoRotatingGLTF.create(
-                            url=rx.asset("brain/scene.gltf"),
+                            url=asset_url("brain/scene.gltf"),
                             position=[0, -1.0, 0],
                             scale=0.02,
                             rotation_speed=0.3,
@@ -413,10 +420,14 @@ def home() -> rx.Component:
         hero_section,
         features_section,
         cta_section,
+        AssetPreloader.create(),
         spacing="0",
         width="100%",
         style={"min_height": "100vh"},
     )
     
+    if SHARED_CANVAS:
+        page_content = SharedCanvas.create(page_content, frameloop="demand", width="100%")
+
     return base_page(page_content, allow_scroll=True)
 
@@ -253,4 +253,44 @@ class MindState(rx.State):
         factor = next((f for f in self.available_factors if f["name"] == factor_name), None)
         if factor:
             new_factor = {**factor, "position": [0, 0, 0]}
-            self.mental_factors_map[target_mind] = self.mental_factors_map[target_mind] + [new_factor]
\ No newline at end of file
+            self.mental_factors_map[target_mind] = self.mental_factors_map[target_mind] + [new_factor]
+
+BENCHMARK_SPHERE_COUNTS = [10, 100, 500, 1000, 2000, 5000]
+BENCHMARK_SPHERE_SCALE = 0.05
+
+
+class BenchmarkState(rx.State):
+    sphere_count: int = 100
+    broad_phase: bool = True
+    instanced: bool = False
+    drift: bool = True
+
+    @rx.var
+    def spheres(self) -> list[dict]:
+        colors = [factor["color"] for factor in MENTAL_FACTOR_DATA]
+        return [
+            {
+                "name": "",
+                "detail": "",
+                "color": colors[i % len(colors)],
+                "scale": BENCHMARK_SPHERE_SCALE,
+            }
+            for i in range(self.sphere_count)
+        ]
+
+    @rx.var
+    def container_radius(self) -> float:
+        # Grow the container with the sphere count to keep a constant packing density
+        return BENCHMARK_SPHERE_SCALE * (self.sphere_count / 0.15) ** (1 / 3) + BENCHMARK_SPHERE_SCALE
+
+    def set_sphere_count(self, count: int):
+        self.sphere_count = count
+
+    def toggle_broad_phase(self):
+        self.broad_phase = not self.broad_phase
+
+    def toggle_instanced(self):
+        self.instanced = not self.instanced
+
+    def toggle_drift(self):
+        self.drift = not self.drift
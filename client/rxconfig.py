@@ -6,6 +6,7 @@ config = rx.Config(
         "@react-three/fiber@9.3.0",
         "@react-three/drei@10.7.6",
         "three@0.179.1",
+        "three-mesh-bvh@0.8.3",
     ],
     plugins=[
         rx.plugins.SitemapPlugin(),
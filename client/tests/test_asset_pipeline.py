@@ -0,0 +1,109 @@
+"""glTF loading and occupancy baking of asset_pipeline against the models in assets/."""
+import math
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from asset_pipeline.gltf import GLTFDocument
+from asset_pipeline.occupancy import HEADER, MAGIC, OccupancyGrid, bake_occupancy, occupancy_path_for
+
+ASSETS = Path(__file__).resolve().parent.parent / 'assets'
+
+# Asset, triangles, baked grid size (width x depth) with the default cell size
+MODELS = [
+    ('bunny/scene.gltf', 18796, (108, 46)),
+    ('humanMind/human.gltf', 48918, (129, 50)),
+    ('girl.glb', 10816, (25, 27)),
+]
+
+# World positions (x, z) with the expected answer of the default bake
+KNOWN_CELLS = {
+    'bunny/scene.gltf': [((0.0, 0.0), True), ((-3.0, 0.0), True), ((0.0, 1.8), False), ((-5.2, -2.0), False)],
+    # Two figures side by side with a walkable gap between them
+    'humanMind/human.gltf': [((-1.8, 0.0), True), ((1.8, 0.0), True), ((0.0, 0.0), False), ((0.0, 2.0), False)],
+    'girl.glb': [((0.0, 0.0), True), ((-1.1, -1.2), False), ((1.0, 1.2), False)],
+}
+
+
+@pytest.fixture(scope='module', params=[name for name, _, _ in MODELS])
+def model(request):
+    return request.param, GLTFDocument.load(ASSETS / request.param).triangles()
+
+
+@pytest.fixture(scope='module')
+def baked(model):
+    name, triangles = model
+    return name, bake_occupancy(triangles)
+
+
+@pytest.mark.parametrize('name, count, _size', MODELS)
+def test_triangle_counts(name, count, _size):
+    triangles = GLTFDocument.load(ASSETS / name).triangles()
+    assert triangles.shape == (count, 3, 3)
+    assert np.isfinite(triangles).all()
+
+
+def test_grid_covers_model(model, baked):
+    name, triangles = model
+    _, grid = baked
+    assert (grid.width, grid.depth) == dict((n, size) for n, _, size in MODELS)[name]
+    points = triangles.reshape(-1, 3)
+    # Every vertex falls inside the grid, with the player radius to spare
+    for x, z in points[:, [0, 2]].min(axis=0) - grid.player_radius, points[:, [0, 2]].max(axis=0) + grid.player_radius:
+        i, k = grid.cell_of(x, z)
+        assert 0 <= i < grid.width and 0 <= k < grid.depth
+    assert 0 < grid.blocked.sum() < grid.blocked.size
+
+
+def test_round_trip(baked, tmp_path):
+    _, grid = baked
+    raw = grid.to_bytes()
+    magic, width, depth, ox, oz, cell_size, min_y, max_y, radius = HEADER.unpack_from(raw, 0)
+    assert magic == MAGIC
+    assert (width, depth) == (grid.width, grid.depth)
+    # Stored as float32
+    assert (min_y, max_y, cell_size, radius) == pytest.approx((0.3, 2.0, 0.1, 0.5))
+    assert len(raw) == HEADER.size + math.ceil(width * depth / 8)
+
+    path = tmp_path / 'model.occupancy.bin'
+    grid.save(path)
+    loaded = OccupancyGrid.load(path)
+    assert loaded.blocked.shape == grid.blocked.shape
+    assert np.array_equal(loaded.blocked, grid.blocked)
+    assert loaded.origin == pytest.approx(grid.origin)
+    assert loaded.to_bytes() == raw
+
+
+def test_known_cells(baked):
+    name, grid = baked
+    for (x, z), blocked in KNOWN_CELLS[name]:
+        assert grid.is_blocked(x, z) is blocked, (x, z)
+
+
+def test_outside_grid_is_free(baked):
+    _, grid = baked
+    ox, oz = grid.origin
+    far_x = ox + (grid.width + 1) * grid.cell_size
+    far_z = oz + (grid.depth + 1) * grid.cell_size
+    for x, z in [(ox - 0.05, oz + 0.5), (ox + 0.5, oz - 0.05), (far_x, oz + 0.5), (ox + 0.5, far_z), (-1e6, 1e6)]:
+        assert not grid.is_blocked(x, z)
+
+
+def test_only_body_height_blocks():
+    # A floor, a ceiling above the head and a wall between them, all 4 m wide along x
+    quad = lambda corners: [[corners[0], corners[1], corners[2]], [corners[0], corners[2], corners[3]]]
+    floor = quad([(-2, 0, -2), (2, 0, -2), (2, 0, 2), (-2, 0, 2)])
+    ceiling = quad([(-2, 3, -2), (2, 3, -2), (2, 3, 2), (-2, 3, 2)])
+    wall = quad([(-2, 0, 0), (2, 0, 0), (2, 2.5, 0), (-2, 2.5, 0)])
+    grid = bake_occupancy(np.array(floor + ceiling + wall, dtype=float), player_radius=0.3)
+    assert grid.is_blocked(0, 0)
+    # Grown by the player radius (to within a cell), no further
+    assert grid.is_blocked(0, 0.15) and grid.is_blocked(0, -0.15)
+    assert not grid.is_blocked(0, 0.45) and not grid.is_blocked(0, -0.45)
+    assert not grid.is_blocked(0, -1.5)
+    assert not grid.is_blocked(1.5, 1.5)
+
+
+def test_occupancy_path_for():
+    assert occupancy_path_for('assets/LabPlan.gltf') == Path('assets/LabPlan.occupancy.bin')
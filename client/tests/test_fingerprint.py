@@ -0,0 +1,107 @@
+"""fingerprint.py on a copy of assets/, run through the command line as the build does."""
+import gzip
+import json
+import shutil
+from pathlib import Path
+from urllib.parse import unquote
+
+import pytest
+
+from asset_pipeline.__main__ import main
+from asset_pipeline.fingerprint import ENCODINGS, HASHED_DIR, MANIFEST_NAME, content_hash, hashed_name
+
+ASSETS = Path(__file__).resolve().parent.parent / 'assets'
+
+# A .gltf with its buffer and textures, a .glb to optimize, a plain image
+COPIED = ['bunny/scene.gltf', 'bunny/scene.bin', 'bunny/textures', 'girl.glb', 'emotion/emotion.png']
+
+
+@pytest.fixture
+def root(tmp_path):
+    for name in COPIED:
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        copy = shutil.copytree if (ASSETS / name).is_dir() else shutil.copy
+        copy(ASSETS / name, tmp_path / name)
+    main(['optimize', '--root', str(tmp_path), str(tmp_path / 'girl.glb')])
+    return tmp_path
+
+
+def fingerprint(root):
+    main(['fingerprint', '--root', str(root)])
+    return json.loads((root / MANIFEST_NAME).read_text())['assets']
+
+
+def hashed_files(root):
+    return sorted(path.relative_to(root) for path in (root / HASHED_DIR).rglob('*') if path.is_file())
+
+
+def test_hashed_names_match_content(root):
+    assets = fingerprint(root)
+    assert '/bunny/textures/bunny1_scarf_baseColor.jpeg' in assets and '/emotion/emotion.png' in assets
+    for url, entry in assets.items():
+        if 'source_bytes' in entry:
+            # Served as its optimized GLB, checked below
+            continue
+        hashed = root / entry['url'].lstrip('/')
+        data = hashed.read_bytes()
+        assert entry['url'] == f'/{HASHED_DIR}' + url.rsplit('/', 1)[0] + '/' + hashed.name
+        assert hashed.name == hashed_name(Path(url).name, content_hash(data))
+        assert entry['bytes'] == len(data)
+        if url.endswith('.gltf'):
+            # Buffers and images point at their hashed copies beside the hashed model
+            gltf = json.loads(data)
+            for item in gltf['buffers'] + gltf.get('images', []):
+                assert (hashed.parent / unquote(item['uri'])).exists()
+        else:
+            assert data == (root / url.lstrip('/')).read_bytes()
+
+
+def test_hashed_names_are_stable(root):
+    first = fingerprint(root)
+    files = hashed_files(root)
+    assert fingerprint(root) == first
+    assert hashed_files(root) == files
+
+
+def test_changed_buffer_renames_its_model(root):
+    first = fingerprint(root)
+    with (root / 'bunny/scene.bin').open('ab') as f:
+        f.write(b'\0' * 4)
+    second = fingerprint(root)
+    assert second['/bunny/scene.bin']['url'] != first['/bunny/scene.bin']['url']
+    assert second['/bunny/scene.gltf']['url'] != first['/bunny/scene.gltf']['url']
+    assert second['/girl.glb'] == first['/girl.glb']
+    # The stale copies are pruned
+    assert not (root / first['/bunny/scene.bin']['url'].lstrip('/')).exists()
+
+
+def test_gzip_variants_decompress(root):
+    assets = fingerprint(root)
+    compressed = 0
+    for entry in assets.values():
+        hashed = root / entry['url'].lstrip('/')
+        for encoding, size in entry['encodings'].items():
+            variant = hashed.with_name(hashed.name + ENCODINGS[encoding])
+            assert variant.stat().st_size == size < entry['bytes']
+            if encoding == 'gzip':
+                assert gzip.decompress(variant.read_bytes()) == hashed.read_bytes()
+                compressed += 1
+    assert compressed
+    # Images are already compressed and get no variants
+    assert assets['/emotion/emotion.png']['encodings'] == {}
+
+
+def test_manifest_maps_sources(root):
+    assets = fingerprint(root)
+    sources = {
+        '/' + path.relative_to(root).as_posix() for path in root.rglob('*')
+        if path.is_file() and HASHED_DIR not in path.parts and path.suffix in ('.gltf', '.glb', '.bin', '.jpeg', '.png')
+    }
+    assert set(assets) == sources
+    # The optimized model is served as its GLB's hashed copy, with the proxy beside it
+    girl = assets['/girl.glb']
+    assert girl['url'] == assets['/girl.optimized.glb']['url']
+    assert girl['proxy'] == assets['/girl.proxy.glb']['url']
+    assert girl['source_bytes'] == (ASSETS / 'girl.glb').stat().st_size
+    assert (root / girl['proxy'].lstrip('/')).exists()
+    assert 'proxy' not in assets['/bunny/scene.gltf']
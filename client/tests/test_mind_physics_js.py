@@ -0,0 +1,67 @@
+"""Run the Mind physics JS from components/mentalfactor.py in Node.
+
+The JS lives in Python string constants; they are read with ``ast`` so the
+test does not need reflex installed.
+"""
+import ast
+import json
+import shutil
+import subprocess
+import warnings
+from pathlib import Path
+
+import pytest
+
+MENTALFACTOR = Path(__file__).resolve().parent.parent / 'my_app_name' / 'components' / 'mentalfactor.py'
+
+pytestmark = pytest.mark.skipif(shutil.which('node') is None, reason='needs node')
+
+
+def js_function(name):
+    with warnings.catch_warnings():
+        # The JSX in the file has regex escapes Python itself warns about
+        warnings.simplefilter('ignore', SyntaxWarning)
+        warnings.simplefilter('ignore', DeprecationWarning)
+        tree = ast.parse(MENTALFACTOR.read_text(encoding='utf-8'))
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == name:
+            return ast.literal_eval(node.body[-1].value)
+    raise LookupError(name)
+
+
+def run_physics(script):
+    source = js_function('_mind_broad_phase_js') + js_function('_mind_physics_js') + script
+    result = subprocess.run(['node', '-e', source], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def test_sync_while_awake_counts_every_body():
+    state = run_physics("""
+        const P = globalThis.MindPhysics;
+        const world = P.createWorld({ driftChance: 0 });
+        P.syncBodies(world, [0.1, 0.1, 0.1], 2);
+        P.step(world, 1 / 60, 2);
+        P.syncBodies(world, [0.1, 0.1, 0.1, 0.1], 2);
+        const afterSync = world.awakeCount;
+        const stepped = P.step(world, 1 / 60, 2);
+        console.log(JSON.stringify({ afterSync, stepped, awake: Array.from(world.awake.subarray(0, world.count)) }));
+    """)
+    assert state['afterSync'] == 4
+    assert state['stepped'] == sum(state['awake'])
+    assert state['stepped'] > 0
+
+
+def test_world_goes_idle_after_resync():
+    state = run_physics("""
+        const P = globalThis.MindPhysics;
+        const world = P.createWorld({ driftChance: 0, sleepSteps: 5, sleepSpeed: 10 });
+        P.syncBodies(world, [0.1, 0.1, 0.1], 2);
+        P.step(world, 1 / 60, 2);
+        P.syncBodies(world, [0.1, 0.1, 0.1, 0.1], 2);
+        let remaining = -1;
+        for (let i = 0; i < 20; i++) remaining = P.step(world, 1 / 60, 2);
+        console.log(JSON.stringify({ remaining, awakeCount: world.awakeCount, awake: Array.from(world.awake.subarray(0, world.count)) }));
+    """)
+    assert state['awakeCount'] == 0
+    assert state['remaining'] == 0
+    assert state['awake'] == [0, 0, 0, 0]
@@ -0,0 +1,129 @@
+"""optimize.py against models copied from assets/: the GLB must load back as the same geometry."""
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from asset_pipeline.gltf import COMPONENT_DTYPES, GLB_MAGIC, TYPE_SIZES, GLTFDocument
+from asset_pipeline.optimize import LOD_EXTENSION, QUANTIZATION, optimize_asset
+
+ASSETS = Path(__file__).resolve().parent.parent / 'assets'
+
+# Asset, the directory it needs beside it (None: self-contained)
+MODELS = [
+    ('girl.glb', None),
+    ('bunny/scene.gltf', 'bunny'),
+]
+
+FLOAT = 5126
+# (component type, normalized) that KHR_mesh_quantization allows per attribute
+ALLOWED = {
+    'POSITION': {(FLOAT, False), (5120, False), (5120, True), (5121, False), (5121, True),
+                 (5122, False), (5122, True), (5123, False), (5123, True)},
+    'NORMAL': {(FLOAT, False), (5120, True), (5122, True)},
+    'TANGENT': {(FLOAT, False), (5120, True), (5122, True)},
+    'TEXCOORD': {(FLOAT, False), (5120, False), (5120, True), (5121, False), (5121, True),
+                 (5122, False), (5122, True), (5123, False), (5123, True)},
+}
+
+
+@pytest.fixture(scope='module', params=MODELS, ids=[name for name, _ in MODELS])
+def optimized(request, tmp_path_factory):
+    # optimize_asset writes beside the source, so it runs on a copy
+    name, directory = request.param
+    tmp = tmp_path_factory.mktemp('optimize')
+    if directory:
+        shutil.copytree(ASSETS / directory, tmp / directory)
+    else:
+        shutil.copy(ASSETS / name, tmp / name)
+    source = GLTFDocument.load(tmp / name)
+    result = optimize_asset(tmp / name)
+    return source, result, GLTFDocument.load(result['output'])
+
+
+def primitives(document):
+    for mesh in document.data['meshes']:
+        yield from mesh['primitives']
+
+
+def index_count(data, node):
+    return data['accessors'][data['meshes'][node['mesh']]['primitives'][0]['indices']]['count']
+
+
+def test_glb_parses(optimized):
+    _, result, document = optimized
+    raw = result['output'].read_bytes()
+    assert raw[:4] == GLB_MAGIC
+    assert len(raw) == result['bytes'] < result['source_bytes']
+    assert document.data['asset']['version'] == '2.0'
+    assert len(document.data['buffers']) == 1
+
+
+def test_geometry_matches_source(optimized):
+    source, _, document = optimized
+    before = source.triangles().reshape(-1, 3)
+    after = document.triangles().reshape(-1, 3)
+    # Welding and merging keep every triangle; only the LOD levels, kept out of the scene, have fewer
+    assert len(after) == len(before)
+    # 16-bit positions: off by at most half a step of the model's extent / 65534
+    tolerance = np.ptp(before, axis=0).max() / 65534
+    assert after.min(axis=0) == pytest.approx(before.min(axis=0), abs=tolerance)
+    assert after.max(axis=0) == pytest.approx(before.max(axis=0), abs=tolerance)
+
+
+def test_quantized_accessors(optimized):
+    _, _, document = optimized
+    data = document.data
+    assert QUANTIZATION in data['extensionsUsed'] and QUANTIZATION in data['extensionsRequired']
+    for primitive in primitives(document):
+        count = None
+        for name, index in primitive['attributes'].items():
+            accessor = data['accessors'][index]
+            kind = name.split('_')[0] if name.startswith('TEXCOORD_') else name
+            assert (accessor['componentType'], accessor.get('normalized', False)) in ALLOWED[kind], name
+            count = accessor['count'] if count is None else count
+            assert accessor['count'] == count
+            # Vertex attributes start and stride on 4-byte boundaries
+            view = data['bufferViews'][accessor['bufferView']]
+            element_size = np.dtype(COMPONENT_DTYPES[accessor['componentType']]).itemsize * TYPE_SIZES[accessor['type']]
+            assert (view.get('byteOffset', 0) + accessor.get('byteOffset', 0)) % 4 == 0
+            assert view.get('byteStride', element_size) % 4 == 0
+
+        position = data['accessors'][primitive['attributes']['POSITION']]
+        values = document.read_accessor(primitive['attributes']['POSITION'])
+        assert position['min'] == values.min(axis=0).tolist()
+        assert position['max'] == values.max(axis=0).tolist()
+        if 'NORMAL' in primitive['attributes']:
+            normals = document.read_accessor(primitive['attributes']['NORMAL'])
+            assert np.linalg.norm(normals, axis=1) == pytest.approx(1, abs=0.02)
+
+        indices = data['accessors'][primitive['indices']]
+        assert indices['componentType'] in (5123, 5125)
+        assert document.read_accessor(primitive['indices']).max() < count
+
+
+def test_lod_levels(optimized):
+    _, _, document = optimized
+    data = document.data
+    assert LOD_EXTENSION in data['extensionsUsed']
+    scene = set(data['scenes'][0]['nodes'])
+    with_lods = [node for node in data['nodes'] if LOD_EXTENSION in node.get('extensions', {})]
+    assert with_lods
+    for node in with_lods:
+        ids = node['extensions'][LOD_EXTENSION]['ids']
+        assert len(node['extras']['MSFT_screencoverage']) == len(ids) + 1
+        assert not scene & set(ids)
+        counts = [index_count(data, node)] + [index_count(data, data['nodes'][level]) for level in ids]
+        assert counts == sorted(counts, reverse=True) and counts[-1] < counts[0]
+
+
+def test_proxy_written(optimized):
+    source, result, _ = optimized
+    assert result['proxy'].exists() and result['proxy'].stat().st_size == result['proxy_bytes']
+    proxy = GLTFDocument.load(result['proxy'])
+    assert 'images' not in proxy.data and 'textures' not in proxy.data
+    triangles = proxy.triangles()
+    assert 0 < len(triangles) < len(source.triangles())
+    for primitive in primitives(proxy):
+        assert set(primitive['attributes']) <= {'POSITION', 'NORMAL'}
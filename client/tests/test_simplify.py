@@ -0,0 +1,91 @@
+"""simplify.py on the largest mesh of each model in assets/."""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from asset_pipeline.gltf import GLTFDocument
+from asset_pipeline.optimize import LOD_RATIOS, PROXY_RATIO, baked_parts, group_parts
+from asset_pipeline.simplify import cluster_grid, simplify
+
+ASSETS = Path(__file__).resolve().parent.parent / 'assets'
+
+MODELS = ['bunny/scene.gltf', 'humanMind/human.gltf', 'girl.glb']
+RATIOS = [*LOD_RATIOS, PROXY_RATIO]
+
+
+@pytest.fixture(scope='module', params=MODELS)
+def mesh(request):
+    # The mesh optimize.py would simplify: transforms baked, parts merged by material
+    groups = group_parts(list(baked_parts(GLTFDocument.load(ASSETS / request.param))))
+    group = max(groups, key=lambda group: len(group['indices']))
+    return group['attributes'], group['indices']
+
+
+def face_normals(positions, triangles):
+    a, b, c = (positions[triangles[:, k]] for k in range(3))
+    return np.cross(b - a, c - a)
+
+
+@pytest.mark.parametrize('ratio', RATIOS)
+def test_stays_within_ratio(mesh, ratio):
+    attributes, triangles = mesh
+    simplified, kept = simplify(attributes, triangles, ratio)
+    assert 0 < len(kept) <= int(len(triangles) * ratio)
+    assert kept.max() < len(simplified['POSITION'])
+    assert set(simplified) == set(attributes)
+    assert all(len(values) == len(simplified['POSITION']) for values in simplified.values())
+    assert np.isfinite(simplified['POSITION']).all()
+
+
+@pytest.mark.parametrize('ratio', LOD_RATIOS)
+def test_winding_kept(mesh, ratio):
+    attributes, triangles = mesh
+    simplified, kept = simplify(attributes, triangles, ratio)
+    # Front faces still face along the normals their corners carry; a flipped winding would face against them
+    normals = face_normals(simplified['POSITION'], kept)
+    facing = np.einsum('ij,ij->i', normals, simplified['NORMAL'][kept].sum(axis=1)) > 0
+    area = np.linalg.norm(normals, axis=1)
+    assert area[facing].sum() > 0.75 * area.sum()
+
+
+@pytest.mark.parametrize('ratio', RATIOS)
+def test_bounds_within_one_cell(mesh, ratio):
+    attributes, triangles = mesh
+    cell, _ = cluster_grid(attributes, triangles, ratio)
+    simplified, _ = simplify(attributes, triangles, ratio)
+    positions = attributes['POSITION']
+    assert simplified['POSITION'].min(axis=0) == pytest.approx(positions.min(axis=0), abs=cell)
+    assert simplified['POSITION'].max(axis=0) == pytest.approx(positions.max(axis=0), abs=cell)
+
+
+def test_unreachable_ratio(mesh):
+    attributes, triangles = mesh
+    # Even the coarsest grid keeps more than a single triangle
+    assert cluster_grid(attributes, triangles, 1e-6) is None
+    assert simplify(attributes, triangles, 1e-6) is None
+
+
+def test_closed_mesh_keeps_orientation():
+    # A UV sphere wound outwards: its signed volume stays positive and close to the original
+    rings, segments = 48, 96
+    theta, phi = np.meshgrid(np.linspace(0, np.pi, rings + 1), np.linspace(0, 2 * np.pi, segments, endpoint=False),
+                             indexing='ij')
+    positions = np.stack([np.sin(theta) * np.cos(phi), np.cos(theta), np.sin(theta) * np.sin(phi)], axis=-1)
+    positions = positions.reshape(-1, 3)
+    index = np.arange((rings + 1) * segments).reshape(rings + 1, segments)
+    a, b = index[:-1], index[1:]
+    c, d = np.roll(a, -1, axis=1), np.roll(b, -1, axis=1)
+    triangles = np.concatenate([np.stack([a, c, b], -1).reshape(-1, 3), np.stack([c, d, b], -1).reshape(-1, 3)])
+    triangles = triangles[(triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2])
+                          & (triangles[:, 0] != triangles[:, 2])]
+    attributes = {'POSITION': positions, 'NORMAL': positions.copy()}
+
+    def volume(positions, triangles):
+        p = positions[triangles]
+        return np.einsum('ij,ij->i', p[:, 0], np.cross(p[:, 1], p[:, 2])).sum() / 6
+
+    assert volume(positions, triangles) > 0
+    for ratio in LOD_RATIOS:
+        simplified, kept = simplify(attributes, triangles, ratio)
+        assert volume(simplified['POSITION'], kept) == pytest.approx(volume(positions, triangles), rel=0.2)